@@ -0,0 +1,4 @@
+# Motor de análises em memória (colunas NumPy), carregado no início do worker
+from .engine import AnalyticsEngine, ColumnTable, current, reload, version, init_app, per_90
+
+__all__ = ['AnalyticsEngine', 'ColumnTable', 'current', 'reload', 'version', 'init_app', 'per_90']
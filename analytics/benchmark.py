@@ -0,0 +1,111 @@
+"""
+Benchmark do motor de análises: gera a massa sintética do benchmark de
+índices, carrega o motor e mede a memória por milhão de linhas de cada
+tabela e a latência das consultas usadas pelos endpoints.
+
+Sai com erro se alguma tabela passar do orçamento de memória documentado
+em analytics/engine.py (--max-mb-per-million).
+
+Uso:
+    python -m analytics.benchmark --rows 1000000 --json analytics.json
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from app import create_app
+from app.models import db
+from analytics.engine import AnalyticsEngine
+from database.benchmark import SEASONS, load_data
+
+# Orçamento por milhão de linhas (MB), com folga sobre o tamanho calculado das colunas
+MEMORY_BUDGET = {'player_stats': 64, 'advanced_player_stats': 112}
+
+
+def queries(engine, sizes):
+    """Consultas dos endpoints, com parâmetros sorteados a cada chamada"""
+    rnd = random.Random(42)
+    player = lambda: rnd.randint(1, sizes['players'])
+    team = lambda: rnd.randint(1, sizes['teams'])
+    return [
+        ('player_seasons', lambda: engine.player_seasons(player())),
+        ('team_seasons', lambda: engine.team_seasons(team())),
+        ('top_scorers', lambda: engine.top_scorers(rnd.choice(SEASONS))),
+        ('xg_leaders_per_90', lambda: engine.xg_leaders(rnd.choice(SEASONS))),
+        ('season_trend', lambda: engine.season_trend()),
+        ('player_matches', lambda: engine.player_matches(player(), ['xg', 'key_passes'])),
+        ('player_totals', lambda: engine.player_totals(player(), ['total_passes', 'pass_accuracy'])),
+        ('player_recent_matches', lambda: engine.player_recent_matches(player(), ['pass_accuracy'])),
+    ]
+
+
+def measure(engine, sizes, repeat):
+    """Latência (µs) de cada consulta: mediana, p95 e média"""
+    results = {}
+    for name, query in queries(engine, sizes):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query()
+            timings.append((time.perf_counter() - start) * 1e6)
+        timings.sort()
+        results[name] = {
+            'p50_us': round(statistics.median(timings), 1),
+            'p95_us': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 1),
+            'mean_us': round(statistics.mean(timings), 1)
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark do motor de análises em memória')
+    parser.add_argument('--rows', type=int, default=1000000, help='linhas de player_stats e advanced_player_stats')
+    parser.add_argument('--repeat', type=int, default=200, help='execuções de cada consulta')
+    parser.add_argument('--json', help='grava os resultados neste arquivo')
+    args = parser.parse_args(argv)
+
+    app = create_app('benchmark')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        started = time.perf_counter()
+        sizes = load_data(args.rows)
+        print(f"Massa gerada em {time.perf_counter() - started:.1f}s: {sizes}, {args.rows} linhas de estatísticas")
+
+        started = time.perf_counter()
+        engine = AnalyticsEngine.load()
+        load_seconds = time.perf_counter() - started
+        print(f"Motor carregado em {load_seconds:.1f}s")
+
+    memory = engine.memory_usage()
+    results = measure(engine, sizes, args.repeat)
+
+    print(f"{'tabela':<24}{'linhas':>10}{'MB':>8}{'MB/milhão':>11}{'orçamento':>11}")
+    over_budget = []
+    for name, usage in memory.items():
+        print(f"{name:<24}{usage['rows']:>10}{usage['bytes'] / 2 ** 20:>8.1f}"
+              f"{usage['mb_per_million_rows']:>11}{MEMORY_BUDGET[name]:>11}")
+        if usage['mb_per_million_rows'] > MEMORY_BUDGET[name]:
+            over_budget.append(name)
+
+    header = f"{'consulta':<26}{'p50 µs':>10}{'p95 µs':>10}"
+    print(header)
+    print('-' * len(header))
+    for name, timing in results.items():
+        print(f"{name:<26}{timing['p50_us']:>10}{timing['p95_us']:>10}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'rows': args.rows, 'sizes': sizes, 'load_s': round(load_seconds, 2),
+                       'memory': memory, 'queries': results}, f, indent=2)
+
+    if over_budget:
+        print(f"Acima do orçamento de memória: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,478 @@
+import logging
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+from flask import current_app
+from sqlalchemy import select
+from config import Config
+from app.models import Player, Team, PlayerStats, AdvancedPlayerStats, Match
+from database.db_connection import get_read_engine
+from database.data_version import current_data_version
+from database import archive, snapshot
+
+logger = logging.getLogger(__name__)
+
+# Tabelas de estatísticas em memória, uma matriz NumPy contígua por coluna:
+# chaves (jogador, time, temporada) viram códigos int32, contagens int32 e
+# métricas float64 (NaN onde o banco tem NULL). Por milhão de linhas:
+#   player_stats          3 chaves + 4 inteiros + 2 floats + 2 índices + 2 rankings = 60 B/linha, ~57 MB
+#   advanced_player_stats 2 chaves + 17 inteiros + 4 floats = 108 B/linha, ~103 MB
+# (medido por `python -m analytics.benchmark`, que falha acima do orçamento).
+
+PLAYER_STATS_INTS = ('matches_played', 'goals', 'assists', 'minutes_played')
+PLAYER_STATS_FLOATS = ('xg', 'xa')
+ADVANCED_INTS = (
+    'match_id', 'total_passes', 'accurate_passes', 'key_passes', 'through_balls', 'crosses', 'long_balls',
+    'saves', 'fouls_committed', 'fouls_suffered', 'touches',
+    'goals_0_15', 'goals_16_30', 'goals_31_45', 'goals_46_60', 'goals_61_75', 'goals_76_90'
+)
+ADVANCED_FLOATS = ('xg', 'xa', 'xg_chain', 'pass_accuracy')
+
+_current = None
+_lock = threading.Lock()
+_checked_at = 0.0
+
+
+def _key_values(series):
+    """Valores de uma coluna de chave prontos para np.unique (NULL vira -1 ou '')"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.fillna(-1).to_numpy(dtype=np.int64)
+    return series.fillna('').astype(str).to_numpy(dtype=object)
+
+
+def per_90(values, minutes):
+    """Valores por 90 minutos jogados (0 onde não há minutos)"""
+    values = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    minutes = np.asarray(minutes, dtype=np.float64)
+    return np.divide(values * 90, minutes, out=np.zeros_like(values), where=minutes > 0)
+
+
+class ColumnTable:
+    """
+    Tabela colunar em memória. As linhas ficam ordenadas pela chave de grupo
+    (ex.: jogador) e `offsets` marca onde cada grupo começa, então as linhas
+    de um jogador são uma fatia, sem busca. Chaves são codificadas: o código
+    é a posição do valor em `dictionaries[coluna]` (ordenado). As chaves em
+    `indexed` ganham um índice secundário (permutação + offsets) e
+    `rankings` guarda, por grupo de uma chave, as linhas em ordem
+    decrescente de uma coluna, para top-k sem ordenar na consulta.
+    """
+
+    def __init__(self, frame, group_by, keys=(), ints=(), floats=(), indexed=(), rankings=()):
+        frame = frame[frame[group_by].notna()].sort_values('id', kind='stable')
+        self.group_by = group_by
+        self.size = len(frame)
+        self.dictionaries = {}
+        columns = {}
+        for column in (group_by,) + tuple(keys):
+            values, codes = np.unique(_key_values(frame[column]), return_inverse=True)
+            self.dictionaries[column] = values
+            columns[column] = codes.astype(np.int32)
+        for column in ints:
+            columns[column] = frame[column].fillna(0).to_numpy(dtype=np.int32)
+        for column in floats:
+            columns[column] = frame[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        # Ordenação estável: dentro de um grupo as linhas seguem a ordem de id
+        order = np.argsort(columns[group_by], kind='stable')
+        self.columns = {name: np.ascontiguousarray(array[order]) for name, array in columns.items()}
+        self.offsets = self._offsets(group_by, self.columns[group_by])
+
+        self.indexes = {}
+        for column in indexed:
+            permutation = np.argsort(self.columns[column], kind='stable').astype(np.int32)
+            self.indexes[column] = (permutation, self._offsets(column, self.columns[column][permutation]))
+        self.rankings = {}
+        for column, by in rankings:
+            values = np.nan_to_num(self.columns[column].astype(np.float64), nan=-np.inf)
+            self.rankings[column, by] = np.lexsort((-values, self.columns[by])).astype(np.int32)
+
+    def _offsets(self, column, sorted_codes):
+        return np.searchsorted(sorted_codes, np.arange(len(self.dictionaries[column]) + 1))
+
+    @property
+    def nbytes(self):
+        arrays = list(self.columns.values()) + list(self.dictionaries.values()) + [self.offsets]
+        arrays += [array for index in self.indexes.values() for array in index] + list(self.rankings.values())
+        return sum(array.nbytes for array in arrays)
+
+    def code(self, column, value):
+        """Código de um valor de chave, ou None se ele não aparece na tabela"""
+        values = self.dictionaries[column]
+        try:
+            position = int(np.searchsorted(values, value))
+        except TypeError:
+            return None
+        if position < len(values) and values[position] == value:
+            return position
+        return None
+
+    def labels(self, column, codes):
+        """Valores originais de códigos de chave (NULL volta como None)"""
+        return [None if value in ('', -1) else value for value in self.dictionaries[column][codes].tolist()]
+
+    def rows(self, column, value):
+        """
+        Índices das linhas com coluna == valor: fatia da chave de grupo ou
+        trecho do índice secundário, sem percorrer a tabela
+        """
+        code = self.code(column, value)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        if column == self.group_by:
+            return np.arange(self.offsets[code], self.offsets[code + 1])
+        permutation, offsets = self.indexes[column]
+        return permutation[offsets[code]:offsets[code + 1]]
+
+    def ranked(self, column, by, value):
+        """Linhas do grupo `by` == valor em ordem decrescente de `column` (ranking pré-calculado)"""
+        code = self.code(by, value)
+        if code is None:
+            return np.empty(0, dtype=np.int32)
+        _, offsets = self.indexes[by]
+        return self.rankings[column, by][offsets[code]:offsets[code + 1]]
+
+    def group_sum(self, by, columns, rows=None):
+        """
+        Somas das colunas por valor da chave `by`, nas linhas informadas
+        (índices ou máscara; todas se None). Retorna (códigos dos grupos
+        presentes, {coluna: somas}), com `count` (linhas por grupo) e, para
+        floats, `<coluna>_count` (valores não nulos).
+        """
+        codes = self.columns[by] if rows is None else self.columns[by][rows]
+        size = len(self.dictionaries[by])
+        counts = np.bincount(codes, minlength=size)
+        present = np.flatnonzero(counts)
+        result = {'count': counts[present]}
+        for column in columns:
+            values = self.columns[column] if rows is None else self.columns[column][rows]
+            if values.dtype.kind == 'f':
+                valid = ~np.isnan(values)
+                result[column] = np.bincount(codes[valid], weights=values[valid], minlength=size)[present]
+                result[f'{column}_count'] = np.bincount(codes[valid], minlength=size)[present]
+            else:
+                result[column] = np.bincount(codes, weights=values, minlength=size)[present].astype(np.int64)
+        return present, result
+
+    def sums(self, rows, columns):
+        """Somas das colunas nas linhas informadas (NaN ignorado)"""
+        return {column: np.nansum(self.columns[column][rows]).item() for column in columns}
+
+    def top_k(self, column, k, rows):
+        """As k linhas (entre as informadas) com os maiores valores da coluna, em ordem decrescente"""
+        values = np.nan_to_num(self.columns[column][rows].astype(np.float64), nan=-np.inf)
+        if k < len(rows):
+            best = np.argpartition(-values, k)[:k]
+            rows, values = rows[best], values[best]
+        return rows[np.argsort(-values, kind='stable')]
+
+
+def _read_frame(name, model, columns, directory):
+    """
+    Colunas de uma tabela, do snapshot Parquet quando existe, senão do banco,
+    somadas às linhas das temporadas arquivadas
+    """
+    if snapshot.table_path(name, directory):
+        frame = snapshot.read_frame(name, list(columns), directory)
+    else:
+        with get_read_engine().connect() as connection:
+            frame = pd.read_sql(select(*[getattr(model, c) for c in columns]), connection)
+
+    archived = archive.read_frame(name, columns)
+    if archived is None or archived.empty:
+        return frame
+    # Um snapshot anterior ao arquivamento ainda tem as mesmas linhas (mesmos ids)
+    frame = pd.concat([frame, archived[list(columns)]], ignore_index=True)
+    return frame.drop_duplicates('id', keep='last', ignore_index=True)
+
+
+class AnalyticsEngine:
+    """Estatísticas de jogadores em memória e as consultas usadas pelos endpoints /api"""
+
+    def __init__(self, player_stats, advanced, players, teams, matches, source, version=None):
+        self.player_stats = player_stats
+        self.advanced = advanced
+        self.player_ids = players['id'].to_numpy(dtype=np.int64)
+        self.player_names = players['name'].to_numpy(dtype=object)
+        self.team_ids = teams['id'].to_numpy(dtype=np.int64)
+        self.team_names = teams['name'].to_numpy(dtype=object)
+        self.match_ids = matches['id'].to_numpy(dtype=np.int64)
+        self.match_days = pd.to_datetime(matches['date']).to_numpy(dtype='datetime64[D]')
+        self.season_totals = self._season_sums()
+        self.source = source
+        self.version = version
+        self.loaded_at = time.time()
+
+    @classmethod
+    def load(cls, directory=None):
+        """Carrega as tabelas (do snapshot, se houver, ou do banco) e monta as colunas"""
+        directory = directory or Config.SNAPSHOT_DIR
+        start = time.perf_counter()
+        # Lida antes das tabelas: dados gravados durante a carga pedem outra carga
+        version = _data_version(directory)
+        with get_read_engine().connect() as connection:
+            players = pd.read_sql(select(Player.id, Player.name, Player.team_id).order_by(Player.id), connection)
+            teams = pd.read_sql(select(Team.id, Team.name).order_by(Team.id), connection)
+
+        frame = _read_frame('player_stats', PlayerStats, ('id', 'player_id', 'season') + PLAYER_STATS_INTS + PLAYER_STATS_FLOATS, directory)
+        frame['team_id'] = frame['player_id'].map(players.set_index('id')['team_id'])
+        player_stats = ColumnTable(
+            frame, 'player_id', keys=('team_id', 'season'), ints=PLAYER_STATS_INTS, floats=PLAYER_STATS_FLOATS,
+            indexed=('team_id', 'season'), rankings=(('goals', 'season'), ('xg', 'season'))
+        )
+
+        frame = _read_frame('advanced_player_stats', AdvancedPlayerStats, ('id', 'player_id', 'season') + ADVANCED_INTS + ADVANCED_FLOATS, directory)
+        advanced = ColumnTable(frame, 'player_id', keys=('season',), ints=ADVANCED_INTS, floats=ADVANCED_FLOATS)
+
+        matches = _read_frame('matches', Match, ('id', 'date'), directory).sort_values('id')
+        manifest = snapshot.read_manifest(directory)
+        engine = cls(
+            player_stats, advanced, players, teams, matches,
+            source='snapshot' if manifest else 'database', version=version
+        )
+        logger.info(
+            f"📊 Motor de análises carregado ({engine.source}) em {time.perf_counter() - start:.2f}s: "
+            f"{player_stats.size} + {advanced.size} linhas, {engine.nbytes / 2 ** 20:.1f} MB"
+        )
+        return engine
+
+    @property
+    def nbytes(self):
+        return self.player_stats.nbytes + self.advanced.nbytes
+
+    def memory_usage(self):
+        """Bytes em memória por tabela e por milhão de linhas"""
+        usage = {}
+        for name, table in (('player_stats', self.player_stats), ('advanced_player_stats', self.advanced)):
+            usage[name] = {
+                'rows': table.size,
+                'bytes': table.nbytes,
+                'mb_per_million_rows': round(table.nbytes / max(table.size, 1) * 1e6 / 2 ** 20, 1)
+            }
+        return usage
+
+    def _lookup(self, ids, names, wanted):
+        wanted = np.asarray(wanted, dtype=np.int64)
+        positions = np.clip(np.searchsorted(ids, wanted), 0, max(len(ids) - 1, 0))
+        found = (ids[positions] == wanted) if len(ids) else np.zeros(len(wanted), dtype=bool)
+        return [names[p] if ok else None for p, ok in zip(positions.tolist(), found.tolist())]
+
+    def player_names_for(self, player_ids):
+        return self._lookup(self.player_ids, self.player_names, player_ids)
+
+    def team_names_for(self, team_ids):
+        return self._lookup(self.team_ids, self.team_names, team_ids)
+
+    # Consultas de player_stats (por temporada)
+
+    def player_seasons(self, player_id):
+        """Gols, assistências, xG e xA de cada temporada do jogador"""
+        table = self.player_stats
+        rows = table.rows('player_id', player_id)
+        return {
+            'seasons': table.labels('season', table.columns['season'][rows]),
+            'goals': table.columns['goals'][rows].tolist(),
+            'assists': table.columns['assists'][rows].tolist(),
+            'xg': np.nan_to_num(table.columns['xg'][rows]).tolist(),
+            'xa': np.nan_to_num(table.columns['xa'][rows]).tolist()
+        }
+
+    def _season_sums(self, rows=None):
+        groups, sums = self.player_stats.group_sum('season', ['goals', 'assists', 'xg'], rows)
+        sums['xg_avg'] = np.divide(sums['xg'], sums['xg_count'], out=np.zeros(len(groups)), where=sums['xg_count'] > 0)
+        return self.player_stats.labels('season', groups), sums
+
+    def team_seasons(self, team_id):
+        """Por temporada, soma de gols e assistências e média de xG dos jogadores do time"""
+        seasons, sums = self._season_sums(self.player_stats.rows('team_id', team_id))
+        return {
+            'seasons': seasons,
+            'goals': sums['goals'].tolist(),
+            'assists': sums['assists'].tolist(),
+            'xg': sums['xg_avg'].tolist()
+        }
+
+    def latest_season(self):
+        seasons = [s for s in self.player_stats.dictionaries['season'].tolist() if s]
+        return seasons[-1] if seasons else None
+
+    def _with_team(self, rows):
+        # Mesmo efeito do JOIN com teams: jogadores sem time ficam de fora
+        no_team = self.player_stats.code('team_id', -1)
+        if no_team is None:
+            return rows
+        return rows[self.player_stats.columns['team_id'][rows] != no_team]
+
+    def _leaders(self, column, season, k, team_id=None):
+        """k maiores valores da coluna na temporada (entre jogadores com time), pelo ranking pré-calculado"""
+        table = self.player_stats
+        if team_id is not None:
+            rows = table.rows('team_id', team_id)
+            return table.top_k(column, k, rows[table.columns['season'][rows] == table.code('season', season)])
+        ranked = table.ranked(column, 'season', season)
+        # Quase sempre os primeiros k*4 já bastam; senão filtra a temporada inteira
+        rows = self._with_team(ranked[:k * 4])
+        if len(rows) < k < len(ranked):
+            rows = self._with_team(ranked)
+        return rows[:k]
+
+    def top_scorers(self, season, k=10):
+        """Artilheiros da temporada: nome, time e gols"""
+        table = self.player_stats
+        rows = self._leaders('goals', season, k)
+        player_ids = table.dictionaries['player_id'][table.columns['player_id'][rows]]
+        team_ids = table.dictionaries['team_id'][table.columns['team_id'][rows]]
+        return [
+            {'name': name, 'team': team, 'goals': goals}
+            for name, team, goals in zip(
+                self.player_names_for(player_ids), self.team_names_for(team_ids), table.columns['goals'][rows].tolist()
+            )
+        ]
+
+    def xg_leaders(self, season, k=5, team_id=None):
+        """Maiores xG da temporada, com gols e xG por 90 minutos"""
+        table = self.player_stats
+        rows = self._leaders('xg', season, k, team_id)
+        player_ids = table.dictionaries['player_id'][table.columns['player_id'][rows]]
+        xg = np.nan_to_num(table.columns['xg'][rows])
+        xg_per_90 = per_90(xg, table.columns['minutes_played'][rows])
+        return [
+            {'name': name, 'xg': round(x, 2), 'goals': goals, 'xg_per_90': round(x90, 2)}
+            for name, x, goals, x90 in zip(
+                self.player_names_for(player_ids), xg.tolist(), table.columns['goals'][rows].tolist(), xg_per_90.tolist()
+            )
+        ]
+
+    def season_trend(self, seasons=5, team_id=None):
+        """xG e gols somados por temporada (as `seasons` mais recentes, em ordem cronológica)"""
+        if team_id is None:
+            labels, sums = self.season_totals
+        else:
+            labels, sums = self._season_sums(self.player_stats.rows('team_id', team_id))
+        keep = [i for i, label in enumerate(labels) if label][-seasons:]
+        return {
+            'seasons': [labels[i] for i in keep],
+            'xg': [round(float(sums['xg'][i]), 2) for i in keep],
+            'goals': [int(sums['goals'][i]) for i in keep]
+        }
+
+    # Consultas de advanced_player_stats (por partida)
+
+    def player_matches(self, player_id, columns):
+        """Linhas do jogador (temporada, partida e colunas pedidas), em ordem de gravação"""
+        table = self.advanced
+        rows = table.rows('player_id', player_id)
+        data = {'season': table.labels('season', table.columns['season'][rows])}
+        for column in ('match_id',) + tuple(columns):
+            values = table.columns[column][rows]
+            data[column] = (np.nan_to_num(values) if values.dtype.kind == 'f' else values).tolist()
+        return [dict(zip(data, values)) for values in zip(*data.values())]
+
+    def player_totals(self, player_id, columns):
+        """Somas das colunas em todas as partidas do jogador, com o total de partidas (`matches`)"""
+        rows = self.advanced.rows('player_id', player_id)
+        return dict(self.advanced.sums(rows, columns), matches=len(rows))
+
+    def player_recent_matches(self, player_id, columns, limit=10):
+        """Últimas `limit` partidas do jogador (pela data do jogo, depois por id), em ordem cronológica"""
+        table = self.advanced
+        rows = table.rows('player_id', player_id)
+        match_ids = table.columns['match_id'][rows].astype(np.int64)
+        positions = np.clip(np.searchsorted(self.match_ids, match_ids), 0, max(len(self.match_ids) - 1, 0))
+        if len(self.match_ids):
+            days = np.where(self.match_ids[positions] == match_ids, self.match_days[positions], np.datetime64('NaT'))
+        else:
+            days = np.full(len(rows), np.datetime64('NaT'), dtype='datetime64[D]')
+        missing = np.isnat(days)
+        day_numbers = np.where(missing, 0, days.astype(np.int64))
+        recent = rows[np.lexsort((-match_ids, -day_numbers, missing))[:limit]][::-1]
+        result = []
+        for row in recent.tolist():
+            item = {'match_id': int(table.columns['match_id'][row])}
+            for column in columns:
+                value = table.columns[column][row]
+                item[column] = 0 if value != value else value.item()
+            result.append(item)
+        return result
+
+
+def _manifest_version(directory):
+    path = os.path.join(directory, snapshot.MANIFEST)
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+
+def _data_version(directory=None):
+    """Versão dos dados que o motor enxerga: a do snapshot, se houver, senão a geração do banco"""
+    version = _manifest_version(directory or Config.SNAPSHOT_DIR)
+    return version if version is not None else current_data_version()
+
+
+def _stale(engine):
+    """Snapshot regravado ou, sem snapshot, nova geração dos dados desde a carga"""
+    global _checked_at
+    now = time.time()
+    if now - _checked_at < Config.ANALYTICS_CHECK_SECONDS:
+        return False
+    _checked_at = now
+    return _data_version() != engine.version
+
+
+def _swap():
+    global _current
+    _current = AnalyticsEngine.load()
+    return _current
+
+
+def _reload_in_background(app):
+    try:
+        with app.app_context():
+            _swap()
+    except Exception as e:
+        logger.warning(f"⚠️ Motor de análises não recarregado: {e}")
+    finally:
+        _lock.release()
+
+
+def reload(blocking=True):
+    """
+    Monta um motor novo e troca o atual de uma vez; as requisições em
+    andamento terminam com o anterior. Sem `blocking`, a carga vai para uma
+    thread e a chamada retorna None na hora (nada é feito se outra thread já
+    está recarregando); o motor atual segue em uso até a troca.
+    """
+    if not blocking:
+        if _lock.acquire(blocking=False):
+            app = current_app._get_current_object()
+            threading.Thread(target=_reload_in_background, args=(app,), name='analytics-reload', daemon=True).start()
+        return None
+    with _lock:
+        return _swap()
+
+
+def current():
+    """Motor em uso: carregado na primeira chamada e recarregado em segundo plano quando os dados mudam"""
+    engine = _current
+    if engine is None:
+        with _lock:
+            return _current or _swap()
+    if _stale(engine):
+        reload(blocking=False)
+    return engine
+
+
+def version():
+    """Identifica os dados do motor em uso: versão do snapshot ou, sem snapshot, geração do banco na carga"""
+    return current().version
+
+
+def init_app(app):
+    """Carrega o motor no início do worker (ANALYTICS_PRELOAD); falhas só adiam a carga para o primeiro uso"""
+    if not app.config.get('ANALYTICS_PRELOAD'):
+        return
+    with app.app_context():
+        try:
+            reload()
+        except Exception as e:
+            logger.warning(f"⚠️ Motor de análises não carregado no início: {e}")
@@ -1,29 +1,62 @@
-from flask import Flask
-from config import config
-from database.db_connection import db, login_manager
-from flask_migrate import Migrate
-
-def create_app(config_name='default'):
-    app = Flask(__name__)
-    app.config.from_object(config[config_name])
-    
-    # Inicializar extensões
-    db.init_app(app)
-    login_manager.init_app(app)
-    login_manager.login_view = 'auth.login'
-    
-    # Configurar migrações
-    migrate = Migrate(app, db)
-    
-    # Registrar blueprints
-    from app.routes import main_bp
-    from app.auth import auth_bp
-    
-    app.register_blueprint(main_bp)
-    app.register_blueprint(auth_bp)
-    
-    # Criar tabelas do banco de dados
-    with app.app_context():
-        db.create_all()
-    
+from flask import Flask
+from config import config
+from database.db_connection import db, login_manager
+from flask_migrate import Migrate
+
+def create_app(config_name='default'):
+    app = Flask(__name__)
+    app.config.from_object(config[config_name])
+    
+    # Inicializar extensões
+    db.init_app(app)
+    login_manager.init_app(app)
+    login_manager.login_view = 'auth.login'
+    
+    # Identidade do usuário logado em cache (user_loader do Flask-Login)
+    from app import identity
+    identity.init_app(app)
+    
+    # Configurar migrações
+    migrate = Migrate(app, db)
+    
+    # Roteamento para a réplica de leitura (read-your-writes e flask replica-status)
+    from database import routing
+    routing.init_app(app)
+    
+    # Agregados por temporada mantidos a cada commit (e comando flask rebuild-aggregates)
+    from database.aggregates import register_aggregates
+    register_aggregates(app)
+    
+    # Geração dos dados (nova a cada commit da coleta) e cache das respostas JSON
+    from database.data_version import register_data_version
+    from app import response_cache
+    register_data_version(app)
+    response_cache.init_app(app)
+    
+    # Snapshot Parquet das estatísticas (comando flask export-snapshot)
+    from database.snapshot import export_snapshot_command
+    app.cli.add_command(export_snapshot_command)
+    
+    # Arquivo das temporadas antigas (comandos flask archive-seasons e restore-season)
+    from database.archive import archive_seasons_command, restore_season_command
+    app.cli.add_command(archive_seasons_command)
+    app.cli.add_command(restore_season_command)
+    
+    # Registrar blueprints
+    from app.routes import main_bp
+    from app.auth import auth_bp
+    from app.api import api_bp
+    
+    app.register_blueprint(main_bp)
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(api_bp)
+    
+    # Criar tabelas do banco de dados
+    with app.app_context():
+        db.create_all()
+    
+    # Motor de análises em memória, carregado no início do worker
+    import analytics
+    analytics.init_app(app)
+    
     return app
\ No newline at end of file
@@ -0,0 +1,107 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:  # redis é opcional; sem ele cada worker fica só com o cache em memória
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Cache em memória do processo, thread-safe: LRU limitado a `max_entries`
+    entradas, cada uma válida por `ttl` segundos.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key):
+        """Valor guardado ou None (ausente ou vencido)"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                self.stats['misses'] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def resize(self, max_entries, ttl):
+        """Aplica os limites da configuração da aplicação"""
+        with self.lock:
+            self.max_entries, self.ttl = max_entries, ttl
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def status(self):
+        with self.lock:
+            return dict(self.stats, entries=len(self.entries), max_entries=self.max_entries, ttl_s=self.ttl)
+
+
+class SharedCache:
+    """
+    Camada compartilhada entre workers (Redis), com valores em JSON. Falhas de
+    conexão contam como cache vazio: o chamador segue para o banco.
+    """
+
+    def __init__(self, client, prefix):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        try:
+            raw = self.client.get(f'{self.prefix}{key}')
+        except Exception as e:
+            logger.warning(f"⚠️ Cache compartilhado indisponível: {e}")
+            return None
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value, ttl):
+        try:
+            self.client.set(f'{self.prefix}{key}', json.dumps(value), ex=max(int(ttl), 1))
+        except Exception as e:
+            logger.warning(f"⚠️ Cache compartilhado indisponível: {e}")
+
+    def delete(self, key):
+        try:
+            self.client.delete(f'{self.prefix}{key}')
+        except Exception as e:
+            logger.warning(f"⚠️ Cache compartilhado indisponível: {e}")
+
+
+def shared_cache(url, prefix):
+    """SharedCache no Redis de CACHE_REDIS_URL, ou None se não configurado (ou sem o pacote redis)"""
+    if not url:
+        return None
+    if redis is None:
+        logger.warning("⚠️ CACHE_REDIS_URL definido, mas o pacote redis não está instalado; usando só o cache local")
+        return None
+    return SharedCache(redis.Redis.from_url(url, socket_timeout=0.5), prefix)
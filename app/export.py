@@ -0,0 +1,233 @@
+import csv
+import io
+import re
+import zipfile
+from decimal import Decimal
+from xml.sax.saxutils import escape, quoteattr
+import pyarrow as pa
+import pyarrow.parquet as pq
+from flask import Response
+from config import Config
+from database.db_connection import get_read_engine
+from database.snapshot import arrow_type
+
+# Exportações em streaming: as linhas saem do banco por cursor no servidor em
+# lotes de EXPORT_CHUNK_SIZE e cada lote é gravado direto na resposta (CSV,
+# XLSX ou Parquet), sem DataFrame, sem arquivo temporário e sem limite de
+# linhas. A memória usada depende do tamanho do lote, não do total.
+
+XLSX_MAX_ROWS = 1048576
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PACKAGE_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+# Caracteres de controle que o XML não aceita (o Excel recusa o arquivo)
+ILLEGAL_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+STYLES_XML = (
+    f'{XML_HEADER}<styleSheet xmlns="{MAIN_NS}">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+class _Sink:
+    """Destino de escrita que só acumula bytes até o próximo drain() (o que vai para a resposta)"""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+        self.written = 0
+        self.closed = False
+
+    def write(self, data):
+        self.written += len(data)
+        return self.buffer.write(data)
+
+    def tell(self):
+        return self.written
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+
+def _chunks(engine, query, chunk_size):
+    """Lotes de linhas da consulta, lidos com cursor no servidor"""
+    with engine.connect() as connection:
+        result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+        yield from result.partitions(chunk_size)
+
+
+def csv_stream(columns, chunks):
+    """CSV em UTF-8 com BOM (o Excel reconhece a acentuação)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in columns])
+    yield ('\ufeff' + buffer.getvalue()).encode()
+    for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([[row._mapping[key] for _, key in columns] for row in rows])
+        yield buffer.getvalue().encode()
+
+
+def _column_letter(index):
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _xlsx_row(number, values, style=None):
+    cells = []
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        ref = f'{_column_letter(i)}{number}'
+        styled = f' s="{style}"' if style else ''
+        if isinstance(value, bool):
+            cells.append(f'<c r="{ref}"{styled} t="b"><v>{int(value)}</v></c>')
+        elif isinstance(value, (int, float, Decimal)):
+            cells.append(f'<c r="{ref}"{styled}><v>{value}</v></c>')
+        else:
+            text = escape(ILLEGAL_XML.sub('', str(value)))
+            cells.append(f'<c r="{ref}"{styled} t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row r="{number}">{"".join(cells)}</row>'
+
+
+def xlsx_stream(columns, chunks, sheet_name='Dados'):
+    """
+    XLSX gravado direto na resposta: o ZIP é escrito sem seek (descritores de
+    dados), uma planilha por vez, com no máximo XLSX_MAX_ROWS linhas cada
+    (continua em 'Dados 2', 'Dados 3'...). O workbook, que lista as
+    planilhas, vai no fim do arquivo.
+    """
+    sink = _Sink()
+    headers = [header for header, _ in columns]
+    sheets = []
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=6) as archive:
+        sheet = None
+        number = 0
+
+        def open_sheet():
+            sheets.append(sheet_name if not sheets else f'{sheet_name} {len(sheets) + 1}')
+            part = archive.open(f'xl/worksheets/sheet{len(sheets)}.xml', 'w', force_zip64=True)
+            part.write(f'{XML_HEADER}<worksheet xmlns="{MAIN_NS}"><sheetData>'.encode())
+            part.write(_xlsx_row(1, headers, style=1).encode())
+            return part
+
+        def close_sheet(part):
+            part.write(b'</sheetData></worksheet>')
+            part.close()
+
+        for rows in chunks:
+            lines = []
+            for row in rows:
+                if sheet is None or number == XLSX_MAX_ROWS:
+                    if sheet is not None:
+                        sheet.write(''.join(lines).encode())
+                        lines = []
+                        close_sheet(sheet)
+                    sheet, number = open_sheet(), 1
+                number += 1
+                lines.append(_xlsx_row(number, [row._mapping[key] for _, key in columns]))
+            if lines:
+                sheet.write(''.join(lines).encode())
+            yield sink.drain()
+        if sheet is None:
+            sheet = open_sheet()
+        close_sheet(sheet)
+
+        entries = ''.join(
+            f'<sheet name={quoteattr(name)} sheetId="{i}" r:id="rId{i}"/>' for i, name in enumerate(sheets, 1)
+        )
+        archive.writestr('xl/workbook.xml', f'{XML_HEADER}<workbook xmlns="{MAIN_NS}" xmlns:r="{REL_NS}"><sheets>{entries}</sheets></workbook>')
+        relations = ''.join(
+            f'<Relationship Id="rId{i}" Type="{REL_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, len(sheets) + 1)
+        )
+        relations += f'<Relationship Id="rId{len(sheets) + 1}" Type="{REL_NS}/styles" Target="styles.xml"/>'
+        archive.writestr('xl/_rels/workbook.xml.rels', f'{XML_HEADER}<Relationships xmlns="{PACKAGE_REL_NS}">{relations}</Relationships>')
+        archive.writestr('xl/styles.xml', STYLES_XML)
+        archive.writestr('_rels/.rels', (
+            f'{XML_HEADER}<Relationships xmlns="{PACKAGE_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{REL_NS}/officeDocument" Target="xl/workbook.xml"/></Relationships>'
+        ))
+        overrides = ''.join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, len(sheets) + 1)
+        )
+        archive.writestr('[Content_Types].xml', (
+            f'{XML_HEADER}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            f'{overrides}</Types>'
+        ))
+    yield sink.drain()
+
+
+def parquet_stream(columns, chunks, schema):
+    """Parquet (zstd) com um row group por lote"""
+    sink = _Sink()
+    with pq.ParquetWriter(sink, schema, compression='zstd') as writer:
+        for rows in chunks:
+            arrays = [pa.array([row._mapping[key] for row in rows], type=field.type) for (_, key), field in zip(columns, schema)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'excel': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def export_response(query, columns, filename, fmt='excel', chunk_size=None):
+    """
+    Resposta em streaming com as linhas de `query` no formato pedido.
+    `columns` é a lista de (cabeçalho, coluna da consulta); `filename` vai
+    sem extensão. ValueError para formato desconhecido.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'Formato inválido: {fmt}')
+    mimetype, extension = FORMATS[fmt]
+    chunks = _chunks(get_read_engine(), query, chunk_size or Config.EXPORT_CHUNK_SIZE)
+
+    if extension == 'csv':
+        body = csv_stream(columns, chunks)
+    elif extension == 'xlsx':
+        body = xlsx_stream(columns, chunks)
+    else:
+        types = {column.key: arrow_type(column) for column in query.selected_columns}
+        schema = pa.schema([(header, types[key]) for header, key in columns])
+        body = parquet_stream(columns, chunks, schema)
+
+    response = Response(body, mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}.{extension}"'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
@@ -0,0 +1,102 @@
+from flask_login import UserMixin, user_logged_out
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from config import Config
+from app.cache import TTLCache, shared_cache
+from app.models import db, login_manager, User
+
+# Identidade do usuário logado em cache: cada XHR com @login_required deixa de
+# consultar a tabela users. Entradas duram USER_CACHE_TTL segundos e saem
+# quando a alteração ou remoção do usuário é confirmada (commit) ou no logout.
+# Com CACHE_REDIS_URL só a camada compartilhada é usada, então a remoção vale
+# para todos os workers na hora; sem ela cada worker tem o próprio cache e os
+# outros workers só deixam de ver a identidade antiga após USER_CACHE_TTL.
+
+CHANGED_KEY = 'identity_changed'
+
+_local = TTLCache(Config.USER_CACHE_SIZE, Config.USER_CACHE_TTL)
+_shared = None
+
+
+class UserIdentity(UserMixin):
+    """Dados do usuário logado (sem vínculo com a sessão do banco), como vistos pelo Flask-Login"""
+
+    FIELDS = ('id', 'username', 'email', 'is_admin')
+
+    def __init__(self, id, username, email, is_admin=False):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.is_admin = bool(is_admin)
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(**{field: getattr(user, field) for field in cls.FIELDS})
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self):
+        return f'<User {self.username}>'
+
+
+@login_manager.user_loader
+def load_user(user_id):
+    user_id = int(user_id)
+    if _shared:
+        data = _shared.get(user_id)
+        if data is None:
+            user = db.session.get(User, user_id)
+            if user is None:
+                return None
+            data = UserIdentity.from_user(user).to_dict()
+            _shared.set(user_id, data, _local.ttl)
+        return UserIdentity(**data)
+
+    identity = _local.get(user_id)
+    if identity is None:
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        identity = UserIdentity.from_user(user)
+        _local.set(user_id, identity)
+    return identity
+
+
+def invalidate(user_id):
+    """Descarta a identidade em cache (a camada compartilhada ou, sem ela, a deste worker)"""
+    _local.delete(user_id)
+    if _shared:
+        _shared.delete(user_id)
+
+
+def _collect_flushed(session, flush_context):
+    changed = [obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)]
+    if changed:
+        session.info.setdefault(CHANGED_KEY, set()).update(changed)
+
+
+def _invalidate_after_commit(session):
+    for user_id in session.info.pop(CHANGED_KEY, ()):
+        invalidate(user_id)
+
+
+def _discard(session):
+    session.info.pop(CHANGED_KEY, None)
+
+
+def _logged_out(sender, user, **kwargs):
+    if user is not None and user.is_authenticated:
+        invalidate(int(user.get_id()))
+
+
+def init_app(app):
+    """Aplica USER_CACHE_SIZE/USER_CACHE_TTL e liga a camada compartilhada (CACHE_REDIS_URL)"""
+    global _shared
+    _local.resize(app.config['USER_CACHE_SIZE'], app.config['USER_CACHE_TTL'])
+    _shared = shared_cache(app.config.get('CACHE_REDIS_URL'), 'futebol:user:')
+    user_logged_out.connect(_logged_out, app)
+    if not event.contains(Session, 'after_commit', _invalidate_after_commit):
+        event.listen(Session, 'after_flush', _collect_flushed)
+        event.listen(Session, 'after_commit', _invalidate_after_commit)
+        event.listen(Session, 'after_rollback', _discard)
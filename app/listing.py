@@ -0,0 +1,214 @@
+import base64
+import binascii
+import json
+from sqlalchemy import and_, func, or_, select, text
+from app.models import db, League, Team, Player
+from app.queries import latest_player_stats
+
+# Listagens paginadas por chave (keyset): cada página continua a partir dos
+# valores de ordenação da última linha vista (WHERE (nome, id) > (...) ...
+# LIMIT n), então o custo é o mesmo na primeira e na milésima página. Só há
+# ordenação e filtro em colunas indexadas (liga, time, posição, prefixo do nome).
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+COUNT_CAP = 10000
+POSITIONS = ('GK', 'DF', 'MF', 'FW')
+
+
+def encode_cursor(direction, values):
+    """Cursor opaco: direção ('after'/'before') e valores de ordenação da linha de referência"""
+    raw = json.dumps([direction, values], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(direção, valores) do cursor, ou (None, None) sem cursor; ValueError se inválido"""
+    if not cursor:
+        return None, None
+    try:
+        direction, values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError('Cursor inválido')
+    if direction not in ('after', 'before') or not isinstance(values, list):
+        raise ValueError('Cursor inválido')
+    return direction, values
+
+
+def _beyond(columns, values, descending):
+    # (a, b) > (x, y) escrito como a > x OR (a = x AND b > y), forma que o
+    # MySQL transforma em leitura de intervalo no índice
+    conditions = []
+    for i, column in enumerate(columns):
+        step = column < values[i] if descending else column > values[i]
+        conditions.append(and_(*[c == v for c, v in zip(columns[:i], values[:i])], step))
+    return or_(*conditions)
+
+
+def keyset_page(query, columns, cursor=None, limit=PAGE_SIZE, descending=False):
+    """
+    Uma página de `query` ordenada por `columns` (a última deve ser única, ex.: id).
+    Retorna (linhas, cursor_seguinte, cursor_anterior); cursores None nas pontas.
+    """
+    direction, values = decode_cursor(cursor)
+    if values is not None and len(values) != len(columns):
+        raise ValueError('Cursor inválido')
+    backwards = direction == 'before'
+    reverse = descending != backwards
+
+    if values is not None:
+        query = query.where(_beyond(columns, values, reverse))
+    query = query.order_by(*[c.desc() if reverse else c.asc() for c in columns]).limit(limit + 1)
+    rows = db.session.execute(query).all()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+    if not rows:
+        return rows, None, None
+
+    key = lambda row: [row._mapping[c] for c in columns]
+    following = encode_cursor('after', key(rows[-1])) if (more if not backwards else values is not None) else None
+    preceding = encode_cursor('before', key(rows[0])) if (more if backwards else values is not None) else None
+    return rows, following, preceding
+
+
+def table_rows_estimate(table):
+    """Linhas da tabela segundo as estatísticas do MySQL (sem COUNT); None em outros bancos"""
+    if db.engine.dialect.name != 'mysql':
+        return None
+    return db.session.execute(
+        text('SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = :name'),
+        {'name': table.name}
+    ).scalar()
+
+
+def estimate_count(query, table=None, filtered=True, cap=COUNT_CAP):
+    """
+    Total da listagem como (total, exato). Sem filtros usa a estimativa da
+    tabela; com filtros conta no máximo `cap` linhas ("10000+").
+    """
+    if not filtered and table is not None:
+        estimate = table_rows_estimate(table)
+        if estimate is not None:
+            return int(estimate), False
+    count = db.session.execute(select(func.count()).select_from(query.limit(cap + 1).subquery())).scalar()
+    return min(count, cap), count <= cap
+
+
+def name_prefix(column, prefix):
+    """Filtro de prefixo (LIKE 'abc%'), que usa o índice do nome"""
+    escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return column.like(f'{escaped}%', escape='\\')
+
+
+def _sort(columns, sort):
+    if sort in ('name', '-name'):
+        return [columns['name'], columns['id']], sort.startswith('-')
+    if sort in ('id', '-id'):
+        return [columns['id']], sort.startswith('-')
+    raise ValueError('Ordenação inválida')
+
+
+def players_page(league_id=None, team_id=None, position=None, prefix=None, sort='name', cursor=None,
+                 limit=PAGE_SIZE, with_stats=True, count=True):
+    """
+    Página de jogadores com time, liga e (com `with_stats`) as estatísticas
+    da temporada mais recente; jogadores sem time ou sem liga ficam de fora,
+    como na listagem original. ValueError para posição fora de POSITIONS. Retorna {'items', 'next_cursor', 'prev_cursor', 'total', 'total_exact'}.
+    """
+    query = (
+        select(
+            Player.id, Player.name, Player.position, Player.nationality, Player.team_id,
+            Team.name.label('team_name'), Team.league_id, League.name.label('league_name')
+        )
+        .join(Team, Team.id == Player.team_id)
+        .join(League, League.id == Team.league_id)
+    )
+    filters = []
+    if league_id:
+        filters.append(Team.league_id == league_id)
+    if team_id:
+        filters.append(Player.team_id == team_id)
+    if position:
+        if position not in POSITIONS:
+            raise ValueError('Posição inválida')
+        filters.append(Player.position == position)
+    if prefix:
+        filters.append(name_prefix(Player.name, prefix))
+    query = query.where(*filters)
+
+    columns, descending = _sort({'name': Player.name, 'id': Player.id}, sort)
+    rows, following, preceding = keyset_page(query, columns, cursor, max(1, min(limit, MAX_PAGE_SIZE)), descending)
+    items = [dict(row._mapping) for row in rows]
+    if with_stats:
+        stats = latest_player_stats([item['id'] for item in items])
+        for item in items:
+            item['stats'] = stats.get(item['id'])
+
+    page = {'items': items, 'next_cursor': following, 'prev_cursor': preceding}
+    if count:
+        page['total'], page['total_exact'] = estimate_count(query, Player.__table__, bool(filters))
+    return page
+
+
+def teams_page(league_id=None, prefix=None, sort='name', cursor=None, limit=PAGE_SIZE, count=True):
+    """Página de times com a liga; mesmo formato de players_page"""
+    query = (
+        select(Team.id, Team.name, Team.league_id, League.name.label('league_name'))
+        .outerjoin(League, League.id == Team.league_id)
+    )
+    filters = []
+    if league_id:
+        filters.append(Team.league_id == league_id)
+    if prefix:
+        filters.append(name_prefix(Team.name, prefix))
+    query = query.where(*filters)
+
+    columns, descending = _sort({'name': Team.name, 'id': Team.id}, sort)
+    rows, following, preceding = keyset_page(query, columns, cursor, max(1, min(limit, MAX_PAGE_SIZE)), descending)
+    page = {'items': [dict(row._mapping) for row in rows], 'next_cursor': following, 'prev_cursor': preceding}
+    if count:
+        page['total'], page['total_exact'] = estimate_count(query, Team.__table__, bool(filters))
+    return page
+
+
+def team_rosters(team_ids, top=3):
+    """
+    Número de jogadores e os `top` artilheiros (temporada mais recente) de
+    cada time de uma página, em duas consultas: {team_id: {'players': n, 'top': [...]}}
+    """
+    rosters = {team_id: {'players': 0, 'top': []} for team_id in team_ids}
+    if not team_ids:
+        return rosters
+
+    players = db.session.execute(select(Player.id, Player.name, Player.team_id).where(Player.team_id.in_(team_ids))).all()
+    stats = latest_player_stats([player.id for player in players])
+    scored = []
+    for player in players:
+        rosters[player.team_id]['players'] += 1
+        latest = stats.get(player.id) or {}
+        scored.append((-(latest.get('goals') or 0), -(latest.get('assists') or 0), player.name, player))
+
+    for goals, assists, name, player in sorted(scored, key=lambda item: item[:3]):
+        roster = rosters[player.team_id]
+        if len(roster['top']) < top:
+            roster['top'].append({'id': player.id, 'name': name, 'goals': -goals, 'assists': -assists})
+    return rosters
+
+
+def league_options():
+    """(id, nome) de todas as ligas, para os filtros (a tabela tem dezenas de linhas)"""
+    return db.session.execute(select(League.id, League.name).order_by(League.name)).all()
+
+
+def team_options(league_id=None, team_ids=()):
+    """(id, nome) dos times da liga e/ou dos ids informados, para os filtros"""
+    conditions = []
+    if league_id:
+        conditions.append(Team.league_id == league_id)
+    if team_ids:
+        conditions.append(Team.id.in_(team_ids))
+    if not conditions:
+        return []
+    return db.session.execute(select(Team.id, Team.name).where(or_(*conditions)).order_by(Team.name)).all()
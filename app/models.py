@@ -1,197 +1,463 @@
-from database.db_connection import db, login_manager
-from flask_login import UserMixin
-from datetime import datetime
-
-@login_manager.user_loader
-def load_user(user_id):
-    return User.query.get(int(user_id))
-
-class User(db.Model, UserMixin):
-    __tablename__ = 'users'
-    id = db.Column(db.Integer, primary_key=True)
-    username = db.Column(db.String(64), unique=True, nullable=False)
-    email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    is_admin = db.Column(db.Boolean, default=False)
-    
-    def __repr__(self):
-        return f'<User {self.username}>'
-
-class League(db.Model):
-    __tablename__ = 'leagues'
-    id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
-    country = db.Column(db.String(50))
-    season = db.Column(db.String(20))
-    url = db.Column(db.String(500))
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    teams = db.relationship('Team', backref='league', lazy=True)
-
-class Team(db.Model):
-    __tablename__ = 'teams'
-    id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
-    league_id = db.Column(db.Integer, db.ForeignKey('leagues.id'))
-    url = db.Column(db.String(500))
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    players = db.relationship('Player', backref='team', lazy=True)
-
-class Player(db.Model):
-    __tablename__ = 'players'
-    id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
-    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'))
-    position = db.Column(db.String(50))
-    nationality = db.Column(db.String(50))
-    age = db.Column(db.Integer)
-    url = db.Column(db.String(500))
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    stats = db.relationship('PlayerStats', backref='player', lazy=True)
-
-class PlayerStats(db.Model):
-    __tablename__ = 'player_stats'
-    id = db.Column(db.Integer, primary_key=True)
-    player_id = db.Column(db.Integer, db.ForeignKey('players.id'))
-    season = db.Column(db.String(20))
-    matches_played = db.Column(db.Integer)
-    goals = db.Column(db.Integer)
-    assists = db.Column(db.Integer)
-    minutes_played = db.Column(db.Integer)
-    xg = db.Column(db.Float)
-    xa = db.Column(db.Float)
-    shots = db.Column(db.Integer)
-    key_passes = db.Column(db.Integer)
-    yellow_cards = db.Column(db.Integer)
-    red_cards = db.Column(db.Integer)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-class Match(db.Model):
-    __tablename__ = 'matches'
-    id = db.Column(db.Integer, primary_key=True)
-    date = db.Column(db.Date)
-    home_team_id = db.Column(db.Integer, db.ForeignKey('teams.id'))
-    away_team_id = db.Column(db.Integer, db.ForeignKey('teams.id'))
-    home_goals = db.Column(db.Integer)
-    away_goals = db.Column(db.Integer)
-    result = db.Column(db.String(10))
-    possession_home = db.Column(db.Float)
-    possession_away = db.Column(db.Float)
-    shots_home = db.Column(db.Integer)
-    shots_away = db.Column(db.Integer)
-    xg_home = db.Column(db.Float)
-    xg_away = db.Column(db.Float)
-    passes_home = db.Column(db.Integer)
-    passes_away = db.Column(db.Integer)
-    pass_accuracy_home = db.Column(db.Float)
-    pass_accuracy_away = db.Column(db.Float)
-    fouls_home = db.Column(db.Integer)
-    fouls_away = db.Column(db.Integer)
-    corners_home = db.Column(db.Integer)
-    corners_away = db.Column(db.Integer)
-    saves_home = db.Column(db.Integer)
-    saves_away = db.Column(db.Integer)
-    goal_times = db.Column(db.Text)
-    correct_score = db.Column(db.String(10))
-    score_probabilities = db.Column(db.Text)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    home_team = db.relationship('Team', foreign_keys=[home_team_id])
-    away_team = db.relationship('Team', foreign_keys=[away_team_id])
-    
-    def get_goal_times_list(self):
-        """Retorna lista de minutos dos gols"""
-        if self.goal_times:
-            return [int(t) for t in self.goal_times.split(',')]
-        return []
-    
-    def get_score_probabilities_dict(self):
-        """Retorna dicionário de probabilidades"""
-        if self.score_probabilities:
-            import json
-            return json.loads(self.score_probabilities)
-        return {}
-
-class AdvancedPlayerStats(db.Model):
-    __tablename__ = 'advanced_player_stats'
-    id = db.Column(db.Integer, primary_key=True)
-    player_id = db.Column(db.Integer, db.ForeignKey('players.id'))
-    match_id = db.Column(db.Integer, db.ForeignKey('matches.id'))
-    season = db.Column(db.String(20))
-    xg = db.Column(db.Float, default=0.0)
-    xa = db.Column(db.Float, default=0.0)
-    xg_chain = db.Column(db.Float, default=0.0)
-    xg_buildup = db.Column(db.Float, default=0.0)
-    total_passes = db.Column(db.Integer, default=0)
-    accurate_passes = db.Column(db.Integer, default=0)
-    pass_accuracy = db.Column(db.Float, default=0.0)
-    key_passes = db.Column(db.Integer, default=0)
-    through_balls = db.Column(db.Integer, default=0)
-    crosses = db.Column(db.Integer, default=0)
-    long_balls = db.Column(db.Integer, default=0)
-    saves = db.Column(db.Integer, default=0)
-    saves_inside_box = db.Column(db.Integer, default=0)
-    saves_penalties = db.Column(db.Integer, default=0)
-    punches = db.Column(db.Integer, default=0)
-    catches = db.Column(db.Integer, default=0)
-    fouls_committed = db.Column(db.Integer, default=0)
-    fouls_suffered = db.Column(db.Integer, default=0)
-    yellow_cards = db.Column(db.Integer, default=0)
-    red_cards = db.Column(db.Integer, default=0)
-    touches = db.Column(db.Integer, default=0)
-    touches_att_third = db.Column(db.Integer, default=0)
-    carries = db.Column(db.Integer, default=0)
-    progressive_carries = db.Column(db.Integer, default=0)
-    goals_0_15 = db.Column(db.Integer, default=0)
-    goals_16_30 = db.Column(db.Integer, default=0)
-    goals_31_45 = db.Column(db.Integer, default=0)
-    goals_46_60 = db.Column(db.Integer, default=0)
-    goals_61_75 = db.Column(db.Integer, default=0)
-    goals_76_90 = db.Column(db.Integer, default=0)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    player = db.relationship('Player', backref=db.backref('advanced_stats', lazy=True))
-    match = db.relationship('Match', backref=db.backref('player_advanced_stats', lazy=True))
-
-class TeamStats(db.Model):
-    __tablename__ = 'team_stats'
-    id = db.Column(db.Integer, primary_key=True)
-    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'))
-    match_id = db.Column(db.Integer, db.ForeignKey('matches.id'))
-    season = db.Column(db.String(20))
-    possession = db.Column(db.Float, default=0.0)
-    total_passes = db.Column(db.Integer, default=0)
-    accurate_passes = db.Column(db.Integer, default=0)
-    pass_accuracy = db.Column(db.Float, default=0.0)
-    total_shots = db.Column(db.Integer, default=0)
-    shots_on_target = db.Column(db.Integer, default=0)
-    shots_off_target = db.Column(db.Integer, default=0)
-    shots_blocked = db.Column(db.Integer, default=0)
-    xg = db.Column(db.Float, default=0.0)
-    xg_against = db.Column(db.Float, default=0.0)
-    fouls_committed = db.Column(db.Integer, default=0)
-    fouls_suffered = db.Column(db.Integer, default=0)
-    saves = db.Column(db.Integer, default=0)
-    interceptions = db.Column(db.Integer, default=0)
-    tackles = db.Column(db.Integer, default=0)
-    clearances = db.Column(db.Integer, default=0)
-    blocks = db.Column(db.Integer, default=0)
-    corners = db.Column(db.Integer, default=0)
-    offsides = db.Column(db.Integer, default=0)
-    crosses = db.Column(db.Integer, default=0)
-    win_probability = db.Column(db.Float, default=0.0)
-    draw_probability = db.Column(db.Float, default=0.0)
-    loss_probability = db.Column(db.Float, default=0.0)
-    goals_0_15 = db.Column(db.Integer, default=0)
-    goals_16_30 = db.Column(db.Integer, default=0)
-    goals_31_45 = db.Column(db.Integer, default=0)
-    goals_46_60 = db.Column(db.Integer, default=0)
-    goals_61_75 = db.Column(db.Integer, default=0)
-    goals_76_90 = db.Column(db.Integer, default=0)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    team = db.relationship('Team', backref=db.backref('team_stats', lazy=True))
-    match = db.relationship('Match', backref=db.backref('team_stats_details', lazy=True))
\ No newline at end of file
+from database.db_connection import db, login_manager
+from flask_login import UserMixin
+from datetime import datetime
+
+class User(db.Model, UserMixin):
+    __tablename__ = 'users'
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(64), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(128), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    is_admin = db.Column(db.Boolean, default=False)
+    
+    def __repr__(self):
+        return f'<User {self.username}>'
+
+class League(db.Model):
+    __tablename__ = 'leagues'
+    __natural_key__ = ('url',)
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    country = db.Column(db.String(50))
+    season = db.Column(db.String(20))
+    url = db.Column(db.String(500))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    teams = db.relationship('Team', backref='league', lazy=True)
+    
+    __table_args__ = (db.Index('uq_leagues_url', 'url', unique=True),)
+
+class Team(db.Model):
+    __tablename__ = 'teams'
+    __natural_key__ = ('url',)
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    league_id = db.Column(db.Integer, db.ForeignKey('leagues.id'))
+    url = db.Column(db.String(500))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    players = db.relationship('Player', backref='team', lazy=True)
+    
+    __table_args__ = (
+        db.Index('uq_teams_url', 'url', unique=True),
+        db.Index('ix_teams_league_id', 'league_id'),
+        db.Index('ix_teams_name', 'name'),
+    )
+
+class Player(db.Model):
+    __tablename__ = 'players'
+    __natural_key__ = ('url',)
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'))
+    position = db.Column(db.String(50))
+    nationality = db.Column(db.String(50))
+    age = db.Column(db.Integer)
+    url = db.Column(db.String(500))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    stats = db.relationship('PlayerStats', backref='player', lazy=True)
+    
+    __table_args__ = (
+        db.Index('uq_players_url', 'url', unique=True),
+        db.Index('ix_players_team_position', 'team_id', 'position'),
+        db.Index('ix_players_name', 'name'),
+    )
+
+class PlayerStats(db.Model):
+    __tablename__ = 'player_stats'
+    __natural_key__ = ('player_id', 'season')
+    id = db.Column(db.Integer, primary_key=True)
+    player_id = db.Column(db.Integer, db.ForeignKey('players.id'))
+    season = db.Column(db.String(20))
+    matches_played = db.Column(db.Integer)
+    goals = db.Column(db.Integer)
+    assists = db.Column(db.Integer)
+    minutes_played = db.Column(db.Integer)
+    xg = db.Column(db.Float)
+    xa = db.Column(db.Float)
+    shots = db.Column(db.Integer)
+    key_passes = db.Column(db.Integer)
+    yellow_cards = db.Column(db.Integer)
+    red_cards = db.Column(db.Integer)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('uq_player_stats_player_season', 'player_id', 'season', unique=True),
+        db.Index('ix_player_stats_season', 'season'),
+    )
+
+class Match(db.Model):
+    __tablename__ = 'matches'
+    __natural_key__ = ('home_team_id', 'away_team_id', 'date')
+    id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.Date)
+    home_team_id = db.Column(db.Integer, db.ForeignKey('teams.id'))
+    away_team_id = db.Column(db.Integer, db.ForeignKey('teams.id'))
+    home_goals = db.Column(db.Integer)
+    away_goals = db.Column(db.Integer)
+    result = db.Column(db.String(10))
+    possession_home = db.Column(db.Float)
+    possession_away = db.Column(db.Float)
+    shots_home = db.Column(db.Integer)
+    shots_away = db.Column(db.Integer)
+    xg_home = db.Column(db.Float)
+    xg_away = db.Column(db.Float)
+    passes_home = db.Column(db.Integer)
+    passes_away = db.Column(db.Integer)
+    pass_accuracy_home = db.Column(db.Float)
+    pass_accuracy_away = db.Column(db.Float)
+    fouls_home = db.Column(db.Integer)
+    fouls_away = db.Column(db.Integer)
+    corners_home = db.Column(db.Integer)
+    corners_away = db.Column(db.Integer)
+    saves_home = db.Column(db.Integer)
+    saves_away = db.Column(db.Integer)
+    goal_times = db.Column(db.Text)
+    correct_score = db.Column(db.String(10))
+    score_probabilities = db.Column(db.Text)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    home_team = db.relationship('Team', foreign_keys=[home_team_id])
+    away_team = db.relationship('Team', foreign_keys=[away_team_id])
+    
+    __table_args__ = (
+        db.Index('uq_matches_home_away_date', 'home_team_id', 'away_team_id', 'date', unique=True),
+        db.Index('ix_matches_away_date', 'away_team_id', 'date'),
+        db.Index('ix_matches_date', 'date'),
+    )
+    
+    def get_goal_times_list(self):
+        """Retorna lista de minutos dos gols"""
+        if self.goal_events:
+            return [event.minute for event in self.goal_events]
+        if self.goal_times:
+            return [int(t) for t in self.goal_times.split(',')]
+        return []
+    
+    def get_score_probabilities_dict(self):
+        """Retorna dicionário de probabilidades"""
+        if self.score_probabilities:
+            import json
+            return json.loads(self.score_probabilities)
+        return {}
+
+class GoalEvent(db.Model):
+    """Gol de uma partida: time que marcou, autor (se conhecido), minuto e acréscimos"""
+    __tablename__ = 'goal_events'
+    __natural_key__ = ('match_id', 'sequence')
+    id = db.Column(db.Integer, primary_key=True)
+    match_id = db.Column(db.Integer, db.ForeignKey('matches.id'), nullable=False)
+    sequence = db.Column(db.Integer, nullable=False)
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'))
+    player_id = db.Column(db.Integer, db.ForeignKey('players.id'))
+    season = db.Column(db.String(20))
+    minute = db.Column(db.Integer, nullable=False)
+    added_time = db.Column(db.Integer, default=0)
+    
+    match = db.relationship('Match', backref=db.backref('goal_events', lazy=True, order_by='GoalEvent.sequence'))
+    
+    __table_args__ = (
+        db.Index('uq_goal_events_match_sequence', 'match_id', 'sequence', unique=True),
+        db.Index('ix_goal_events_team_season', 'team_id', 'season'),
+        db.Index('ix_goal_events_player_id', 'player_id'),
+        db.Index('ix_goal_events_season', 'season'),
+    )
+
+class GoalTimingHistogram(db.Model):
+    """Gols por faixa de tempo de um time ou liga em uma temporada (scope 'team' ou 'league')"""
+    __tablename__ = 'goal_timing_histograms'
+    __natural_key__ = ('scope', 'scope_id', 'season')
+    id = db.Column(db.Integer, primary_key=True)
+    scope = db.Column(db.String(10), nullable=False)
+    scope_id = db.Column(db.Integer, nullable=False)
+    season = db.Column(db.String(20))
+    goals = db.Column(db.Integer, default=0)
+    first_half = db.Column(db.Integer, default=0)
+    second_half = db.Column(db.Integer, default=0)
+    minutes_sum = db.Column(db.Integer, default=0)
+    goals_0_15 = db.Column(db.Integer, default=0)
+    goals_16_30 = db.Column(db.Integer, default=0)
+    goals_31_45 = db.Column(db.Integer, default=0)
+    goals_46_60 = db.Column(db.Integer, default=0)
+    goals_61_75 = db.Column(db.Integer, default=0)
+    goals_76_90 = db.Column(db.Integer, default=0)
+    goals_extra = db.Column(db.Integer, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('uq_goal_timing_histograms_scope_season', 'scope', 'scope_id', 'season', unique=True),
+        db.Index('ix_goal_timing_histograms_scope_season', 'scope', 'season'),
+    )
+
+class AdvancedPlayerStats(db.Model):
+    __tablename__ = 'advanced_player_stats'
+    __natural_key__ = ('player_id', 'match_id')
+    id = db.Column(db.Integer, primary_key=True)
+    player_id = db.Column(db.Integer, db.ForeignKey('players.id'))
+    match_id = db.Column(db.Integer, db.ForeignKey('matches.id'))
+    season = db.Column(db.String(20))
+    xg = db.Column(db.Float, default=0.0)
+    xa = db.Column(db.Float, default=0.0)
+    xg_chain = db.Column(db.Float, default=0.0)
+    xg_buildup = db.Column(db.Float, default=0.0)
+    total_passes = db.Column(db.Integer, default=0)
+    accurate_passes = db.Column(db.Integer, default=0)
+    pass_accuracy = db.Column(db.Float, default=0.0)
+    key_passes = db.Column(db.Integer, default=0)
+    through_balls = db.Column(db.Integer, default=0)
+    crosses = db.Column(db.Integer, default=0)
+    long_balls = db.Column(db.Integer, default=0)
+    saves = db.Column(db.Integer, default=0)
+    saves_inside_box = db.Column(db.Integer, default=0)
+    saves_penalties = db.Column(db.Integer, default=0)
+    punches = db.Column(db.Integer, default=0)
+    catches = db.Column(db.Integer, default=0)
+    fouls_committed = db.Column(db.Integer, default=0)
+    fouls_suffered = db.Column(db.Integer, default=0)
+    yellow_cards = db.Column(db.Integer, default=0)
+    red_cards = db.Column(db.Integer, default=0)
+    touches = db.Column(db.Integer, default=0)
+    touches_att_third = db.Column(db.Integer, default=0)
+    carries = db.Column(db.Integer, default=0)
+    progressive_carries = db.Column(db.Integer, default=0)
+    goals_0_15 = db.Column(db.Integer, default=0)
+    goals_16_30 = db.Column(db.Integer, default=0)
+    goals_31_45 = db.Column(db.Integer, default=0)
+    goals_46_60 = db.Column(db.Integer, default=0)
+    goals_61_75 = db.Column(db.Integer, default=0)
+    goals_76_90 = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    player = db.relationship('Player', backref=db.backref('advanced_stats', lazy=True))
+    match = db.relationship('Match', backref=db.backref('player_advanced_stats', lazy=True))
+    
+    __table_args__ = (
+        db.Index('uq_advanced_player_stats_player_match', 'player_id', 'match_id', unique=True),
+        db.Index('ix_advanced_player_stats_player_season', 'player_id', 'season'),
+        db.Index('ix_advanced_player_stats_match_id', 'match_id'),
+        db.Index('ix_advanced_player_stats_season', 'season'),
+    )
+
+class TeamStats(db.Model):
+    __tablename__ = 'team_stats'
+    __natural_key__ = ('team_id', 'match_id')
+    id = db.Column(db.Integer, primary_key=True)
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'))
+    match_id = db.Column(db.Integer, db.ForeignKey('matches.id'))
+    season = db.Column(db.String(20))
+    possession = db.Column(db.Float, default=0.0)
+    total_passes = db.Column(db.Integer, default=0)
+    accurate_passes = db.Column(db.Integer, default=0)
+    pass_accuracy = db.Column(db.Float, default=0.0)
+    total_shots = db.Column(db.Integer, default=0)
+    shots_on_target = db.Column(db.Integer, default=0)
+    shots_off_target = db.Column(db.Integer, default=0)
+    shots_blocked = db.Column(db.Integer, default=0)
+    xg = db.Column(db.Float, default=0.0)
+    xg_against = db.Column(db.Float, default=0.0)
+    fouls_committed = db.Column(db.Integer, default=0)
+    fouls_suffered = db.Column(db.Integer, default=0)
+    saves = db.Column(db.Integer, default=0)
+    interceptions = db.Column(db.Integer, default=0)
+    tackles = db.Column(db.Integer, default=0)
+    clearances = db.Column(db.Integer, default=0)
+    blocks = db.Column(db.Integer, default=0)
+    corners = db.Column(db.Integer, default=0)
+    offsides = db.Column(db.Integer, default=0)
+    crosses = db.Column(db.Integer, default=0)
+    win_probability = db.Column(db.Float, default=0.0)
+    draw_probability = db.Column(db.Float, default=0.0)
+    loss_probability = db.Column(db.Float, default=0.0)
+    goals_0_15 = db.Column(db.Integer, default=0)
+    goals_16_30 = db.Column(db.Integer, default=0)
+    goals_31_45 = db.Column(db.Integer, default=0)
+    goals_46_60 = db.Column(db.Integer, default=0)
+    goals_61_75 = db.Column(db.Integer, default=0)
+    goals_76_90 = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    team = db.relationship('Team', backref=db.backref('team_stats', lazy=True))
+    match = db.relationship('Match', backref=db.backref('team_stats_details', lazy=True))
+    
+    __table_args__ = (
+        db.Index('uq_team_stats_team_match', 'team_id', 'match_id', unique=True),
+        db.Index('ix_team_stats_team_season', 'team_id', 'season'),
+        db.Index('ix_team_stats_match_id', 'match_id'),
+        db.Index('ix_team_stats_season', 'season'),
+    )
+
+class TeamSeasonStats(db.Model):
+    """Somas por (time, temporada) de team_stats, mantidas por database.aggregates"""
+    __tablename__ = 'team_season_stats'
+    __natural_key__ = ('team_id', 'season')
+    id = db.Column(db.Integer, primary_key=True)
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
+    season = db.Column(db.String(20))
+    matches = db.Column(db.Integer, default=0)
+    clean_sheets = db.Column(db.Integer, default=0)
+    possession = db.Column(db.Float, default=0.0)
+    total_passes = db.Column(db.Integer, default=0)
+    accurate_passes = db.Column(db.Integer, default=0)
+    pass_accuracy = db.Column(db.Float, default=0.0)
+    total_shots = db.Column(db.Integer, default=0)
+    shots_on_target = db.Column(db.Integer, default=0)
+    xg = db.Column(db.Float, default=0.0)
+    xg_against = db.Column(db.Float, default=0.0)
+    fouls_committed = db.Column(db.Integer, default=0)
+    fouls_suffered = db.Column(db.Integer, default=0)
+    saves = db.Column(db.Integer, default=0)
+    interceptions = db.Column(db.Integer, default=0)
+    tackles = db.Column(db.Integer, default=0)
+    clearances = db.Column(db.Integer, default=0)
+    blocks = db.Column(db.Integer, default=0)
+    corners = db.Column(db.Integer, default=0)
+    goals_0_15 = db.Column(db.Integer, default=0)
+    goals_16_30 = db.Column(db.Integer, default=0)
+    goals_31_45 = db.Column(db.Integer, default=0)
+    goals_46_60 = db.Column(db.Integer, default=0)
+    goals_61_75 = db.Column(db.Integer, default=0)
+    goals_76_90 = db.Column(db.Integer, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (db.Index('uq_team_season_stats_team_season', 'team_id', 'season', unique=True),)
+    
+    def average(self, column):
+        """Média por partida de uma das somas"""
+        return (getattr(self, column) or 0) / self.matches if self.matches else 0
+
+class PlayerSeasonStats(db.Model):
+    """Somas por (jogador, temporada) de advanced_player_stats, mantidas por database.aggregates"""
+    __tablename__ = 'player_season_stats'
+    __natural_key__ = ('player_id', 'season')
+    id = db.Column(db.Integer, primary_key=True)
+    player_id = db.Column(db.Integer, db.ForeignKey('players.id'), nullable=False)
+    season = db.Column(db.String(20))
+    matches = db.Column(db.Integer, default=0)
+    xg = db.Column(db.Float, default=0.0)
+    xa = db.Column(db.Float, default=0.0)
+    xg_chain = db.Column(db.Float, default=0.0)
+    xg_buildup = db.Column(db.Float, default=0.0)
+    total_passes = db.Column(db.Integer, default=0)
+    accurate_passes = db.Column(db.Integer, default=0)
+    pass_accuracy = db.Column(db.Float, default=0.0)
+    key_passes = db.Column(db.Integer, default=0)
+    through_balls = db.Column(db.Integer, default=0)
+    crosses = db.Column(db.Integer, default=0)
+    long_balls = db.Column(db.Integer, default=0)
+    saves = db.Column(db.Integer, default=0)
+    fouls_committed = db.Column(db.Integer, default=0)
+    fouls_suffered = db.Column(db.Integer, default=0)
+    yellow_cards = db.Column(db.Integer, default=0)
+    red_cards = db.Column(db.Integer, default=0)
+    touches = db.Column(db.Integer, default=0)
+    goals_0_15 = db.Column(db.Integer, default=0)
+    goals_16_30 = db.Column(db.Integer, default=0)
+    goals_31_45 = db.Column(db.Integer, default=0)
+    goals_46_60 = db.Column(db.Integer, default=0)
+    goals_61_75 = db.Column(db.Integer, default=0)
+    goals_76_90 = db.Column(db.Integer, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (db.Index('uq_player_season_stats_player_season', 'player_id', 'season', unique=True),)
+    
+    def average(self, column):
+        """Média por partida de uma das somas"""
+        return (getattr(self, column) or 0) / self.matches if self.matches else 0
+
+class PageSnapshot(db.Model):
+    __tablename__ = 'page_snapshots'
+    id = db.Column(db.Integer, primary_key=True)
+    url = db.Column(db.String(500), unique=True, nullable=False)
+    entity_type = db.Column(db.String(20))
+    entity_id = db.Column(db.Integer)
+    content_hash = db.Column(db.String(40))
+    checks = db.Column(db.Integer, default=0)
+    changes = db.Column(db.Integer, default=0)
+    last_checked = db.Column(db.DateTime)
+    last_changed = db.Column(db.DateTime)
+    
+    def change_rate(self):
+        """Frequência observada de mudanças (com suavização para páginas pouco vistas)"""
+        return ((self.changes or 0) + 1) / ((self.checks or 0) + 2)
+
+
+class ScrapeJob(db.Model):
+    __tablename__ = 'scrape_jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), default='running')
+    stage = db.Column(db.String(20))
+    runs = db.Column(db.Integer, default=1)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    
+    tasks = db.relationship('ScrapeTask', backref='job', lazy='dynamic')
+    
+    def progress(self):
+        """Progresso da execução: concluídas/total, vazão (tarefas/min) e ETA"""
+        counts = dict(
+            db.session.query(ScrapeTask.status, db.func.count(ScrapeTask.id))
+            .filter(ScrapeTask.job_id == self.id)
+            .group_by(ScrapeTask.status)
+        )
+        total = sum(counts.values())
+        done = counts.get('done', 0)
+        failed = counts.get('failed', 0)
+        
+        # Vazão medida apenas na execução atual (desde a última retomada)
+        finished_this_run = self.tasks.filter(
+            ScrapeTask.status.in_(['done', 'failed']),
+            ScrapeTask.finished_at >= self.started_at
+        ).count()
+        end = self.finished_at or datetime.utcnow()
+        elapsed = max((end - self.started_at).total_seconds(), 1)
+        throughput = finished_this_run / elapsed * 60
+        remaining = total - done - failed
+        
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'stage': self.stage,
+            'runs': self.runs,
+            'done': done,
+            'failed': failed,
+            'total': total,
+            'throughput_per_min': round(throughput, 2),
+            'eta_seconds': round(remaining / throughput * 60) if throughput and self.status == 'running' else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None
+        }
+
+
+class ScrapeTask(db.Model):
+    __tablename__ = 'scrape_tasks'
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('scrape_jobs.id'), nullable=False)
+    stage = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer)
+    url = db.Column(db.String(500))
+    status = db.Column(db.String(20), default='pending')
+    attempts = db.Column(db.Integer, default=0)
+    last_error = db.Column(db.Text)
+    finished_at = db.Column(db.DateTime)
+    
+    __table_args__ = (db.Index('ix_scrape_tasks_job_stage_status', 'job_id', 'stage', 'status'),)
+
+
+class ArchivedSeason(db.Model):
+    """Temporada movida das tabelas de estatísticas para o arquivo Parquet comprimido"""
+    __tablename__ = 'archived_seasons'
+    id = db.Column(db.Integer, primary_key=True)
+    season = db.Column(db.String(20), unique=True, nullable=False)
+    row_counts = db.Column(db.Text)  # JSON: linhas arquivadas por tabela
+    location = db.Column(db.String(500))
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ReplicaHeartbeat(db.Model):
+    """Batida gravada no primário e lida na réplica para medir o atraso da replicação"""
+    __tablename__ = 'replica_heartbeat'
+    id = db.Column(db.Integer, primary_key=True)
+    beat_at = db.Column(db.DateTime, nullable=False)
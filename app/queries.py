@@ -0,0 +1,263 @@
+from sqlalchemy import and_, case, func, select, union_all
+from sqlalchemy.orm import aliased
+from app.models import (
+    db, League, Team, Player, Match, PlayerStats, PlayerSeasonStats, TeamSeasonStats, GoalTimingHistogram
+)
+from database.archive import season_bounds
+
+# Camada de consultas de agregação da API: somas, médias e contagens são
+# calculadas pelo banco e só valores escalares voltam, sem objetos do ORM
+
+GOAL_SLOTS = ['0_15', '16_30', '31_45', '46_60', '61_75', '76_90']
+GOAL_TIMING_SLOTS = GOAL_SLOTS + ['extra']
+LATEST_STATS_COLUMNS = ['season', 'matches_played', 'goals', 'assists', 'xg', 'xa']
+EXPORT_STATS_COLUMNS = ['matches_played', 'goals', 'assists', 'xg', 'xa']
+
+# Métricas da comparação em lote, pela tabela de onde saem (uma consulta por tabela)
+COMPARE_PLAYER_METRICS = {
+    PlayerStats: ['matches_played', 'goals', 'assists', 'minutes_played', 'xg', 'xa', 'shots', 'key_passes',
+                  'yellow_cards', 'red_cards'],
+    PlayerSeasonStats: ['xg_chain', 'xg_buildup', 'total_passes', 'accurate_passes', 'pass_accuracy', 'through_balls',
+                        'crosses', 'long_balls', 'saves', 'fouls_committed', 'fouls_suffered', 'touches'],
+}
+COMPARE_TEAM_METRICS = {
+    TeamSeasonStats: ['matches', 'clean_sheets', 'possession', 'pass_accuracy', 'total_shots', 'shots_on_target', 'xg',
+                      'xg_against', 'fouls_committed', 'saves', 'interceptions', 'tackles', 'clearances', 'blocks', 'corners'],
+    PlayerStats: ['goals', 'assists', 'players'],
+    Match: ['wins', 'draws', 'losses'],
+}
+COMPARE_DEFAULT_METRICS = ['matches_played', 'minutes_played', 'goals', 'assists', 'xg', 'xa', 'players', 'possession',
+                           'wins', 'draws', 'losses']
+# Nos agregados por temporada estas colunas são somas de percentuais: a métrica é a média por partida
+AVERAGED_METRICS = {'possession', 'pass_accuracy'}
+CHUNK_SIZE = 500
+
+
+def _filters(model, filters):
+    return [getattr(model, column) == value for column, value in filters.items() if value is not None]
+
+
+def totals(model, columns, **filters):
+    """
+    Soma das colunas em todas as linhas que casam com os filtros
+    (ex.: totals(TeamSeasonStats, ['matches', 'xg'], team_id=3)).
+    Retorna {coluna: soma}, com 0 quando não há linhas.
+    """
+    query = select(*[func.coalesce(func.sum(getattr(model, c)), 0) for c in columns])
+    row = db.session.execute(query.where(*_filters(model, filters))).one()
+    return dict(zip(columns, row))
+
+
+def per_match(sums, columns):
+    """Divide as somas pelo total de partidas (`sums['matches']`)"""
+    matches = sums.get('matches') or 0
+    return {c: sums[c] / matches if matches else 0 for c in columns}
+
+
+def season_averages(model, columns, **filters):
+    """
+    Médias por partida de cada temporada, calculadas no banco a partir da
+    tabela de agregados. Retorna [{'season': ..., 'matches': n, coluna: média}],
+    da temporada mais recente para a mais antiga.
+    """
+    averages = [
+        (func.coalesce(getattr(model, c), 0) * 1.0 / func.nullif(model.matches, 0)).label(c)
+        for c in columns
+    ]
+    query = (
+        select(model.season, model.matches, *averages)
+        .where(*_filters(model, filters))
+        .order_by(model.season.desc())
+    )
+    return [
+        dict(row._mapping, **{c: row._mapping[c] or 0 for c in columns})
+        for row in db.session.execute(query)
+    ]
+
+
+def latest_season_condition(stats=PlayerStats):
+    """Condição que deixa só a linha da temporada mais recente de cada jogador (usa o índice (jogador, temporada))"""
+    other = aliased(PlayerStats)
+    latest = select(func.max(other.season)).where(other.player_id == stats.player_id).scalar_subquery()
+    return stats.season == latest
+
+
+def latest_player_stats(player_ids, columns=LATEST_STATS_COLUMNS):
+    """Estatísticas da temporada mais recente de cada jogador: {player_id: {coluna: valor}}"""
+    result = {}
+    ids = sorted(set(player_ids))
+    query = select(PlayerStats.player_id, *[getattr(PlayerStats, c) for c in columns]).where(latest_season_condition())
+    for start in range(0, len(ids), CHUNK_SIZE):
+        for row in db.session.execute(query.where(PlayerStats.player_id.in_(ids[start:start + CHUNK_SIZE]))):
+            values = dict(row._mapping)
+            result[values.pop('player_id')] = values
+    return result
+
+
+def player_export_query(league_id=None, team_id=None, position=None):
+    """
+    Jogadores com time, liga e estatísticas da temporada mais recente em uma
+    única consulta (joins + subconsulta da última temporada), ordenados por nome.
+    O número de consultas da exportação não depende do número de linhas.
+    """
+    query = (
+        select(
+            Player.id, Player.name, Team.name.label('team_name'), League.name.label('league_name'), Player.position,
+            *[func.coalesce(getattr(PlayerStats, c), 0).label(c) for c in EXPORT_STATS_COLUMNS]
+        )
+        .join(Team, Team.id == Player.team_id)
+        .join(League, League.id == Team.league_id)
+        .outerjoin(PlayerStats, and_(PlayerStats.player_id == Player.id, latest_season_condition()))
+        .order_by(Player.name, Player.id)
+    )
+    if league_id:
+        query = query.where(Team.league_id == league_id)
+    if team_id:
+        query = query.where(Player.team_id == team_id)
+    if position:
+        query = query.where(Player.position == position)
+    return query
+
+
+def _season_rows(model, key, ids, metrics, season):
+    """Métricas das linhas (entidade, temporada) de uma tabela: {id: {métrica: valor}}"""
+    columns = [
+        (func.coalesce(getattr(model, m), 0) * 1.0 / func.nullif(model.matches, 0)).label(m)
+        if m in AVERAGED_METRICS else getattr(model, m)
+        for m in metrics
+    ]
+    query = select(key.label('id'), *columns).where(key.in_(ids), model.season == season)
+    return {row.id: dict(row._mapping) for row in db.session.execute(query)}
+
+
+def _team_player_totals(ids, metrics, season):
+    """Gols, assistências e jogadores com estatísticas na temporada, somados por time"""
+    expressions = {
+        'goals': func.coalesce(func.sum(PlayerStats.goals), 0),
+        'assists': func.coalesce(func.sum(PlayerStats.assists), 0),
+        'players': func.count(PlayerStats.id),
+    }
+    query = (
+        select(Player.team_id.label('id'), *[expressions[m].label(m) for m in metrics])
+        .join(Player, Player.id == PlayerStats.player_id)
+        .where(Player.team_id.in_(ids), PlayerStats.season == season)
+        .group_by(Player.team_id)
+    )
+    return {row.id: dict(row._mapping) for row in db.session.execute(query)}
+
+
+def _team_results(ids, metrics, season):
+    """Vitórias, empates e derrotas de cada time nas partidas (com placar) da temporada"""
+    start, end = season_bounds(season)
+    played = and_(
+        Match.date >= start, Match.date < end, Match.home_goals.isnot(None), Match.away_goals.isnot(None)
+    )
+    sides = union_all(
+        select(Match.home_team_id.label('team_id'), Match.home_goals.label('scored'), Match.away_goals.label('conceded'))
+        .where(Match.home_team_id.in_(ids), played),
+        select(Match.away_team_id.label('team_id'), Match.away_goals.label('scored'), Match.home_goals.label('conceded'))
+        .where(Match.away_team_id.in_(ids), played),
+    ).subquery()
+    outcomes = {
+        'wins': sides.c.scored > sides.c.conceded,
+        'draws': sides.c.scored == sides.c.conceded,
+        'losses': sides.c.scored < sides.c.conceded,
+    }
+    query = (
+        select(sides.c.team_id.label('id'), *[func.sum(case((outcomes[m], 1), else_=0)).label(m) for m in metrics])
+        .group_by(sides.c.team_id)
+    )
+    return {row.id: dict(row._mapping) for row in db.session.execute(query)}
+
+
+_PLAYER_SOURCES = {
+    PlayerStats: lambda ids, metrics, season: _season_rows(PlayerStats, PlayerStats.player_id, ids, metrics, season),
+    PlayerSeasonStats: lambda ids, metrics, season: _season_rows(
+        PlayerSeasonStats, PlayerSeasonStats.player_id, ids, metrics, season
+    ),
+}
+_TEAM_SOURCES = {
+    TeamSeasonStats: lambda ids, metrics, season: _season_rows(TeamSeasonStats, TeamSeasonStats.team_id, ids, metrics, season),
+    PlayerStats: _team_player_totals,
+    Match: _team_results,
+}
+
+
+def _compare_columns(model, ids, metrics, season, metric_tables, sources):
+    names = dict(db.session.execute(select(model.id, model.name).where(model.id.in_(ids))).all())
+    # Ordem pedida, sem repetidos nem ids inexistentes
+    ids = [i for i in dict.fromkeys(ids) if i in names]
+    metrics = [m for m in metrics if any(m in columns for columns in metric_tables.values())]
+
+    values = {}
+    if ids and season:
+        for table, columns in metric_tables.items():
+            wanted = [m for m in metrics if m in columns]
+            if wanted:
+                for row_id, row in sources[table](ids, wanted, season).items():
+                    values.setdefault(row_id, {}).update(row)
+
+    result = {'id': ids, 'name': [names[i] for i in ids]}
+    for metric in metrics:
+        result[metric] = [values.get(i, {}).get(metric) for i in ids]
+    return result
+
+
+def compare_stats(player_ids=(), team_ids=(), metrics=COMPARE_DEFAULT_METRICS, season=None):
+    """
+    Métricas de vários jogadores e times em uma temporada, em colunas:
+    {'season', 'players': {'id': [...], 'name': [...], métrica: [...]}, 'teams': {...}}.
+    Uma consulta com IN (...) por tabela, qualquer que seja o número de ids;
+    métricas sem dados na temporada vêm como None. ValueError para métrica desconhecida.
+    """
+    known = {m for tables in (COMPARE_PLAYER_METRICS, COMPARE_TEAM_METRICS) for columns in tables.values() for m in columns}
+    unknown = [m for m in metrics if m not in known]
+    if unknown:
+        raise ValueError(f'Métricas desconhecidas: {", ".join(unknown)}')
+
+    result = {'season': season, 'metrics': list(metrics)}
+    if player_ids:
+        result['players'] = _compare_columns(Player, player_ids, metrics, season, COMPARE_PLAYER_METRICS, _PLAYER_SOURCES)
+    if team_ids:
+        result['teams'] = _compare_columns(Team, team_ids, metrics, season, COMPARE_TEAM_METRICS, _TEAM_SOURCES)
+    return result
+
+
+def team_summary(team_id):
+    """Totais, médias por partida e distribuição dos gols de um time em todas as temporadas"""
+    goal_columns = [f'goals_{slot}' for slot in GOAL_SLOTS]
+    sums = totals(
+        TeamSeasonStats,
+        ['matches', 'possession', 'pass_accuracy', 'xg', 'fouls_committed', 'saves'] + goal_columns,
+        team_id=team_id
+    )
+    return sums, per_match(sums, ['possession', 'pass_accuracy', 'xg', 'fouls_committed', 'saves'])
+
+
+def team_season_averages(team_id):
+    return season_averages(TeamSeasonStats, ['possession', 'xg', 'fouls_committed', 'saves'], team_id=team_id)
+
+
+def defensive_totals(team_id=None):
+    """Somas defensivas de um time (ou de todos, sem team_id)"""
+    return totals(
+        TeamSeasonStats,
+        ['matches', 'saves', 'interceptions', 'tackles', 'clearances', 'blocks', 'clean_sheets'],
+        team_id=team_id
+    )
+
+
+def goal_timing(team_id=None, league_id=None, season=None):
+    """
+    Somas dos histogramas de tempo dos gols de um time, de uma liga ou,
+    sem filtros, de todas as ligas (opcionalmente de uma temporada)
+    """
+    if team_id is not None:
+        scope, scope_id = 'team', team_id
+    else:
+        scope, scope_id = 'league', league_id
+    return totals(
+        GoalTimingHistogram,
+        ['goals', 'first_half', 'second_half', 'minutes_sum'] + [f'goals_{slot}' for slot in GOAL_TIMING_SLOTS],
+        scope=scope, scope_id=scope_id, season=season
+    )
@@ -0,0 +1,76 @@
+import hashlib
+from functools import wraps
+from flask import Response, current_app, request
+from config import Config
+from app.cache import TTLCache, shared_cache
+from database.data_version import current_data_version, data_version
+from database.routing import replica_caught_up
+
+# Cache das respostas JSON dos gráficos. A chave junta rota, argumentos e a
+# geração dos dados, então uma coleta nova invalida tudo sem apagar nada (as
+# entradas velhas saem por LRU/TTL). O ETag sai da mesma chave: um
+# If-None-Match da geração atual recebe 304 sem executar a rota.
+
+_local = TTLCache(Config.RESPONSE_CACHE_SIZE, Config.RESPONSE_CACHE_TTL)
+_shared = None
+
+
+def _request_key():
+    args = '&'.join(f'{name}={value}' for name, value in sorted(request.args.items(multi=True)))
+    return f'{request.path}?{args}'
+
+
+def _with_validators(response, etag):
+    response.set_etag(etag)
+    # O navegador guarda a resposta, mas revalida (If-None-Match) a cada uso
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def cached_json(version=None):
+    """
+    Decorador de rotas JSON: serve do cache enquanto a geração dos dados não
+    muda e responde 304 a If-None-Match. `version` (opcional) devolve um token
+    extra dos dados da rota, ex.: analytics.version para rotas do motor em memória.
+    Só respostas 200 são guardadas.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            generation = current_data_version()
+            if version is not None:
+                generation = f'{generation}.{version()}'
+            key = hashlib.blake2b(f'{generation}|{_request_key()}'.encode(), digest_size=16).hexdigest()
+            etag = key[:24]
+
+            if request.if_none_match.contains(etag):
+                return _with_validators(Response(status=304), etag)
+
+            body = _local.get(key)
+            if body is None and _shared:
+                body = _shared.get(key)
+                if body is not None:
+                    _local.set(key, body)
+            if body is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                body = response.get_data(as_text=True)
+                # Logo após uma coleta a réplica pode ainda não ter os dados da geração
+                # nova: a resposta sai sem ETag e sem entrar no cache
+                if not replica_caught_up(data_version.age()):
+                    return response
+                _local.set(key, body)
+                if _shared:
+                    _shared.set(key, body, _local.ttl)
+
+            return _with_validators(Response(body, mimetype='application/json'), etag)
+        return wrapper
+    return decorator
+
+
+def init_app(app):
+    """Aplica RESPONSE_CACHE_SIZE/RESPONSE_CACHE_TTL e liga a camada compartilhada (CACHE_REDIS_URL)"""
+    global _shared
+    _local.resize(app.config['RESPONSE_CACHE_SIZE'], app.config['RESPONSE_CACHE_TTL'])
+    _shared = shared_cache(app.config.get('CACHE_REDIS_URL'), 'futebol:response:')
@@ -1,38 +1,137 @@
-import os
-from datetime import timedelta
-
-basedir = os.path.abspath(os.path.dirname(__file__))
-
-class Config:
-    # Configurações básicas
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-key-change-in-production'
-    
-    # Configurações do MySQL para HostGator
-    DB_HOST = os.environ.get('DB_HOST') or 'localhost'
-    DB_NAME = os.environ.get('DB_NAME') or 'clic1967_futebol_analytics'
-    DB_USER = os.environ.get('DB_USER') or 'clic1967_analistafut'
-    DB_PASSWORD = os.environ.get('DB_PASSWORD') or ''
-    
-    SQLALCHEMY_DATABASE_URI = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}'
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
-    
-    # Configurações de sessão
-    PERMANENT_SESSION_LIFETIME = timedelta(days=7)
-    
-    # Configurações de upload
-    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
-    
-    # Modo debug
-    DEBUG = os.environ.get('DEBUG') or False
-
-class DevelopmentConfig(Config):
-    DEBUG = True
-
-class ProductionConfig(Config):
-    DEBUG = False
-
-config = {
-    'development': DevelopmentConfig,
-    'production': ProductionConfig,
-    'default': DevelopmentConfig
+import os
+from datetime import timedelta
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+
+class Config:
+    # Configurações básicas
+    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-key-change-in-production'
+    
+    # Configurações do MySQL para HostGator
+    DB_HOST = os.environ.get('DB_HOST') or 'localhost'
+    DB_NAME = os.environ.get('DB_NAME') or 'clic1967_futebol_analytics'
+    DB_USER = os.environ.get('DB_USER') or 'clic1967_analistafut'
+    DB_PASSWORD = os.environ.get('DB_PASSWORD') or ''
+    
+    SQLALCHEMY_DATABASE_URI = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}?charset=utf8mb4'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    
+    # Pool de conexões, compartilhado pelo ORM e por get_db_connection
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 10)
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 5)
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT') or 10)
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE') or 280)
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': True
+    }
+    
+    # Réplica de leitura (opcional): as rotas de consulta leem dela enquanto o
+    # atraso medido pelo heartbeat ficar abaixo de REPLICA_MAX_LAG segundos. O
+    # heartbeat é gravado no primário a cada REPLICA_HEARTBEAT_SECONDS pelo
+    # agendador (scraper.scheduler) ou por `flask replica-heartbeat --loop`.
+    # REPLICA_DATABASE_URL permite apontar para outra instância local (ex.: porta 3307)
+    REPLICA_DB_HOST = os.environ.get('REPLICA_DB_HOST') or None
+    REPLICA_DATABASE_URL = os.environ.get('REPLICA_DATABASE_URL') or (
+        f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{REPLICA_DB_HOST}/{DB_NAME}?charset=utf8mb4' if REPLICA_DB_HOST else None
+    )
+    SQLALCHEMY_BINDS = {'replica': REPLICA_DATABASE_URL} if REPLICA_DATABASE_URL else {}
+    REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG') or 10)
+    REPLICA_CHECK_SECONDS = int(os.environ.get('REPLICA_CHECK_SECONDS') or 5)
+    REPLICA_HEARTBEAT_SECONDS = int(os.environ.get('REPLICA_HEARTBEAT_SECONDS') or 2)
+    
+    # Cache da identidade do usuário logado (Flask-Login) e camada compartilhada
+    # opcional entre workers (Redis, requer o pacote redis). Sem Redis,
+    # USER_CACHE_TTL é o prazo para os outros workers verem um usuário
+    # alterado ou removido
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL') or 60)
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE') or 1024)
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL') or None
+    
+    # Cache das respostas JSON dos gráficos, invalidado pela geração dos dados (nova a cada coleta)
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE') or 512)
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL') or 3600)
+    DATA_VERSION_PATH = os.environ.get('DATA_VERSION_PATH') or os.path.join(basedir, 'cache', 'data_version')
+    
+    # Configurações de sessão
+    PERMANENT_SESSION_LIFETIME = timedelta(days=7)
+    
+    # Configurações de upload
+    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
+    
+    # Modo debug
+    DEBUG = os.environ.get('DEBUG') or False
+    
+    # Configurações do scraper (limite de cortesia com o FBref)
+    SCRAPER_MAX_WORKERS = int(os.environ.get('SCRAPER_MAX_WORKERS') or 4)
+    SCRAPER_PARSE_WORKERS = int(os.environ.get('SCRAPER_PARSE_WORKERS') or 2)
+    SCRAPER_REQUESTS_PER_SECOND = float(os.environ.get('SCRAPER_REQUESTS_PER_SECOND') or 0.5)
+    SCRAPER_BURST = int(os.environ.get('SCRAPER_BURST') or 2)
+    SCRAPER_TIMEOUT = int(os.environ.get('SCRAPER_TIMEOUT') or 30)
+    
+    # Cache HTTP do scraper (requisições condicionais com ETag/Last-Modified)
+    SCRAPER_CACHE_ENABLED = (os.environ.get('SCRAPER_CACHE_ENABLED') or '1') == '1'
+    SCRAPER_CACHE_PATH = os.environ.get('SCRAPER_CACHE_PATH') or os.path.join(basedir, 'cache', 'http_cache.sqlite3')
+    SCRAPER_CACHE_MAX_MB = int(os.environ.get('SCRAPER_CACHE_MAX_MB') or 512)
+    
+    # Atualização incremental: páginas por execução e janela de jogos próximos (dias)
+    SCRAPER_NIGHTLY_BUDGET = int(os.environ.get('SCRAPER_NIGHTLY_BUDGET') or 2000)
+    SCRAPER_MATCH_WINDOW_DAYS = int(os.environ.get('SCRAPER_MATCH_WINDOW_DAYS') or 3)
+    
+    # Tentativas por tarefa (liga, time ou jogador) antes de desistir
+    SCRAPER_MAX_ATTEMPTS = int(os.environ.get('SCRAPER_MAX_ATTEMPTS') or 3)
+    
+    # Acervo offline de páginas: 'record' grava o que for baixado, 'replay' responde só a partir dele
+    SCRAPER_CORPUS_MODE = os.environ.get('SCRAPER_CORPUS_MODE') or None
+    SCRAPER_CORPUS_DIR = os.environ.get('SCRAPER_CORPUS_DIR') or os.path.join(basedir, 'corpus')
+    
+    # Relatórios de execução do scraper (JSON por execução e métricas no formato Prometheus)
+    SCRAPER_REPORTS_DIR = os.environ.get('SCRAPER_REPORTS_DIR') or os.path.join(basedir, 'reports')
+    
+    # Snapshot Parquet das estatísticas (por temporada/liga), regravado após cada coleta
+    SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR') or os.path.join(basedir, 'snapshots')
+    SNAPSHOT_AFTER_SCRAPE = (os.environ.get('SNAPSHOT_AFTER_SCRAPE') or '1') == '1'
+    
+    # Motor de análises em memória: carga no início do worker e verificação de dados novos (segundos)
+    ANALYTICS_PRELOAD = (os.environ.get('ANALYTICS_PRELOAD') or '1') == '1'
+    ANALYTICS_CHECK_SECONDS = int(os.environ.get('ANALYTICS_CHECK_SECONDS') or 30)
+    
+    # Arquivo Parquet das temporadas antigas (fora do MySQL) e quantas temporadas passadas ficam no banco
+    ARCHIVE_DIR = os.environ.get('ARCHIVE_DIR') or os.path.join(basedir, 'archive')
+    ARCHIVE_KEEP_SEASONS = int(os.environ.get('ARCHIVE_KEEP_SEASONS') or 2)
+    
+    # Exportações em streaming: linhas lidas do banco (cursor no servidor) por lote
+    EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE') or 5000)
+
+class DevelopmentConfig(Config):
+    DEBUG = True
+
+class ProductionConfig(Config):
+    DEBUG = False
+
+class BenchmarkConfig(Config):
+    # Banco local descartável (é recriado a cada execução do benchmark)
+    SQLALCHEMY_DATABASE_URI = os.environ.get('BENCHMARK_DATABASE_URL') or 'sqlite://'
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    ANALYTICS_PRELOAD = False
+
+class TestingConfig(Config):
+    # Testes (pytest): SQLite descartável, sem CSRF e sem carga antecipada do motor
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL') or 'sqlite://'
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    SQLALCHEMY_BINDS = {}
+    WTF_CSRF_ENABLED = False
+    ANALYTICS_PRELOAD = False
+    CACHE_REDIS_URL = None
+
+config = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig,
+    'benchmark': BenchmarkConfig,
+    'testing': TestingConfig,
+    'default': DevelopmentConfig
 }
\ No newline at end of file
@@ -1,4 +1,5 @@
-# Inicialização do pacote database
-from .db_connection import db, login_manager, get_db_connection
-
-__all__ = ['db', 'login_manager', 'get_db_connection']
\ No newline at end of file
+# Inicialização do pacote database
+from .db_connection import db, login_manager, get_db_connection, get_pool_stats
+from .bulk import bulk_upsert, load_key_map
+
+__all__ = ['db', 'login_manager', 'get_db_connection', 'get_pool_stats', 'bulk_upsert', 'load_key_map']
\ No newline at end of file
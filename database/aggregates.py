@@ -0,0 +1,202 @@
+import logging
+from datetime import datetime
+from itertools import chain
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import and_, case, delete, event, func, insert, inspect, literal, or_, select
+from sqlalchemy.orm import Session
+from app.models import db, Match, TeamStats, AdvancedPlayerStats, TeamSeasonStats, PlayerSeasonStats, ArchivedSeason
+from database.bulk import on_upsert
+from database.goal_timing import rebuild_goal_histograms
+from database.data_version import mark_changed
+
+logger = logging.getLogger(__name__)
+
+GOAL_BUCKETS = ['goals_0_15', 'goals_16_30', 'goals_31_45', 'goals_46_60', 'goals_61_75', 'goals_76_90']
+
+# Colunas somadas por temporada (mesmo nome na tabela de origem e na de agregados)
+TEAM_SUMS = [
+    'possession', 'total_passes', 'accurate_passes', 'pass_accuracy', 'total_shots', 'shots_on_target',
+    'xg', 'xg_against', 'fouls_committed', 'fouls_suffered', 'saves', 'interceptions', 'tackles',
+    'clearances', 'blocks', 'corners'
+] + GOAL_BUCKETS
+PLAYER_SUMS = [
+    'xg', 'xa', 'xg_chain', 'xg_buildup', 'total_passes', 'accurate_passes', 'pass_accuracy', 'key_passes',
+    'through_balls', 'crosses', 'long_balls', 'saves', 'fouls_committed', 'fouls_suffered', 'yellow_cards',
+    'red_cards', 'touches'
+] + GOAL_BUCKETS
+
+# Times/jogadores com agregados a recalcular, guardados em session.info até o commit
+DIRTY_KEY = 'season_aggregates_dirty'
+CHUNK_SIZE = 500
+
+
+def _dirty(session):
+    return session.info.setdefault(DIRTY_KEY, {'team': set(), 'player': set()})
+
+
+def mark_teams(session, team_ids):
+    """Agenda o recálculo dos agregados dos times para o próximo commit da sessão"""
+    _dirty(session)['team'].update(i for i in team_ids if i is not None)
+
+
+def mark_players(session, player_ids):
+    """Agenda o recálculo dos agregados dos jogadores para o próximo commit da sessão"""
+    _dirty(session)['player'].update(i for i in player_ids if i is not None)
+
+
+def _chunks(ids):
+    ids = sorted(ids)
+    for start in range(0, len(ids), CHUNK_SIZE):
+        yield ids[start:start + CHUNK_SIZE]
+
+
+def _team_select():
+    clean_sheet = case(
+        (or_(
+            and_(Match.home_team_id == TeamStats.team_id, Match.away_goals == 0),
+            and_(Match.away_team_id == TeamStats.team_id, Match.home_goals == 0)
+        ), 1),
+        else_=0
+    )
+    return (
+        select(
+            TeamStats.team_id, TeamStats.season, func.count(TeamStats.id), func.sum(clean_sheet),
+            *[func.coalesce(func.sum(getattr(TeamStats, c)), 0) for c in TEAM_SUMS],
+            literal(datetime.utcnow(), db.DateTime)
+        )
+        .outerjoin(Match, Match.id == TeamStats.match_id)
+        .where(TeamStats.team_id.isnot(None))
+        .group_by(TeamStats.team_id, TeamStats.season)
+    )
+
+
+def _player_select():
+    return (
+        select(
+            AdvancedPlayerStats.player_id, AdvancedPlayerStats.season, func.count(AdvancedPlayerStats.id),
+            *[func.coalesce(func.sum(getattr(AdvancedPlayerStats, c)), 0) for c in PLAYER_SUMS],
+            literal(datetime.utcnow(), db.DateTime)
+        )
+        .where(AdvancedPlayerStats.player_id.isnot(None))
+        .group_by(AdvancedPlayerStats.player_id, AdvancedPlayerStats.season)
+    )
+
+
+def _refresh(session, model, group_column, source_column, query, columns, ids):
+    """
+    Apaga e recalcula (INSERT ... SELECT ... GROUP BY) as linhas dos ids
+    informados, ou de todos. As temporadas arquivadas não estão mais nas
+    tabelas de origem, então suas linhas ficam congeladas.
+    """
+    target = [getattr(model, c) for c in columns]
+    stale = delete(model)
+    frozen = session.execute(select(ArchivedSeason.season)).scalars().all()
+    if frozen:
+        stale = stale.where(or_(model.season.is_(None), model.season.notin_(frozen)))
+    if ids is None:
+        session.execute(stale)
+        session.execute(insert(model).from_select(target, query))
+        return
+
+    for chunk in _chunks(ids):
+        session.execute(stale.where(group_column.in_(chunk)))
+        session.execute(insert(model).from_select(target, query.where(source_column.in_(chunk))))
+
+
+def refresh_team_seasons(team_ids=None, session=None):
+    """Recalcula team_season_stats dos times informados (todos se None)"""
+    _refresh(
+        session or db.session, TeamSeasonStats, TeamSeasonStats.team_id, TeamStats.team_id, _team_select(),
+        ['team_id', 'season', 'matches', 'clean_sheets'] + TEAM_SUMS + ['updated_at'], team_ids
+    )
+
+
+def refresh_player_seasons(player_ids=None, session=None):
+    """Recalcula player_season_stats dos jogadores informados (todos se None)"""
+    _refresh(
+        session or db.session, PlayerSeasonStats, PlayerSeasonStats.player_id, AdvancedPlayerStats.player_id,
+        _player_select(), ['player_id', 'season', 'matches'] + PLAYER_SUMS + ['updated_at'], player_ids
+    )
+
+
+def rebuild_season_aggregates():
+    """Recalcula do zero as duas tabelas de agregados e faz commit"""
+    refresh_team_seasons()
+    refresh_player_seasons()
+    mark_changed()
+    db.session.commit()
+    teams, players = TeamSeasonStats.query.count(), PlayerSeasonStats.query.count()
+    logger.info(f"✅ Agregados por temporada recalculados: {teams} linhas de times, {players} de jogadores")
+    return teams, players
+
+
+def _values_and_history(obj, attributes):
+    """Valores atuais e anteriores (antes da alteração) dos atributos do objeto"""
+    state = inspect(obj)
+    for attribute in attributes:
+        history = state.attrs[attribute].history
+        yield from chain(history.added, history.unchanged, history.deleted)
+
+
+def _collect_flushed(session, flush_context):
+    """Marca os times/jogadores cujas linhas de origem foram gravadas pelo ORM"""
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, TeamStats):
+            mark_teams(session, _values_and_history(obj, ['team_id']))
+        elif isinstance(obj, Match):
+            mark_teams(session, _values_and_history(obj, ['home_team_id', 'away_team_id']))
+        elif isinstance(obj, AdvancedPlayerStats):
+            mark_players(session, _values_and_history(obj, ['player_id']))
+
+
+def _refresh_dirty(session):
+    """Antes do commit, recalcula os agregados marcados, na mesma transação"""
+    if not session.new and not session.dirty and not session.deleted and DIRTY_KEY not in session.info:
+        return
+    session.flush()
+    dirty = session.info.pop(DIRTY_KEY, None)
+    if not dirty:
+        return
+    if dirty['team']:
+        refresh_team_seasons(dirty['team'], session)
+    if dirty['player']:
+        refresh_player_seasons(dirty['player'], session)
+
+
+def _discard_dirty(session):
+    session.info.pop(DIRTY_KEY, None)
+
+
+@on_upsert(TeamStats)
+def _team_stats_upserted(rows):
+    mark_teams(db.session(), (row.get('team_id') for row in rows))
+
+
+@on_upsert(Match)
+def _matches_upserted(rows):
+    mark_teams(db.session(), chain.from_iterable((row.get('home_team_id'), row.get('away_team_id')) for row in rows))
+
+
+@on_upsert(AdvancedPlayerStats)
+def _advanced_stats_upserted(rows):
+    mark_players(db.session(), (row.get('player_id') for row in rows))
+
+
+@click.command('rebuild-aggregates')
+@with_appcontext
+def rebuild_aggregates_command():
+    """Recalcula do zero os agregados por temporada de times e jogadores e os histogramas de gols"""
+    teams, players = rebuild_season_aggregates()
+    click.echo(f"Agregados recalculados: {teams} linhas de times, {players} de jogadores")
+    histograms = rebuild_goal_histograms()
+    click.echo(f"Histogramas de tempo dos gols recalculados: {histograms} linhas")
+
+
+def register_aggregates(app):
+    """Liga a manutenção automática dos agregados às sessões e registra o comando `flask rebuild-aggregates`"""
+    if not event.contains(Session, 'before_commit', _refresh_dirty):
+        event.listen(Session, 'after_flush', _collect_flushed)
+        event.listen(Session, 'before_commit', _refresh_dirty)
+        event.listen(Session, 'after_rollback', _discard_dirty)
+    app.cli.add_command(rebuild_aggregates_command)
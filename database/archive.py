@@ -0,0 +1,254 @@
+import json
+import logging
+import os
+import re
+import shutil
+from datetime import date
+import click
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from flask.cli import with_appcontext
+from sqlalchemy import and_, delete, insert, or_, select, union
+from config import Config
+from app.models import db, Match, PlayerStats, AdvancedPlayerStats, TeamStats, GoalEvent, ArchivedSeason
+from database.data_version import mark_changed
+from database.snapshot import arrow_type
+
+logger = logging.getLogger(__name__)
+
+# Arquivamento por temporada: as linhas de temporadas antigas saem das tabelas
+# quentes do MySQL para Parquet comprimido (zstd) em ARCHIVE_DIR/<tabela>/season=<temporada>/.
+# O banco fica só com as temporadas em uso (backups e reconstruções de índice
+# pequenos); os agregados por temporada das temporadas arquivadas são mantidos
+# congelados, e o motor de análises lê o arquivo junto com os dados quentes.
+
+# Ordem de arquivamento: tabelas filhas antes de matches (chaves estrangeiras)
+ARCHIVE_TABLES = [
+    ('advanced_player_stats', AdvancedPlayerStats),
+    ('team_stats', TeamStats),
+    ('goal_events', GoalEvent),
+    ('player_stats', PlayerStats),
+    ('matches', Match),
+]
+MATCH_CHILDREN = [AdvancedPlayerStats, TeamStats, GoalEvent]
+PARTITIONING = ds.partitioning(pa.schema([('season', pa.string())]), flavor='hive')
+CHUNK_SIZE = 20000
+# Temporadas europeias ('2019-2020', julho a junho) ou de ano civil ('2023')
+SEASON_FORMAT = re.compile(r'(\d{4})(?:-(\d{4}))?')
+
+
+def season_bounds(season):
+    """
+    Datas de início (inclusiva) e fim (exclusiva) de uma temporada: '2019-2020'
+    vai de julho a junho e '2023', de janeiro a dezembro. ValueError para
+    outros formatos.
+    """
+    match = SEASON_FORMAT.fullmatch(season or '')
+    if match is None or (match.group(2) and int(match.group(2)) != int(match.group(1)) + 1):
+        raise ValueError(f'Temporada inválida: {season!r} (use 2019-2020 ou 2023)')
+    start = int(match.group(1))
+    if match.group(2) is None:
+        return date(start, 1, 1), date(start + 1, 1, 1)
+    return date(start, 7, 1), date(start + 1, 7, 1)
+
+
+def _archivable(season):
+    # Temporada em formato conhecido e já encerrada
+    try:
+        return season_bounds(season)[1] <= date.today()
+    except ValueError:
+        return False
+
+
+def archived_seasons(session=None):
+    """Temporadas já arquivadas"""
+    return set((session or db.session).execute(select(ArchivedSeason.season)).scalars())
+
+
+def hot_seasons():
+    """Temporadas presentes nas tabelas quentes de estatísticas, da mais antiga para a mais recente"""
+    query = union(*[
+        select(model.season).where(model.season.isnot(None))
+        for model in (PlayerStats, AdvancedPlayerStats, TeamStats)
+    ])
+    return sorted(db.session.execute(query).scalars())
+
+
+def season_filter(column, frozen):
+    """Condição que exclui as temporadas arquivadas (linhas sem temporada continuam incluídas)"""
+    if not frozen:
+        return None
+    return or_(column.is_(None), column.notin_(sorted(frozen)))
+
+
+def without_archived(rows, frozen=None):
+    """Descarta linhas de temporadas arquivadas (ex.: páginas de jogador com o histórico inteiro)"""
+    frozen = archived_seasons() if frozen is None else frozen
+    return [row for row in rows if row.get('season') not in frozen] if frozen else rows
+
+
+def _condition(model, season):
+    if model is not Match:
+        return model.season == season
+
+    # Partidas da temporada que não são mais referenciadas por linhas de outras temporadas
+    start, end = season_bounds(season)
+    referenced = [
+        Match.id.notin_(
+            select(child.match_id).where(
+                child.match_id.isnot(None), or_(child.season.is_(None), child.season != season)
+            )
+        )
+        for child in MATCH_CHILDREN
+    ]
+    return and_(Match.date >= start, Match.date < end, *referenced)
+
+
+def _file_columns(model):
+    # A temporada fica no nome da partição, não dentro do arquivo
+    return [column for column in model.__table__.columns if column.name != 'season']
+
+
+def _partition(directory, name, season):
+    return os.path.join(directory, name, f'season={season}')
+
+
+def _write_partition(connection, directory, name, model, season):
+    """Grava as linhas da temporada em um Parquet comprimido; retorna o número de linhas"""
+    columns = _file_columns(model)
+    schema = pa.schema([(column.name, arrow_type(column)) for column in columns])
+    target = _partition(directory, name, season)
+    # Diretórios iniciados por '_' são ignorados pelos leitores do dataset
+    staging = os.path.join(directory, name, f'_staging-{season}')
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    query = select(*columns).where(_condition(model, season)).order_by(model.id)
+    result = connection.execution_options(stream_results=True, yield_per=CHUNK_SIZE).execute(query)
+    rows = 0
+    with pq.ParquetWriter(os.path.join(staging, 'part-0.parquet'), schema, compression='zstd') as writer:
+        for chunk in result.partitions(CHUNK_SIZE):
+            arrays = [pa.array([row[i] for row in chunk], type=field.type) for i, field in enumerate(schema)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            rows += len(chunk)
+
+    if pq.ParquetFile(os.path.join(staging, 'part-0.parquet')).metadata.num_rows != rows:
+        raise IOError(f'Arquivo de {name} ({season}) incompleto')
+    shutil.rmtree(target, ignore_errors=True)
+    os.rename(staging, target)
+    return rows
+
+
+def archive_season(season, directory=None):
+    """
+    Move uma temporada das tabelas quentes para o arquivo: grava e confere os
+    Parquet de todas as tabelas e só então apaga as linhas do banco, em uma
+    única transação. Retorna {tabela: linhas arquivadas}.
+    """
+    directory = directory or Config.ARCHIVE_DIR
+    if season_bounds(season)[1] > date.today():
+        raise ValueError(f'A temporada {season} ainda não terminou e não pode ser arquivada')
+    if season in archived_seasons():
+        raise ValueError(f'A temporada {season} já está arquivada')
+
+    counts = {}
+    connection = db.session.connection()
+    for name, model in ARCHIVE_TABLES:
+        counts[name] = _write_partition(connection, directory, name, model, season)
+
+    try:
+        for name, model in ARCHIVE_TABLES:
+            deleted = db.session.execute(delete(model).where(_condition(model, season))).rowcount
+            if deleted != counts[name]:
+                raise RuntimeError(f'{name}: {counts[name]} linhas arquivadas, mas {deleted} apagadas')
+        db.session.add(ArchivedSeason(season=season, row_counts=json.dumps(counts), location=directory))
+        mark_changed()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        for name, _ in ARCHIVE_TABLES:
+            shutil.rmtree(_partition(directory, name, season), ignore_errors=True)
+        raise
+
+    logger.info(f"🗄️ Temporada {season} arquivada: {counts}")
+    return counts
+
+
+def restore_season(season, directory=None):
+    """Devolve uma temporada arquivada às tabelas quentes (com os ids originais) e apaga o arquivo"""
+    archived = ArchivedSeason.query.filter_by(season=season).first()
+    if archived is None:
+        raise ValueError(f'A temporada {season} não está arquivada')
+    directory = directory or archived.location or Config.ARCHIVE_DIR
+
+    counts = {}
+    try:
+        # Pais antes dos filhos
+        for name, model in reversed(ARCHIVE_TABLES):
+            path = os.path.join(_partition(directory, name, season), 'part-0.parquet')
+            counts[name] = 0
+            if not os.path.exists(path):
+                continue
+            extra = {'season': season} if 'season' in model.__table__.columns else {}
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=CHUNK_SIZE):
+                rows = [dict(row, **extra) for row in batch.to_pylist()]
+                db.session.execute(insert(model.__table__), rows)
+                counts[name] += len(rows)
+        db.session.delete(archived)
+        mark_changed()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    for name, _ in ARCHIVE_TABLES:
+        shutil.rmtree(_partition(directory, name, season), ignore_errors=True)
+    logger.info(f"🗄️ Temporada {season} restaurada: {counts}")
+    return counts
+
+
+def read_frame(name, columns=None, directory=None, seasons=None):
+    """
+    Linhas arquivadas de uma tabela como DataFrame, só com as colunas pedidas
+    e, com `seasons`, só das partições dessas temporadas. None se não há arquivo.
+    """
+    path = os.path.join(directory or Config.ARCHIVE_DIR, name)
+    if not os.path.isdir(path) or not any(entry.startswith('season=') for entry in os.listdir(path)):
+        return None
+    dataset = ds.dataset(path, format='parquet', partitioning=PARTITIONING)
+    expression = ds.field('season').isin(list(seasons)) if seasons is not None else None
+    return dataset.to_table(columns=list(columns) if columns else None, filter=expression).to_pandas()
+
+
+@click.command('archive-seasons')
+@click.argument('seasons', nargs=-1)
+@click.option('--keep', type=int, default=None, help='Temporadas mais recentes mantidas no banco (padrão: ARCHIVE_KEEP_SEASONS)')
+@with_appcontext
+def archive_seasons_command(seasons, keep):
+    """Arquiva as temporadas informadas ou todas menos as --keep mais recentes"""
+    if not seasons:
+        keep = Config.ARCHIVE_KEEP_SEASONS if keep is None else keep
+        candidates = [season for season in hot_seasons() if _archivable(season)]
+        seasons = candidates[:-keep] if keep else candidates
+    if not seasons:
+        click.echo('Nenhuma temporada para arquivar')
+        return
+    for season in seasons:
+        try:
+            counts = archive_season(season)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        click.echo(f"{season}: {sum(counts.values())} linhas arquivadas")
+
+
+@click.command('restore-season')
+@click.argument('season')
+@with_appcontext
+def restore_season_command(season):
+    """Devolve uma temporada arquivada ao banco"""
+    try:
+        counts = restore_season(season)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"{season}: {sum(counts.values())} linhas restauradas")
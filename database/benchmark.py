@@ -0,0 +1,180 @@
+"""
+Benchmark dos índices do banco: gera uma massa sintética (1M+ linhas de
+estatísticas por padrão), mede a latência das consultas mais frequentes
+sem os índices do esquema, cria os índices e mede de novo.
+
+Usa BENCHMARK_DATABASE_URL (SQLite em memória por padrão). O banco é
+recriado a cada execução, então nunca aponte para o banco de produção.
+
+Uso:
+    python -m database.benchmark --rows 1000000 --json indexes.json
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from sqlalchemy import insert, select
+from app import create_app
+from app.models import db, League, Team, Player, PlayerStats, Match, AdvancedPlayerStats, TeamStats
+from database.bulk import load_key_map
+
+MODELS = [League, Team, Player, PlayerStats, Match, AdvancedPlayerStats, TeamStats]
+SEASONS = [f'{year}-{year + 1}' for year in range(2014, 2024)]
+CHUNK = 20000
+
+
+def _insert(model, rows):
+    """Insere as linhas em lotes com executemany"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= CHUNK:
+            db.session.execute(insert(model.__table__), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(model.__table__), batch)
+    db.session.commit()
+
+
+def load_data(rows):
+    """Gera a massa de dados; `rows` é o número de linhas de player_stats e advanced_player_stats"""
+    players = max(rows // len(SEASONS), 1)
+    teams = max(players // 25, 2)
+    leagues = max(teams // 20, 1)
+    matches = max(rows // 10, 1)
+    start = date(2014, 8, 1)
+
+    _insert(League, ({'id': i, 'name': f'Liga {i}', 'url': f'/en/comps/{i}'} for i in range(1, leagues + 1)))
+    _insert(Team, (
+        {'id': i, 'name': f'Time {i}', 'league_id': i % leagues + 1, 'url': f'/en/squads/{i}'}
+        for i in range(1, teams + 1)
+    ))
+    _insert(Player, (
+        {'id': i, 'name': f'Jogador {i}', 'team_id': i % teams + 1, 'position': 'FW' if i % 4 else 'GK',
+         'url': f'/en/players/{i}'}
+        for i in range(1, players + 1)
+    ))
+    _insert(PlayerStats, (
+        {'player_id': i % players + 1, 'season': SEASONS[i // players % len(SEASONS)], 'goals': i % 7,
+         'matches_played': i % 38, 'xg': (i % 10) / 3}
+        for i in range(rows)
+    ))
+
+    def match_teams(i):
+        home = i % teams
+        away = (home + 1 + (i // teams) % (teams - 1)) % teams
+        return home + 1, away + 1
+
+    _insert(Match, (
+        dict(zip(('home_team_id', 'away_team_id'), match_teams(i)), id=i + 1,
+             date=start + timedelta(days=i // teams), home_goals=i % 4, away_goals=i % 3)
+        for i in range(matches)
+    ))
+    _insert(TeamStats, (
+        {'team_id': match_teams(i)[side], 'match_id': i + 1, 'season': SEASONS[i % len(SEASONS)], 'xg': 1.2}
+        for i in range(matches) for side in (0, 1)
+    ))
+    _insert(AdvancedPlayerStats, (
+        {'player_id': i % players + 1, 'match_id': i // players % matches + 1,
+         'season': SEASONS[i // players % len(SEASONS)], 'xg': 0.3}
+        for i in range(rows)
+    ))
+    return {'players': players, 'teams': teams, 'leagues': leagues, 'matches': matches}
+
+
+def queries(sizes):
+    """Consultas frequentes do scraper e da API, com parâmetros sorteados a cada chamada"""
+    rnd = random.Random(42)
+    player = lambda: rnd.randint(1, sizes['players'])
+    team = lambda: rnd.randint(1, sizes['teams'])
+
+    def match_key():
+        match = db.session.get(Match, rnd.randint(1, sizes['matches']))
+        return match.home_team_id, match.away_team_id, match.date
+
+    return [
+        ('player_by_url', lambda: Player.query.filter_by(url=f'/en/players/{player()}').first()),
+        ('players_by_team', lambda: Player.query.filter_by(team_id=team()).all()),
+        ('player_stats_by_key', lambda: PlayerStats.query.filter_by(player_id=player(), season=rnd.choice(SEASONS)).first()),
+        ('player_stats_by_player', lambda: PlayerStats.query.filter_by(player_id=player()).all()),
+        ('player_stats_key_map_500', lambda: load_key_map(
+            PlayerStats, [(player(), rnd.choice(SEASONS)) for _ in range(500)], ('player_id', 'season'))),
+        ('advanced_by_player', lambda: AdvancedPlayerStats.query.filter_by(player_id=player()).all()),
+        ('team_stats_by_team', lambda: TeamStats.query.filter_by(team_id=team()).order_by(TeamStats.season.desc()).all()),
+        ('match_by_key', lambda: db.session.execute(select(Match.id).filter_by(
+            **dict(zip(('home_team_id', 'away_team_id', 'date'), match_key())))).first()),
+    ]
+
+
+def measure(sizes, repeat):
+    """Latência (ms) de cada consulta: mediana, p95 e média"""
+    results = {}
+    for name, query in queries(sizes):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query()
+            timings.append((time.perf_counter() - start) * 1000)
+            db.session.expunge_all()
+        timings.sort()
+        results[name] = {
+            'p50_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+            'mean_ms': round(statistics.mean(timings), 3)
+        }
+    return results
+
+
+def schema_indexes():
+    """Índices declarados nos modelos (além das chaves primárias)"""
+    return [index for model in MODELS for index in model.__table__.indexes]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark dos índices do banco')
+    parser.add_argument('--rows', type=int, default=1000000, help='linhas de player_stats e advanced_player_stats')
+    parser.add_argument('--repeat', type=int, default=20, help='execuções de cada consulta')
+    parser.add_argument('--json', help='grava os resultados neste arquivo')
+    args = parser.parse_args(argv)
+
+    app = create_app('benchmark')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        for index in schema_indexes():
+            index.drop(db.engine)
+
+        started = time.perf_counter()
+        sizes = load_data(args.rows)
+        print(f"Massa gerada em {time.perf_counter() - started:.1f}s: {sizes}, {args.rows} linhas de estatísticas")
+
+        before = measure(sizes, args.repeat)
+
+        started = time.perf_counter()
+        for index in schema_indexes():
+            index.create(db.engine)
+        index_seconds = time.perf_counter() - started
+        print(f"Índices criados em {index_seconds:.1f}s")
+
+        after = measure(sizes, args.repeat)
+
+    header = f"{'consulta':<28}{'p50 antes':>11}{'p50 depois':>12}{'p95 antes':>11}{'p95 depois':>12}{'ganho':>9}"
+    print(header)
+    print('-' * len(header))
+    for name in before:
+        speedup = before[name]['p50_ms'] / max(after[name]['p50_ms'], 1e-6)
+        print(f"{name:<28}{before[name]['p50_ms']:>11}{after[name]['p50_ms']:>12}"
+              f"{before[name]['p95_ms']:>11}{after[name]['p95_ms']:>12}{speedup:>8.0f}x")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'rows': args.rows, 'sizes': sizes, 'index_build_s': round(index_seconds, 2),
+                       'before': before, 'after': after}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,176 @@
+from datetime import datetime
+from sqlalchemy import insert, select, tuple_, update
+from sqlalchemy.dialects import mysql, sqlite
+from .db_connection import db
+
+
+# Funções chamadas a cada upsert em lote de um modelo (ver on_upsert)
+UPSERT_LISTENERS = {}
+
+
+def on_upsert(model):
+    """
+    Decorador que registra `fn(linhas)` para ser chamada com as linhas
+    inseridas ou alteradas por bulk_upsert(model, ...), na mesma transação.
+    """
+    def register(fn):
+        UPSERT_LISTENERS.setdefault(model, []).append(fn)
+        return fn
+    return register
+
+
+class UpsertResult:
+    """Contagem de linhas inseridas, atualizadas e inalteradas em um upsert"""
+
+    def __init__(self, inserted=0, updated=0, unchanged=0):
+        self.inserted = inserted
+        self.updated = updated
+        self.unchanged = unchanged
+
+    def __repr__(self):
+        return f'<UpsertResult inserted={self.inserted} updated={self.updated} unchanged={self.unchanged}>'
+
+
+def load_key_map(model, keys, key_columns, columns=()):
+    """
+    Carrega em uma única query as linhas existentes cujas chaves naturais estão em `keys`.
+    Retorna {chave: {'id': ..., coluna: valor, ...}}.
+    """
+    key_attrs = [getattr(model, c) for c in key_columns]
+    value_attrs = [getattr(model, c) for c in columns]
+    query = select(model.id, *key_attrs, *value_attrs)
+
+    if len(key_attrs) == 1:
+        query = query.where(key_attrs[0].in_([k[0] for k in keys]))
+    else:
+        # Filtro extra pela primeira coluna: deixa o banco usar o índice da chave
+        # natural (o SQLite não usa índice para IN de tuplas)
+        query = query.where(
+            key_attrs[0].in_({k[0] for k in keys}),
+            tuple_(*key_attrs).in_(list(keys))
+        )
+
+    existing = {}
+    for row in db.session.execute(query):
+        key = tuple(row[1:1 + len(key_attrs)])
+        existing[key] = dict(zip(('id',) + tuple(columns), (row[0],) + tuple(row[1 + len(key_attrs):])))
+    return existing
+
+
+def bulk_upsert(model, rows, key_columns=None, chunk_size=500):
+    """
+    Grava um lote de linhas (dicts) com um INSERT ... ON DUPLICATE KEY UPDATE multi-linha.
+
+    As linhas já existentes são localizadas pela chave natural do modelo
+    (`__natural_key__`) em uma única query; linhas idênticas ao banco são
+    ignoradas e as alteradas reaproveitam o id existente, de modo que o
+    conflito na chave primária as transforma em UPDATE. Cada linha só grava
+    as colunas que traz: linhas com conjuntos de colunas diferentes vão em
+    grupos separados, e uma coluna ausente mantém o valor do banco (ou o
+    padrão, em linhas novas). Não faz commit: a gravação participa da
+    transação da sessão atual.
+    """
+    key_columns = tuple(key_columns or model.__natural_key__)
+    result = UpsertResult()
+
+    # Deduplicar pela chave natural (a última ocorrência vence)
+    by_key = {}
+    for row in rows:
+        by_key[tuple(row[c] for c in key_columns)] = row
+    if not by_key:
+        return result
+
+    groups = {}
+    for key, row in by_key.items():
+        groups.setdefault(frozenset(row) - set(key_columns), {})[key] = row
+
+    pending = []
+    for columns, group in groups.items():
+        pending += _upsert_group(model, group, key_columns, sorted(columns), chunk_size, result)
+
+    if pending:
+        for listener in UPSERT_LISTENERS.get(model, ()):
+            listener(pending)
+    return result
+
+
+def _upsert_group(model, by_key, key_columns, columns, chunk_size, result):
+    """Grava linhas com as mesmas colunas; retorna as inseridas ou alteradas"""
+    existing = load_key_map(model, by_key.keys(), key_columns, columns)
+
+    now = datetime.utcnow()
+    has_updated_at = 'updated_at' in model.__table__.c and 'updated_at' not in columns
+    pending = []
+    for key, row in by_key.items():
+        current = existing.get(key)
+        if current is not None:
+            if all(current[c] == row[c] for c in columns):
+                result.unchanged += 1
+                continue
+            result.updated += 1
+        else:
+            result.inserted += 1
+
+        values = {c: row[c] for c in columns}
+        values.update(zip(key_columns, key))
+        values['id'] = current['id'] if current else None
+        if has_updated_at:
+            values['updated_at'] = now
+        pending.append(values)
+
+    update_columns = columns + (['updated_at'] if has_updated_at else [])
+    # Sem todas as colunas obrigatórias o INSERT da forma única falharia antes
+    # do conflito virar UPDATE: as alteradas vão por UPDATE (ver _merge)
+    complete = _required_columns(model) <= set(columns) | set(key_columns)
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        statement = _upsert_statement(model, chunk, update_columns) if complete else None
+        if statement is None:
+            _merge(model, chunk)
+        else:
+            db.session.execute(statement)
+    return pending
+
+
+def _required_columns(model):
+    """Colunas NOT NULL sem valor padrão (fora a chave primária)"""
+    return {
+        column.name for column in model.__table__.columns
+        if not column.nullable and not column.primary_key and column.default is None and column.server_default is None
+    }
+
+
+def _upsert_statement(model, values, update_columns):
+    """
+    Monta o INSERT multi-linha com resolução de conflito para o dialeto em
+    uso, ou None se o dialeto não tem um (ver _merge)
+    """
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == 'mysql':
+        stmt = mysql.insert(model.__table__).values(values)
+        return stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_columns})
+
+    if dialect == 'sqlite':
+        stmt = sqlite.insert(model.__table__).values(values)
+        return stmt.on_conflict_do_update(
+            index_elements=['id'],
+            set_={c: stmt.excluded[c] for c in update_columns}
+        )
+
+    return None
+
+
+def _merge(model, values):
+    """
+    Caminho portável (dialetos sem upsert, linhas sem todas as colunas
+    obrigatórias): como os ids das linhas existentes já são conhecidos, as
+    novas vão em um INSERT em lote e as alteradas em um UPDATE em lote pela
+    chave primária
+    """
+    new = [{c: v for c, v in row.items() if c != 'id'} for row in values if row['id'] is None]
+    changed = [row for row in values if row['id'] is not None]
+    if new:
+        db.session.execute(insert(model), new)
+    if changed:
+        db.session.execute(update(model), changed)
@@ -0,0 +1,141 @@
+import logging
+import os
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from config import Config
+from app.cache import redis
+from app.models import db, League, Team, Player, PlayerStats, Match, AdvancedPlayerStats, TeamStats, GoalEvent
+from database.bulk import on_upsert
+
+logger = logging.getLogger(__name__)
+
+# Geração dos dados: um token que muda a cada commit com dados novos (coleta,
+# comandos de manutenção). Caches de respostas e ETags usam o token na
+# chave, então uma coleta invalida tudo de uma vez sem apagar nada. Fica em
+# um arquivo (processos da mesma máquina) ou, com CACHE_REDIS_URL, no Redis.
+
+DATA_MODELS = (League, Team, Player, PlayerStats, Match, AdvancedPlayerStats, TeamStats, GoalEvent)
+CHANGED_KEY = 'data_version_changed'
+REDIS_KEY = 'futebol:data_version'
+
+
+class DataVersion:
+    """Token da geração atual dos dados, lido no máximo a cada `check_seconds` (Redis) ou por mtime (arquivo)"""
+
+    def __init__(self, path, client=None, check_seconds=1.0):
+        self.path = path
+        self.client = client
+        self.check_seconds = check_seconds
+        self.lock = threading.Lock()
+        self.token = None
+        self.seen = None
+        self.changed_at = time.monotonic()
+
+    def current(self):
+        if self.client is not None:
+            return self._current_shared()
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return '0'
+        marker = (stat.st_mtime_ns, stat.st_size)
+        if marker != self.seen:
+            with open(self.path, encoding='utf-8') as f:
+                token = f.read().strip()
+            self._update(token or '0')
+            with self.lock:
+                self.seen = marker
+        return self.token
+
+    def _current_shared(self):
+        now = time.monotonic()
+        if self.seen is not None and now - self.seen < self.check_seconds:
+            return self.token
+        try:
+            token = self.client.get(REDIS_KEY)
+        except Exception as e:
+            logger.warning(f"⚠️ Geração dos dados indisponível no Redis: {e}")
+            return self.token or '0'
+        self._update(token.decode() if token else '0')
+        with self.lock:
+            self.seen = now
+        return self.token
+
+    def _update(self, token):
+        with self.lock:
+            if token != self.token:
+                self.token, self.changed_at = token, time.monotonic()
+
+    def age(self):
+        """Segundos desde que este processo viu a geração atual (limite inferior da idade dos dados)"""
+        return time.monotonic() - self.changed_at
+
+    def bump(self):
+        """Passa para uma nova geração (token único: horário em ns e pid)"""
+        token = f'{time.time_ns():x}{os.getpid():x}'
+        if self.client is not None:
+            try:
+                self.client.set(REDIS_KEY, token)
+            except Exception as e:
+                logger.warning(f"⚠️ Geração dos dados não atualizada no Redis: {e}")
+            self._update(token)
+            with self.lock:
+                self.seen = time.monotonic()
+            return token
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        staging = f'{self.path}.{os.getpid()}.tmp'
+        with open(staging, 'w', encoding='utf-8') as f:
+            f.write(token)
+        os.replace(staging, self.path)
+        return token
+
+
+data_version = DataVersion(Config.DATA_VERSION_PATH)
+
+
+def current_data_version():
+    return data_version.current()
+
+
+def mark_changed(session=None):
+    """
+    Agenda uma nova geração para o próximo commit da sessão; para gravações
+    que o ORM não vê (DELETE/INSERT ... SELECT em lote, agregados)
+    """
+    (session or db.session()).info[CHANGED_KEY] = True
+
+
+def _collect_flushed(session, flush_context):
+    if any(isinstance(obj, DATA_MODELS) for obj in (*session.new, *session.dirty, *session.deleted)):
+        mark_changed(session)
+
+
+def _bump_after_commit(session):
+    if session.info.pop(CHANGED_KEY, False):
+        data_version.bump()
+
+
+def _discard(session):
+    session.info.pop(CHANGED_KEY, None)
+
+
+def _upserted(rows):
+    mark_changed()
+
+
+for _model in DATA_MODELS:
+    on_upsert(_model)(_upserted)
+
+
+def register_data_version(app):
+    """Liga o incremento da geração aos commits com dados novos e aplica DATA_VERSION_PATH/CACHE_REDIS_URL"""
+    data_version.path = app.config['DATA_VERSION_PATH']
+    url = app.config.get('CACHE_REDIS_URL')
+    data_version.client = redis.Redis.from_url(url, socket_timeout=0.5) if url and redis is not None else None
+    if not event.contains(Session, 'after_commit', _bump_after_commit):
+        event.listen(Session, 'after_flush', _collect_flushed)
+        event.listen(Session, 'after_commit', _bump_after_commit)
+        event.listen(Session, 'after_rollback', _discard)
@@ -1,48 +1,80 @@
-from flask_sqlalchemy import SQLAlchemy
-from flask_login import LoginManager
-from config import config
-import MySQLdb
-import os
-
-# Inicializar SQLAlchemy
-db = SQLAlchemy()
-
-# Inicializar Flask-Login
-login_manager = LoginManager()
-login_manager.login_view = 'auth.login'
-login_manager.login_message = 'Por favor, faça login para acessar esta página.'
-login_manager.login_message_category = 'info'
-
-def get_db_connection():
-    """
-    Estabelece conexão direta com MySQL
-    Para uso em queries SQL diretas quando necessário
-    """
-    try:
-        connection = MySQLdb.connect(
-            host=os.environ.get('DB_HOST') or 'localhost',
-            user=os.environ.get('DB_USER') or 'root',
-            password=os.environ.get('DB_PASSWORD') or '',
-            database=os.environ.get('DB_NAME') or 'futebol_analytics',
-            charset='utf8mb4',
-            autocommit=True
-        )
-        return connection
-    except Exception as e:
-        print(f"❌ Erro ao conectar com o banco de dados: {e}")
-        return None
-
-def test_connection():
-    """Testa a conexão com o banco de dados"""
-    try:
-        conn = get_db_connection()
-        if conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            result = cursor.fetchone()
-            cursor.close()
-            conn.close()
-            return result is not None
-    except Exception as e:
-        print(f"❌ Teste de conexão falhou: {e}")
+import threading
+from flask import has_app_context
+from flask_sqlalchemy import SQLAlchemy
+from flask_login import LoginManager
+from sqlalchemy import create_engine
+from config import config
+from database.pool import MonitoredQueuePool, pool_status
+from database.routing import REPLICA, RoutingSession, monitor
+
+# Inicializar SQLAlchemy (pool monitorado; SQLite em memória continua com StaticPool).
+# A sessão roteia as leituras das rotas de consulta para a réplica, se houver
+db = SQLAlchemy(engine_options={'poolclass': MonitoredQueuePool}, session_options={'class_': RoutingSession})
+
+# Inicializar Flask-Login
+login_manager = LoginManager()
+login_manager.login_view = 'auth.login'
+login_manager.login_message = 'Por favor, faça login para acessar esta página.'
+login_manager.login_message_category = 'info'
+
+# Engine usado fora de um contexto de aplicação (scripts), criado uma única vez
+_standalone_engine = None
+_standalone_lock = threading.Lock()
+
+def get_engine():
+    """
+    Engine da aplicação atual ou, fora de um contexto Flask, um engine
+    próprio criado com as mesmas configurações (Config) de banco e pool
+    """
+    global _standalone_engine
+    if has_app_context():
+        return db.engine
+    
+    with _standalone_lock:
+        if _standalone_engine is None:
+            settings = config['default']
+            _standalone_engine = create_engine(
+                settings.SQLALCHEMY_DATABASE_URI,
+                poolclass=MonitoredQueuePool,
+                **settings.SQLALCHEMY_ENGINE_OPTIONS
+            )
+        return _standalone_engine
+
+def get_read_engine():
+    """Engine para leituras pesadas: a réplica, quando configurada e em dia, senão o primário"""
+    if has_app_context() and REPLICA in db.engines:
+        monitor.check()
+        if monitor.healthy():
+            return db.engines[REPLICA]
+    return get_engine()
+
+def get_db_connection():
+    """
+    Empresta uma conexão DB-API do pool do SQLAlchemy
+    Para uso em queries SQL diretas quando necessário; close() devolve a
+    conexão ao pool. Não usa autocommit: chame commit() após escritas.
+    """
+    try:
+        return get_engine().raw_connection()
+    except Exception as e:
+        print(f"❌ Erro ao conectar com o banco de dados: {e}")
+        return None
+
+def get_pool_stats():
+    """Uso do pool de conexões: em uso, livres, esperas e tempo de espera"""
+    return pool_status(get_engine())
+
+def test_connection():
+    """Testa a conexão com o banco de dados"""
+    try:
+        conn = get_db_connection()
+        if conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            result = cursor.fetchone()
+            cursor.close()
+            conn.close()
+            return result is not None
+    except Exception as e:
+        print(f"❌ Teste de conexão falhou: {e}")
         return False
\ No newline at end of file
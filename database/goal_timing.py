@@ -0,0 +1,201 @@
+import logging
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, func, insert, literal, select, tuple_
+from app.models import db, ArchivedSeason, GoalEvent, GoalTimingHistogram, Match, Team
+from database.data_version import mark_changed
+
+logger = logging.getLogger(__name__)
+
+# Limites superiores das faixas 0-15, 16-30, ..., 76-90; o que passa disso
+# (acréscimos do 2º tempo e prorrogação) cai na última faixa, 'extra'
+BUCKET_EDGES = np.array([15, 30, 45, 60, 75, 90])
+BUCKETS = ['goals_0_15', 'goals_16_30', 'goals_31_45', 'goals_46_60', 'goals_61_75', 'goals_76_90', 'goals_extra']
+HISTOGRAM_COLUMNS = ['goals', 'first_half', 'second_half', 'minutes_sum'] + BUCKETS
+CHUNK_SIZE = 500
+
+
+def season_for_date(day):
+    """Temporada europeia (ex.: '2023-2024') de uma data: a virada é em julho"""
+    if day is None:
+        return None
+    start = day.year if day.month >= 7 else day.year - 1
+    return f'{start}-{start + 1}'
+
+
+def bucket_indexes(minutes, added_time):
+    """
+    Faixa de cada gol (0 = 0-15 ... 5 = 76-90, 6 = extra), calculada de uma vez
+    para o vetor inteiro. 45+2 fica em 31-45; 90+3 e prorrogação ficam em extra.
+    """
+    minutes = np.asarray(minutes, dtype=np.int64)
+    added_time = np.asarray(added_time, dtype=np.int64)
+    buckets = np.digitize(minutes, BUCKET_EDGES, right=True)
+    buckets[(minutes == 90) & (added_time > 0)] = len(BUCKET_EDGES)
+    return buckets
+
+
+def histogram(minutes, added_time):
+    """Histograma de um conjunto de gols: {coluna: contagem} com as faixas, tempos e soma dos minutos"""
+    minutes = np.asarray(minutes, dtype=np.int64)
+    counts = np.bincount(bucket_indexes(minutes, added_time), minlength=len(BUCKETS))
+    first_half = int((minutes <= 45).sum())
+    return dict(
+        zip(BUCKETS, counts.tolist()),
+        goals=len(minutes), first_half=first_half, second_half=len(minutes) - first_half,
+        minutes_sum=int(minutes.sum())
+    )
+
+
+def _event_rows(team_seasons=None):
+    """(time, temporada, minuto, acréscimos) dos gols dos pares informados, ou de todos"""
+    columns = [GoalEvent.team_id, GoalEvent.season, GoalEvent.minute, GoalEvent.added_time]
+    base = select(*columns).where(GoalEvent.team_id.isnot(None), GoalEvent.season.isnot(None))
+    if team_seasons is None:
+        return db.session.execute(base).all()
+
+    rows = []
+    pairs = sorted(team_seasons)
+    for start in range(0, len(pairs), CHUNK_SIZE):
+        chunk = pairs[start:start + CHUNK_SIZE]
+        rows += db.session.execute(base.where(
+            GoalEvent.team_id.in_({team_id for team_id, _ in chunk}),
+            tuple_(GoalEvent.team_id, GoalEvent.season).in_(chunk)
+        )).all()
+    return rows
+
+
+def team_histograms(events):
+    """
+    Histogramas por (time, temporada) de uma lista de gols
+    (time, temporada, minuto, acréscimos), com binning e contagem vetorizados.
+    """
+    if not events:
+        return []
+    frame = pd.DataFrame(events, columns=['team_id', 'season', 'minute', 'added_time'])
+    minutes = frame['minute'].to_numpy(dtype=np.int64)
+    added_time = frame['added_time'].fillna(0).to_numpy(dtype=np.int64)
+
+    # Uma coluna por faixa (one-hot) somada por grupo
+    table = pd.DataFrame(np.eye(len(BUCKETS), dtype=np.int64)[bucket_indexes(minutes, added_time)], columns=BUCKETS)
+    table['team_id'] = frame['team_id'].to_numpy()
+    table['season'] = frame['season'].to_numpy()
+    table['goals'] = 1
+    table['first_half'] = (minutes <= 45).astype(np.int64)
+    table['minutes_sum'] = minutes
+
+    grouped = table.groupby(['team_id', 'season'], sort=True).sum()
+    grouped['second_half'] = grouped['goals'] - grouped['first_half']
+    return [
+        dict({c: int(row[c]) for c in HISTOGRAM_COLUMNS}, scope='team', scope_id=int(team_id), season=season)
+        for (team_id, season), row in grouped.iterrows()
+    ]
+
+
+def _refresh_leagues(league_seasons, now):
+    """Recalcula as linhas das ligas somando (no banco) as linhas dos seus times"""
+    team_rows = GoalTimingHistogram.__table__.alias('team_rows')
+    query = (
+        select(
+            literal('league'), Team.league_id, team_rows.c.season,
+            *[func.sum(team_rows.c[c]) for c in HISTOGRAM_COLUMNS], literal(now, db.DateTime)
+        )
+        .join(Team, Team.id == team_rows.c.scope_id)
+        .where(team_rows.c.scope == 'team', Team.league_id.isnot(None))
+        .group_by(Team.league_id, team_rows.c.season)
+    )
+    target = ['scope', 'scope_id', 'season'] + HISTOGRAM_COLUMNS + ['updated_at']
+    leagues = delete(GoalTimingHistogram).where(GoalTimingHistogram.scope == 'league')
+
+    if league_seasons is None:
+        db.session.execute(leagues)
+        db.session.execute(insert(GoalTimingHistogram).from_select(target, query))
+        return
+
+    pairs = sorted(league_seasons)
+    for start in range(0, len(pairs), CHUNK_SIZE):
+        chunk = pairs[start:start + CHUNK_SIZE]
+        db.session.execute(leagues.where(tuple_(GoalTimingHistogram.scope_id, GoalTimingHistogram.season).in_(chunk)))
+        db.session.execute(insert(GoalTimingHistogram).from_select(
+            target, query.where(tuple_(Team.league_id, team_rows.c.season).in_(chunk))
+        ))
+
+
+def refresh_goal_histograms(team_seasons=None):
+    """
+    Recalcula os histogramas dos pares (time, temporada) informados e das
+    ligas desses times (tudo se None). Temporadas arquivadas não têm mais
+    gols no banco, então suas linhas ficam congeladas. Não faz commit.
+    """
+    now = datetime.utcnow()
+    if team_seasons is not None:
+        team_seasons = {(team_id, season) for team_id, season in team_seasons if team_id and season}
+        if not team_seasons:
+            return
+
+    rows = team_histograms(_event_rows(team_seasons))
+    teams = delete(GoalTimingHistogram).where(GoalTimingHistogram.scope == 'team')
+    if team_seasons is None:
+        frozen = db.session.execute(select(ArchivedSeason.season)).scalars().all()
+        if frozen:
+            teams = teams.where(GoalTimingHistogram.season.notin_(frozen))
+        db.session.execute(teams)
+        league_seasons = None
+    else:
+        pairs = sorted(team_seasons)
+        for start in range(0, len(pairs), CHUNK_SIZE):
+            db.session.execute(teams.where(
+                tuple_(GoalTimingHistogram.scope_id, GoalTimingHistogram.season).in_(pairs[start:start + CHUNK_SIZE])
+            ))
+        leagues = dict(db.session.query(Team.id, Team.league_id).filter(Team.id.in_({t for t, _ in team_seasons})))
+        league_seasons = {(leagues[t], s) for t, s in team_seasons if leagues.get(t)}
+
+    if rows:
+        db.session.execute(insert(GoalTimingHistogram), [dict(row, updated_at=now) for row in rows])
+    _refresh_leagues(league_seasons, now)
+
+
+def replace_match_goals(match_id, goals):
+    """
+    Grava os gols de uma partida, substituindo os anteriores, e atualiza os
+    histogramas dos times e ligas afetados na mesma transação.
+    `goals` é uma lista de dicts com team_id, player_id, minute e added_time.
+    """
+    match = db.session.get(Match, match_id)
+    season = season_for_date(match.date) if match else None
+    previous = db.session.query(GoalEvent.team_id, GoalEvent.season).filter_by(match_id=match_id).distinct().all()
+
+    db.session.execute(delete(GoalEvent).where(GoalEvent.match_id == match_id))
+    rows = [
+        {
+            'match_id': match_id,
+            'sequence': sequence,
+            'team_id': goal.get('team_id'),
+            'player_id': goal.get('player_id'),
+            'season': season,
+            'minute': goal['minute'],
+            'added_time': goal.get('added_time') or 0
+        }
+        for sequence, goal in enumerate(goals, start=1)
+    ]
+    if rows:
+        db.session.execute(insert(GoalEvent), rows)
+
+    # Coluna de texto antiga, mantida para compatibilidade
+    if match:
+        match.goal_times = ','.join(str(row['minute']) for row in rows) or None
+        db.session.expire(match, ['goal_events'])
+
+    refresh_goal_histograms(set(previous) | {(row['team_id'], season) for row in rows})
+    return len(rows)
+
+
+def rebuild_goal_histograms():
+    """Recalcula do zero todos os histogramas de tempo dos gols e faz commit"""
+    refresh_goal_histograms()
+    mark_changed()
+    db.session.commit()
+    count = GoalTimingHistogram.query.count()
+    logger.info(f"✅ Histogramas de tempo dos gols recalculados: {count} linhas")
+    return count
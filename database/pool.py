@@ -0,0 +1,102 @@
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStats:
+    """Contadores thread-safe de uso do pool de conexões"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+
+    def record_checkout(self, waited=None, timed_out=False):
+        with self.lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            if waited is not None:
+                self.waits += 1
+                self.wait_time += waited
+                self.max_wait = max(self.max_wait, waited)
+
+    def record_connect(self):
+        with self.lock:
+            self.connects += 1
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                'checkouts': self.checkouts,
+                'connects': self.connects,
+                'waits': self.waits,
+                'wait_time_s': round(self.wait_time, 4),
+                'max_wait_s': round(self.max_wait, 4),
+                'timeouts': self.timeouts
+            }
+
+
+class MonitoredQueuePool(QueuePool):
+    """
+    QueuePool que registra retiradas, conexões novas abertas (handshakes) e esperas:
+    uma retirada conta como espera quando encontra o pool esgotado (sem
+    conexões livres e sem overflow disponível) e precisa aguardar uma devolução.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        self.local = threading.local()
+
+    def _do_get(self):
+        # QueuePool._do_get chama a si mesmo em alguns casos; só a chamada externa é medida
+        if getattr(self.local, 'measuring', False):
+            return super()._do_get()
+
+        exhausted = self.checkedin() == 0 and -1 < self._max_overflow <= self.overflow()
+        start = time.perf_counter()
+        self.local.measuring = True
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        finally:
+            self.local.measuring = False
+        self.stats.record_checkout(time.perf_counter() - start if exhausted else None)
+        return connection
+
+    def _create_connection(self):
+        self.stats.record_connect()
+        return super()._create_connection()
+
+    def recreate(self):
+        # dispose() troca o pool por um novo; os contadores continuam acumulando
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def pool_status(engine):
+    """Situação atual do pool do engine: tamanho, conexões em uso/livres e contadores"""
+    pool = engine.pool
+    status = {'pool': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            'size': pool.size(),
+            'in_use': pool.checkedout(),
+            'idle': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'max_overflow': pool._max_overflow,
+            'timeout_s': pool.timeout(),
+        })
+    if isinstance(pool, MonitoredQueuePool):
+        status.update(pool.stats.to_dict())
+    return status
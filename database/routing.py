@@ -0,0 +1,242 @@
+import logging
+import threading
+import time
+from datetime import datetime
+import click
+from flask import current_app, g, has_app_context, request, session
+from flask.cli import with_appcontext
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, select, update
+from database.pool import pool_status
+
+logger = logging.getLogger(__name__)
+
+# Roteamento leitura/escrita: com uma réplica configurada (bind 'replica'),
+# as requisições GET dos blueprints de leitura consultam a réplica e todo o
+# resto (scraper, auth, scripts, qualquer escrita) usa o primário. O atraso
+# da réplica é medido por um heartbeat gravado no primário pelo agendador (ou
+# por `flask replica-heartbeat`) e só lido na réplica pelas requisições;
+# réplica atrasada demais ou fora do ar devolve as leituras ao primário.
+
+REPLICA = 'replica'
+ROUTE_KEY = 'db_route'
+WROTE_KEY = 'db_wrote'
+LAST_WRITE_KEY = '_db_write_at'
+
+
+class RoutingSession(Session):
+    """
+    Sessão que manda as consultas para a réplica quando a requisição pediu
+    (session.info['db_route']) e a réplica está saudável. Escritas, flushes
+    e tudo o que vem depois da primeira escrita na sessão vão para o primário.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None and self.info.get(ROUTE_KEY) == REPLICA and not self._flushing
+            and not self.info.get(WROTE_KEY) and not getattr(clause, 'is_dml', False)
+        ):
+            engine = self._db.engines.get(REPLICA)
+            if engine is not None and monitor.healthy():
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReplicaMonitor:
+    """
+    Atraso da réplica medido pelo heartbeat, relido no máximo a cada
+    REPLICA_CHECK_SECONDS. O atraso é a idade do último heartbeat que chegou
+    à réplica: um limite superior, que inclui até REPLICA_HEARTBEAT_SECONDS
+    de espera entre duas gravações.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counter_lock = threading.Lock()
+        self.lag = None
+        self.error = None
+        self.checked_at = 0.0
+        self.reads = {'replica': 0, 'primary': 0}
+
+    def check(self, force=False):
+        """Lê na réplica o último heartbeat recebido (só leitura; quem grava é write_heartbeat)"""
+        from app.models import ReplicaHeartbeat
+
+        engines = _db().engines
+        if REPLICA not in engines:
+            return None
+        if not force and time.time() - self.checked_at < current_app.config['REPLICA_CHECK_SECONDS']:
+            return self.lag
+        if not self.lock.acquire(blocking=force):
+            return self.lag
+
+        try:
+            self.checked_at = time.time()
+            beat = select(ReplicaHeartbeat.beat_at).where(ReplicaHeartbeat.id == 1)
+            with engines[REPLICA].connect() as connection:
+                seen = connection.execute(beat).scalar()
+            # Sem heartbeat na réplica (nenhum gravado ainda): atraso desconhecido
+            lag = None if seen is None else max((datetime.utcnow() - seen).total_seconds(), 0.0)
+            self.lag, self.error = lag, None
+        except Exception as e:
+            self.lag, self.error = None, str(e)
+            logger.warning(f"⚠️ Réplica indisponível, leituras no primário: {e}")
+        finally:
+            self.lock.release()
+
+        if self.lag is not None and self.lag > _max_lag():
+            logger.warning(f"⚠️ Réplica {self.lag:.1f}s atrasada, leituras no primário")
+        return self.lag
+
+    def healthy(self):
+        lag = self.lag
+        return lag is not None and lag <= _max_lag()
+
+    def record(self, target):
+        with self.counter_lock:
+            self.reads[target] += 1
+
+    def status(self):
+        """Configuração, atraso e leituras atendidas por cada banco"""
+        engines = _db().engines
+        if REPLICA not in engines:
+            return {'configured': False}
+        return {
+            'configured': True,
+            'healthy': self.healthy(),
+            'lag_s': None if self.lag is None else round(self.lag, 3),
+            'max_lag_s': _max_lag(),
+            'checked_at': datetime.utcfromtimestamp(self.checked_at).isoformat(timespec='seconds') if self.checked_at else None,
+            'error': self.error,
+            'reads': dict(self.reads),
+            'pool': pool_status(engines[REPLICA])
+        }
+
+
+monitor = ReplicaMonitor()
+
+
+def _db():
+    return current_app.extensions['sqlalchemy']
+
+
+def _max_lag():
+    # O heartbeat visto na réplica pode ter até um intervalo de gravação de idade
+    return current_app.config['REPLICA_MAX_LAG'] + current_app.config['REPLICA_HEARTBEAT_SECONDS']
+
+
+def write_heartbeat(engine):
+    """Grava o horário atual (UTC) na linha de heartbeat do primário `engine`"""
+    from app.models import ReplicaHeartbeat
+
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        stamp = update(ReplicaHeartbeat).where(ReplicaHeartbeat.id == 1).values(beat_at=now)
+        if connection.execute(stamp).rowcount == 0:
+            connection.execute(ReplicaHeartbeat.__table__.insert().values(id=1, beat_at=now))
+    return now
+
+
+def run_heartbeat(engine, interval, stop=None):
+    """Grava o heartbeat a cada `interval` segundos até `stop` (threading.Event) ser acionado"""
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        try:
+            write_heartbeat(engine)
+        except Exception as e:
+            logger.warning(f"⚠️ Heartbeat da réplica não gravado: {e}")
+        stop.wait(interval)
+
+
+def replica_lag():
+    """Atraso da réplica em segundos (None se não há réplica ou ela não responde)"""
+    return monitor.check() if has_app_context() else None
+
+
+def _lag_window():
+    # Tempo depois do qual a réplica certamente tem uma gravação do primário
+    return (monitor.lag or 0) + current_app.config['REPLICA_CHECK_SECONDS']
+
+
+def replica_caught_up(age):
+    """Se a requisição lê da réplica, diz se ela já tem as gravações feitas há `age` segundos"""
+    return g.get('db_route') != REPLICA or age > _lag_window()
+
+
+def _recent_write():
+    # Read-your-writes: depois de uma escrita do próprio usuário, as leituras
+    # ficam no primário até a réplica certamente ter recebido a alteração
+    written_at = session.get(LAST_WRITE_KEY)
+    if written_at is None:
+        return False
+    if time.time() - written_at > _lag_window():
+        session.pop(LAST_WRITE_KEY, None)
+        return False
+    return True
+
+
+def replica_reads(blueprint):
+    """Leituras (GET/HEAD) das rotas do blueprint vão para a réplica quando possível"""
+
+    @blueprint.before_request
+    def _route_to_replica():
+        db = _db()
+        if request.method not in ('GET', 'HEAD') or REPLICA not in db.engines:
+            return
+        monitor.check()
+        target = REPLICA if monitor.healthy() and not _recent_write() else 'primary'
+        g.db_route = target
+        monitor.record(target)
+        if target == REPLICA:
+            db.session.info[ROUTE_KEY] = REPLICA
+
+    return blueprint
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_write(db_session, flush_context):
+    db_session.info[WROTE_KEY] = True
+
+
+def _remember_write(response):
+    if _db().session.info.get(WROTE_KEY):
+        session[LAST_WRITE_KEY] = time.time()
+    route = g.get('db_route')
+    if route:
+        response.headers['X-DB-Route'] = route
+    return response
+
+
+def init_app(app):
+    """Registra o read-your-writes (horário da última escrita na sessão do usuário) e os comandos flask replica-*"""
+    app.after_request(_remember_write)
+    app.cli.add_command(replica_status_command)
+    app.cli.add_command(replica_heartbeat_command)
+    if REPLICA in (app.config.get('SQLALCHEMY_BINDS') or {}):
+        logger.info("🔀 Leituras dos blueprints de consulta roteadas para a réplica")
+
+
+@click.command('replica-status')
+@with_appcontext
+def replica_status_command():
+    """Mede o atraso da réplica de leitura"""
+    monitor.check(force=True)
+    status = monitor.status()
+    if not status['configured']:
+        click.echo('Nenhuma réplica configurada (REPLICA_DB_HOST)')
+        return
+    click.echo(f"Atraso: {status['lag_s']}s (máximo {status['max_lag_s']}s), saudável: {status['healthy']}")
+    if status['error']:
+        click.echo(f"Erro: {status['error']}")
+
+
+@click.command('replica-heartbeat')
+@click.option('--loop', is_flag=True, help='continua gravando a cada REPLICA_HEARTBEAT_SECONDS')
+@with_appcontext
+def replica_heartbeat_command(loop):
+    """Grava o heartbeat no primário (cron, ou --loop quando o agendador não roda)"""
+    engine = _db().engines[None]
+    if loop:
+        run_heartbeat(engine, current_app.config['REPLICA_HEARTBEAT_SECONDS'])
+    else:
+        click.echo(f"Heartbeat gravado: {write_heartbeat(engine).isoformat(timespec='seconds')}")
@@ -0,0 +1,236 @@
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import datetime
+import click
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+from flask.cli import with_appcontext
+from sqlalchemy import select
+from config import Config
+from app.models import db, Player, PlayerStats, Match, AdvancedPlayerStats, TeamStats, Team
+from database.db_connection import get_engine
+from database.goal_timing import season_for_date
+
+logger = logging.getLogger(__name__)
+
+# Snapshot colunar das tabelas de estatísticas para leituras analíticas:
+# um dataset Parquet por tabela, particionado em season=.../league_id=...,
+# lido com mmap e só com as colunas pedidas, sem passar pelo MySQL.
+# Cada exportação grava diretórios novos (tabela.<versão>) e só então troca
+# o manifesto, que aponta para eles, com os.replace: o leitor vê o snapshot
+# anterior inteiro ou o novo inteiro. A versão anterior fica no disco até a
+# exportação seguinte, para quem ainda está lendo dela.
+
+PARTITIONING = ds.partitioning(pa.schema([('season', pa.string()), ('league_id', pa.int64())]), flavor='hive')
+MANIFEST = 'manifest.json'
+CHUNK_SIZE = 50000
+
+ARROW_TYPES = {
+    db.Integer: pa.int64(),
+    db.Float: pa.float64(),
+    db.String: pa.string(),
+    db.Text: pa.string(),
+    db.Date: pa.date32(),
+    db.DateTime: pa.timestamp('us'),
+    db.Boolean: pa.bool_(),
+}
+
+
+def arrow_type(column):
+    """Tipo Arrow de uma coluna do SQLAlchemy (texto quando não mapeado)"""
+    for kind, mapped in ARROW_TYPES.items():
+        if isinstance(column.type, kind):
+            return mapped
+    return pa.string()
+
+
+def _table_columns(model):
+    return [(column.name, arrow_type(column)) for column in model.__table__.columns]
+
+
+def _player_stats():
+    query = (
+        select(*PlayerStats.__table__.columns, Team.league_id)
+        .outerjoin(Player, Player.id == PlayerStats.player_id)
+        .outerjoin(Team, Team.id == Player.team_id)
+    )
+    return query, _table_columns(PlayerStats)
+
+
+def _advanced_player_stats():
+    # Liga da partida (pelo mandante), não a do time atual do jogador
+    query = (
+        select(*AdvancedPlayerStats.__table__.columns, Team.league_id)
+        .outerjoin(Match, Match.id == AdvancedPlayerStats.match_id)
+        .outerjoin(Team, Team.id == Match.home_team_id)
+    )
+    return query, _table_columns(AdvancedPlayerStats)
+
+
+def _team_stats():
+    query = select(*TeamStats.__table__.columns, Team.league_id).outerjoin(Team, Team.id == TeamStats.team_id)
+    return query, _table_columns(TeamStats)
+
+
+def _matches():
+    # matches não tem temporada: ela é derivada da data (virada em julho)
+    query = select(*Match.__table__.columns, Team.league_id).outerjoin(Team, Team.id == Match.home_team_id)
+    return query, _table_columns(Match)
+
+
+SNAPSHOT_TABLES = {
+    'player_stats': _player_stats,
+    'advanced_player_stats': _advanced_player_stats,
+    'team_stats': _team_stats,
+    'matches': _matches,
+}
+
+
+def _batches(connection, query, columns, schema):
+    """Lê a consulta com cursor no servidor e entrega RecordBatches de até CHUNK_SIZE linhas"""
+    names = [name for name, _ in columns]
+    derive_season = 'season' not in names
+    result = connection.execution_options(stream_results=True, yield_per=CHUNK_SIZE).execute(query)
+    for rows in result.partitions(CHUNK_SIZE):
+        arrays = {name: [row[i] for row in rows] for i, name in enumerate(names)}
+        arrays['league_id'] = [row[-1] for row in rows]
+        if derive_season:
+            arrays['season'] = [season_for_date(day) for day in arrays['date']]
+        yield pa.RecordBatch.from_arrays([pa.array(arrays[f.name], type=f.type) for f in schema], schema=schema)
+
+
+def export_table(name, directory=None, engine=None):
+    """
+    Exporta uma tabela para um diretório novo `directory/name.<versão>`
+    (Parquet particionado por temporada e liga), ainda fora do manifesto.
+    Retorna (linhas, nome do diretório).
+    """
+    directory = directory or Config.SNAPSHOT_DIR
+    query, columns = SNAPSHOT_TABLES[name]()
+    fields = [pa.field(column, kind) for column, kind in columns if column != 'season']
+    schema = pa.schema(fields + [pa.field('season', pa.string()), pa.field('league_id', pa.int64())])
+
+    folder = f'{name}.{time.time_ns():x}'
+    target = os.path.join(directory, folder)
+    os.makedirs(directory, exist_ok=True)
+
+    rows = 0
+    with (engine or get_engine()).connect() as connection:
+        def counted():
+            nonlocal rows
+            for batch in _batches(connection, query, columns, schema):
+                rows += batch.num_rows
+                yield batch
+
+        ds.write_dataset(
+            counted(), target, schema=schema, format='parquet', partitioning=PARTITIONING,
+            basename_template='part-{i}.parquet', max_rows_per_group=CHUNK_SIZE,
+            existing_data_behavior='overwrite_or_ignore'
+        )
+    os.makedirs(target, exist_ok=True)
+    return rows, folder
+
+
+def _remove_unused(directory, keep):
+    """Apaga diretórios de tabelas que nenhum dos manifestos em `keep` referencia"""
+    for entry in os.listdir(directory):
+        table = entry.split('.', 1)[0]
+        if table in SNAPSHOT_TABLES and entry not in keep and os.path.isdir(os.path.join(directory, entry)):
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+
+
+def export_snapshot(directory=None, tables=None, engine=None):
+    """
+    Exporta as tabelas de estatísticas (todas por padrão) e troca o manifesto
+    de uma vez, apontando para os diretórios novos
+    """
+    directory = directory or Config.SNAPSHOT_DIR
+    previous = read_manifest(directory)
+    manifest = dict(previous)
+    for name in tables or SNAPSHOT_TABLES:
+        start = time.perf_counter()
+        rows, folder = export_table(name, directory, engine)
+        manifest[name] = {
+            'rows': rows,
+            'path': folder,
+            'exported_at': datetime.utcnow().isoformat(timespec='seconds'),
+            'seconds': round(time.perf_counter() - start, 3)
+        }
+        logger.info(f"📦 Snapshot de {name}: {rows} linhas em {manifest[name]['seconds']}s")
+
+    path = os.path.join(directory, MANIFEST)
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f'{path}.tmp', path)
+    _remove_unused(directory, {_folder(name, entries) for entries in (manifest, previous) for name in entries})
+    return manifest
+
+
+def read_manifest(directory=None):
+    """Linhas e horário da última exportação de cada tabela ({} se não houver snapshot)"""
+    path = os.path.join(directory or Config.SNAPSHOT_DIR, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _folder(name, manifest):
+    # Snapshots anteriores ao manifesto com 'path' gravavam direto em `name`
+    return (manifest.get(name) or {}).get('path', name)
+
+
+def table_path(name, directory=None):
+    """Diretório da versão atual de uma tabela (pelo manifesto) ou None se ela não está no snapshot"""
+    directory = directory or Config.SNAPSHOT_DIR
+    path = os.path.join(directory, _folder(name, read_manifest(directory)))
+    return path if os.path.isdir(path) else None
+
+
+def open_dataset(name, directory=None):
+    """Dataset Arrow de uma tabela do snapshot, com os arquivos mapeados em memória"""
+    path = table_path(name, directory)
+    if path is None:
+        raise FileNotFoundError(f'Snapshot de {name} não encontrado em {directory or Config.SNAPSHOT_DIR}')
+    return ds.dataset(
+        path, format='parquet', partitioning=PARTITIONING, filesystem=pafs.LocalFileSystem(use_mmap=True)
+    )
+
+
+def scan(name, columns=None, directory=None, **filters):
+    """
+    Lê do snapshot só as colunas pedidas das linhas que casam com os filtros
+    (valor ou lista de valores, ex.: scan('team_stats', ['team_id', 'xg'], season='2023-2024')).
+    Filtros em season/league_id descartam partições inteiras sem abrir os arquivos.
+    Retorna uma pyarrow.Table.
+    """
+    expression = None
+    for column, value in filters.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            condition = ds.field(column).isin(list(value))
+        else:
+            condition = ds.field(column) == value
+        expression = condition if expression is None else expression & condition
+    return open_dataset(name, directory).to_table(columns=columns, filter=expression)
+
+
+def read_frame(name, columns=None, directory=None, **filters):
+    """Mesmo que scan(), como DataFrame do pandas"""
+    return scan(name, columns, directory, **filters).to_pandas()
+
+
+@click.command('export-snapshot')
+@click.option('--table', 'tables', multiple=True, type=click.Choice(list(SNAPSHOT_TABLES)))
+@click.option('--dir', 'directory', default=None, help='Diretório do snapshot (padrão: SNAPSHOT_DIR)')
+@with_appcontext
+def export_snapshot_command(tables, directory):
+    """Exporta as tabelas de estatísticas para o snapshot Parquet"""
+    manifest = export_snapshot(directory, tables or None)
+    for name in tables or SNAPSHOT_TABLES:
+        click.echo(f"{name}: {manifest[name]['rows']} linhas")
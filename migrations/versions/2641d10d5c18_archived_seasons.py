@@ -0,0 +1,51 @@
+"""archived seasons
+
+Registro das temporadas movidas para o arquivo Parquet (database.archive)
+e índices por temporada nas tabelas de estatísticas por partida, usados
+para selecionar e apagar uma temporada inteira sem varrer a tabela.
+
+Revision ID: 2641d10d5c18
+Revises: 838760530697
+Create Date: 2026-10-18 16:58:12.402317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2641d10d5c18'
+down_revision = '838760530697'
+branch_labels = None
+depends_on = None
+
+
+SEASON_INDEXES = [
+    ('ix_advanced_player_stats_season', 'advanced_player_stats'),
+    ('ix_team_stats_season', 'team_stats'),
+    ('ix_goal_events_season', 'goal_events'),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if 'archived_seasons' not in inspector.get_table_names():
+        op.create_table(
+            'archived_seasons',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('season', sa.String(length=20), nullable=False, unique=True),
+            sa.Column('row_counts', sa.Text()),
+            sa.Column('location', sa.String(length=500)),
+            sa.Column('archived_at', sa.DateTime()),
+        )
+
+    for name, table in SEASON_INDEXES:
+        if name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, ['season'])
+
+
+def downgrade():
+    for name, table in SEASON_INDEXES:
+        op.drop_index(name, table_name=table)
+    op.drop_table('archived_seasons')
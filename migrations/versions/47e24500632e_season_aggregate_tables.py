@@ -0,0 +1,102 @@
+"""season aggregate tables
+
+Tabelas de agregados por (time, temporada) e (jogador, temporada),
+mantidas por database.aggregates a cada commit, e carga inicial a partir
+de team_stats e advanced_player_stats.
+
+Revision ID: 47e24500632e
+Revises: 96bcc92cbca3
+Create Date: 2026-10-18 15:49:46.985657
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '47e24500632e'
+down_revision = '96bcc92cbca3'
+branch_labels = None
+depends_on = None
+
+
+GOAL_BUCKETS = ['goals_0_15', 'goals_16_30', 'goals_31_45', 'goals_46_60', 'goals_61_75', 'goals_76_90']
+
+# (coluna, tipo) somadas por temporada
+TEAM_SUMS = [
+    ('possession', sa.Float), ('total_passes', sa.Integer), ('accurate_passes', sa.Integer),
+    ('pass_accuracy', sa.Float), ('total_shots', sa.Integer), ('shots_on_target', sa.Integer),
+    ('xg', sa.Float), ('xg_against', sa.Float), ('fouls_committed', sa.Integer), ('fouls_suffered', sa.Integer),
+    ('saves', sa.Integer), ('interceptions', sa.Integer), ('tackles', sa.Integer), ('clearances', sa.Integer),
+    ('blocks', sa.Integer), ('corners', sa.Integer)
+] + [(bucket, sa.Integer) for bucket in GOAL_BUCKETS]
+PLAYER_SUMS = [
+    ('xg', sa.Float), ('xa', sa.Float), ('xg_chain', sa.Float), ('xg_buildup', sa.Float),
+    ('total_passes', sa.Integer), ('accurate_passes', sa.Integer), ('pass_accuracy', sa.Float),
+    ('key_passes', sa.Integer), ('through_balls', sa.Integer), ('crosses', sa.Integer), ('long_balls', sa.Integer),
+    ('saves', sa.Integer), ('fouls_committed', sa.Integer), ('fouls_suffered', sa.Integer),
+    ('yellow_cards', sa.Integer), ('red_cards', sa.Integer), ('touches', sa.Integer)
+] + [(bucket, sa.Integer) for bucket in GOAL_BUCKETS]
+
+
+def _sum_columns(columns):
+    return [sa.Column(name, kind, default=0) for name, kind in columns]
+
+
+def upgrade():
+    connection = op.get_bind()
+    tables = set(sa.inspect(connection).get_table_names())
+
+    if 'team_season_stats' not in tables:
+        op.create_table(
+            'team_season_stats',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('team_id', sa.Integer(), sa.ForeignKey('teams.id'), nullable=False),
+            sa.Column('season', sa.String(length=20)),
+            sa.Column('matches', sa.Integer(), default=0),
+            sa.Column('clean_sheets', sa.Integer(), default=0),
+            *_sum_columns(TEAM_SUMS),
+            sa.Column('updated_at', sa.DateTime()),
+        )
+        op.create_index('uq_team_season_stats_team_season', 'team_season_stats', ['team_id', 'season'], unique=True)
+
+    if 'player_season_stats' not in tables:
+        op.create_table(
+            'player_season_stats',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('player_id', sa.Integer(), sa.ForeignKey('players.id'), nullable=False),
+            sa.Column('season', sa.String(length=20)),
+            sa.Column('matches', sa.Integer(), default=0),
+            *_sum_columns(PLAYER_SUMS),
+            sa.Column('updated_at', sa.DateTime()),
+        )
+        op.create_index(
+            'uq_player_season_stats_player_season', 'player_season_stats', ['player_id', 'season'], unique=True
+        )
+
+    # Carga inicial (equivalente a flask rebuild-aggregates)
+    team_sums = ', '.join(name for name, _ in TEAM_SUMS)
+    player_sums = ', '.join(name for name, _ in PLAYER_SUMS)
+    connection.execute(sa.text('DELETE FROM team_season_stats'))
+    connection.execute(sa.text(
+        f'INSERT INTO team_season_stats (team_id, season, matches, clean_sheets, {team_sums}, updated_at) '
+        f'SELECT ts.team_id, ts.season, COUNT(ts.id), '
+        f'SUM(CASE WHEN (m.home_team_id = ts.team_id AND m.away_goals = 0) '
+        f'OR (m.away_team_id = ts.team_id AND m.home_goals = 0) THEN 1 ELSE 0 END), '
+        + ', '.join(f'COALESCE(SUM(ts.{name}), 0)' for name, _ in TEAM_SUMS) +
+        ', CURRENT_TIMESTAMP FROM team_stats ts LEFT JOIN matches m ON m.id = ts.match_id '
+        'WHERE ts.team_id IS NOT NULL GROUP BY ts.team_id, ts.season'
+    ))
+    connection.execute(sa.text('DELETE FROM player_season_stats'))
+    connection.execute(sa.text(
+        f'INSERT INTO player_season_stats (player_id, season, matches, {player_sums}, updated_at) '
+        f'SELECT player_id, season, COUNT(id), '
+        + ', '.join(f'COALESCE(SUM({name}), 0)' for name, _ in PLAYER_SUMS) +
+        ', CURRENT_TIMESTAMP FROM advanced_player_stats '
+        'WHERE player_id IS NOT NULL GROUP BY player_id, season'
+    ))
+
+
+def downgrade():
+    op.drop_table('player_season_stats')
+    op.drop_table('team_season_stats')
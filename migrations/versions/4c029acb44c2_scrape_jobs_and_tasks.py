@@ -0,0 +1,56 @@
+"""scrape jobs and tasks
+
+Execuções do scraper e suas tarefas por página (scraper.jobs), gravadas a
+cada estágio para retomar uma execução interrompida do ponto em que parou.
+
+Revision ID: 4c029acb44c2
+Revises: 63aefe1dd24b
+Create Date: 2026-10-18 19:07:10.640271
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c029acb44c2'
+down_revision = '63aefe1dd24b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'scrape_jobs' not in tables:
+        op.create_table(
+            'scrape_jobs',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('kind', sa.String(length=20), nullable=False),
+            sa.Column('status', sa.String(length=20), default='running'),
+            sa.Column('stage', sa.String(length=20)),
+            sa.Column('runs', sa.Integer(), default=1),
+            sa.Column('created_at', sa.DateTime()),
+            sa.Column('started_at', sa.DateTime()),
+            sa.Column('finished_at', sa.DateTime()),
+        )
+
+    if 'scrape_tasks' not in tables:
+        op.create_table(
+            'scrape_tasks',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('job_id', sa.Integer(), sa.ForeignKey('scrape_jobs.id'), nullable=False),
+            sa.Column('stage', sa.String(length=20), nullable=False),
+            sa.Column('entity_id', sa.Integer()),
+            sa.Column('url', sa.String(length=500)),
+            sa.Column('status', sa.String(length=20), default='pending'),
+            sa.Column('attempts', sa.Integer(), default=0),
+            sa.Column('last_error', sa.Text()),
+            sa.Column('finished_at', sa.DateTime()),
+        )
+        op.create_index('ix_scrape_tasks_job_stage_status', 'scrape_tasks', ['job_id', 'stage', 'status'])
+
+
+def downgrade():
+    op.drop_table('scrape_tasks')
+    op.drop_table('scrape_jobs')
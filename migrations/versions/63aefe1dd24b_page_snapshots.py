@@ -0,0 +1,39 @@
+"""page snapshots
+
+Hash e histórico de mudanças de cada página coletada (scraper.incremental):
+a atualização incremental prioriza as páginas que mudam com mais frequência.
+
+Revision ID: 63aefe1dd24b
+Revises: a369d3f0597f
+Create Date: 2026-10-18 19:05:42.118306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '63aefe1dd24b'
+down_revision = 'a369d3f0597f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'page_snapshots' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            'page_snapshots',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('url', sa.String(length=500), nullable=False, unique=True),
+            sa.Column('entity_type', sa.String(length=20)),
+            sa.Column('entity_id', sa.Integer()),
+            sa.Column('content_hash', sa.String(length=40)),
+            sa.Column('checks', sa.Integer(), default=0),
+            sa.Column('changes', sa.Integer(), default=0),
+            sa.Column('last_checked', sa.DateTime()),
+            sa.Column('last_changed', sa.DateTime()),
+        )
+
+
+def downgrade():
+    op.drop_table('page_snapshots')
@@ -0,0 +1,70 @@
+"""goal events and timing histograms
+
+Gols estruturados por partida (minuto e acréscimos separados, time e
+autor) e histogramas de tempo dos gols por (time, temporada) e (liga,
+temporada), mantidos por database.goal_timing. Sem carga inicial: a
+coluna de texto matches.goal_times não diz qual time marcou, então os
+gols são preenchidos na próxima coleta das partidas.
+
+Revision ID: 838760530697
+Revises: 47e24500632e
+Create Date: 2026-10-18 15:54:24.614724
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '838760530697'
+down_revision = '47e24500632e'
+branch_labels = None
+depends_on = None
+
+
+BUCKETS = ['goals_0_15', 'goals_16_30', 'goals_31_45', 'goals_46_60', 'goals_61_75', 'goals_76_90', 'goals_extra']
+
+
+def upgrade():
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'goal_events' not in tables:
+        op.create_table(
+            'goal_events',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('match_id', sa.Integer(), sa.ForeignKey('matches.id'), nullable=False),
+            sa.Column('sequence', sa.Integer(), nullable=False),
+            sa.Column('team_id', sa.Integer(), sa.ForeignKey('teams.id')),
+            sa.Column('player_id', sa.Integer(), sa.ForeignKey('players.id')),
+            sa.Column('season', sa.String(length=20)),
+            sa.Column('minute', sa.Integer(), nullable=False),
+            sa.Column('added_time', sa.Integer(), default=0),
+        )
+        op.create_index('uq_goal_events_match_sequence', 'goal_events', ['match_id', 'sequence'], unique=True)
+        op.create_index('ix_goal_events_team_season', 'goal_events', ['team_id', 'season'])
+        op.create_index('ix_goal_events_player_id', 'goal_events', ['player_id'])
+
+    if 'goal_timing_histograms' not in tables:
+        op.create_table(
+            'goal_timing_histograms',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('scope', sa.String(length=10), nullable=False),
+            sa.Column('scope_id', sa.Integer(), nullable=False),
+            sa.Column('season', sa.String(length=20)),
+            sa.Column('goals', sa.Integer(), default=0),
+            sa.Column('first_half', sa.Integer(), default=0),
+            sa.Column('second_half', sa.Integer(), default=0),
+            sa.Column('minutes_sum', sa.Integer(), default=0),
+            *[sa.Column(bucket, sa.Integer(), default=0) for bucket in BUCKETS],
+            sa.Column('updated_at', sa.DateTime()),
+        )
+        op.create_index(
+            'uq_goal_timing_histograms_scope_season', 'goal_timing_histograms',
+            ['scope', 'scope_id', 'season'], unique=True
+        )
+        op.create_index('ix_goal_timing_histograms_scope_season', 'goal_timing_histograms', ['scope', 'season'])
+
+
+def downgrade():
+    op.drop_table('goal_timing_histograms')
+    op.drop_table('goal_events')
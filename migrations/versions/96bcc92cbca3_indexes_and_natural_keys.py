@@ -0,0 +1,114 @@
+"""indexes and natural keys
+
+Índices para as consultas frequentes (filtros da API e das páginas) e
+índices únicos nas chaves naturais usadas pelo scraper para deduplicar.
+Antes de criar os índices únicos, remove as duplicatas existentes
+(mantendo o maior id) e reaponta as chaves estrangeiras para a linha
+mantida. Índices já existentes (tabelas criadas por db.create_all())
+são ignorados.
+
+Revision ID: 96bcc92cbca3
+Revises:
+Create Date: 2026-10-18 15:42:57.539992
+
+"""
+import logging
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '96bcc92cbca3'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+# (tabela, nome, colunas, único)
+INDEXES = [
+    ('leagues', 'uq_leagues_url', ['url'], True),
+    ('teams', 'uq_teams_url', ['url'], True),
+    ('teams', 'ix_teams_league_id', ['league_id'], False),
+    ('players', 'uq_players_url', ['url'], True),
+    ('players', 'ix_players_team_position', ['team_id', 'position'], False),
+    ('player_stats', 'uq_player_stats_player_season', ['player_id', 'season'], True),
+    ('player_stats', 'ix_player_stats_season', ['season'], False),
+    ('matches', 'uq_matches_home_away_date', ['home_team_id', 'away_team_id', 'date'], True),
+    ('matches', 'ix_matches_away_date', ['away_team_id', 'date'], False),
+    ('matches', 'ix_matches_date', ['date'], False),
+    ('advanced_player_stats', 'uq_advanced_player_stats_player_match', ['player_id', 'match_id'], True),
+    ('advanced_player_stats', 'ix_advanced_player_stats_player_season', ['player_id', 'season'], False),
+    ('advanced_player_stats', 'ix_advanced_player_stats_match_id', ['match_id'], False),
+    ('team_stats', 'uq_team_stats_team_match', ['team_id', 'match_id'], True),
+    ('team_stats', 'ix_team_stats_team_season', ['team_id', 'season'], False),
+    ('team_stats', 'ix_team_stats_match_id', ['match_id'], False),
+]
+
+# Ordem de deduplicação: (tabela, chave natural, [(tabela filha, coluna)])
+# Os pais vêm antes porque reapontar filhos pode gerar novas duplicatas neles.
+NATURAL_KEYS = [
+    ('leagues', ['url'], [('teams', 'league_id')]),
+    ('teams', ['url'], [
+        ('players', 'team_id'), ('matches', 'home_team_id'), ('matches', 'away_team_id'), ('team_stats', 'team_id')
+    ]),
+    ('players', ['url'], [('player_stats', 'player_id'), ('advanced_player_stats', 'player_id')]),
+    ('matches', ['home_team_id', 'away_team_id', 'date'], [
+        ('advanced_player_stats', 'match_id'), ('team_stats', 'match_id')
+    ]),
+    ('player_stats', ['player_id', 'season'], []),
+    ('advanced_player_stats', ['player_id', 'match_id'], []),
+    ('team_stats', ['team_id', 'match_id'], []),
+]
+
+
+def _duplicates(connection, table, columns):
+    """Retorna {id duplicado: id mantido} para a chave natural da tabela"""
+    key_list = ', '.join(columns)
+    not_null = ' AND '.join(f'{c} IS NOT NULL' for c in columns)
+    join_on = ' AND '.join(f't.{c} = k.{c}' for c in columns)
+    rows = connection.execute(sa.text(
+        f'SELECT t.id, k.keep_id FROM {table} t '
+        f'JOIN (SELECT {key_list}, MAX(id) AS keep_id FROM {table} WHERE {not_null} '
+        f'GROUP BY {key_list} HAVING COUNT(*) > 1) k ON {join_on} '
+        f'WHERE t.id <> k.keep_id'
+    ))
+    return {row[0]: row[1] for row in rows}
+
+
+def _remove_duplicates(connection):
+    for table, columns, children in NATURAL_KEYS:
+        duplicates = _duplicates(connection, table, columns)
+        if not duplicates:
+            continue
+
+        pairs = [{'duplicate': duplicate, 'keep': keep} for duplicate, keep in duplicates.items()]
+        for child, column in children:
+            connection.execute(
+                sa.text(f'UPDATE {child} SET {column} = :keep WHERE {column} = :duplicate'), pairs
+            )
+        connection.execute(sa.text(f'DELETE FROM {table} WHERE id = :duplicate'), pairs)
+        logger.info(f"🧹 {table}: {len(duplicates)} duplicatas removidas")
+
+
+def upgrade():
+    connection = op.get_bind()
+    _remove_duplicates(connection)
+
+    inspector = sa.inspect(connection)
+    existing = {
+        table: {index['name'] for index in inspector.get_indexes(table)}
+        for table in {table for table, _, _, _ in INDEXES}
+    }
+    for table, name, columns, unique in INDEXES:
+        if name not in existing[table]:
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade():
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    for table, name, _, _ in reversed(INDEXES):
+        if name in {index['name'] for index in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,37 @@
+"""name indexes
+
+Índices no nome de jogadores e times: as listagens paginadas por chave
+(app.listing) ordenam por (name, id) e filtram por prefixo do nome.
+
+Revision ID: a369d3f0597f
+Revises: ca04194203aa
+Create Date: 2026-10-18 18:02:11.530917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a369d3f0597f'
+down_revision = 'ca04194203aa'
+branch_labels = None
+depends_on = None
+
+NAME_INDEXES = [
+    ('ix_players_name', 'players'),
+    ('ix_teams_name', 'teams'),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    for name, table in NAME_INDEXES:
+        if name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, ['name'])
+
+
+def downgrade():
+    for name, table in NAME_INDEXES:
+        op.drop_index(name, table_name=table)
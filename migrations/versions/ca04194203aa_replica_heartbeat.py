@@ -0,0 +1,32 @@
+"""replica heartbeat
+
+Linha única gravada periodicamente no primário e lida na réplica de
+leitura para medir o atraso da replicação (database.routing).
+
+Revision ID: ca04194203aa
+Revises: 2641d10d5c18
+Create Date: 2026-10-18 17:21:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ca04194203aa'
+down_revision = '2641d10d5c18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'replica_heartbeat' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            'replica_heartbeat',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('beat_at', sa.DateTime(), nullable=False),
+        )
+
+
+def downgrade():
+    op.drop_table('replica_heartbeat')
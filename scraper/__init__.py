@@ -1,4 +1,4 @@
-# Inicialização do pacote scraper
-from .fbref_scraper import FBRefScraper
-
+# Inicialização do pacote scraper
+from .fbref_scraper import FBRefScraper
+
 __all__ = ['FBRefScraper']
\ No newline at end of file
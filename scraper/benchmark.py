@@ -0,0 +1,193 @@
+"""
+Benchmark offline do scraper sobre um acervo de páginas gravado com
+SCRAPER_CORPUS_MODE=record.
+
+Roda o fluxo completo (update_all_data) em modo replay contra um banco local
+e depois mede isoladamente o parsing, a gravação e os extratores de partida,
+reportando páginas/s, linhas/s, tempo de CPU e pico de memória por etapa.
+
+Uso:
+    python -m scraper.benchmark --corpus corpus/ --json bench.json
+    python -m scraper.benchmark --corpus corpus/ --baseline bench.json --tolerance 0.2
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from bs4 import BeautifulSoup
+from app import create_app
+from app.models import db, League, Team, Player, PlayerStats
+from scraper.fbref_scraper import FBRefScraper
+from scraper.parsing import MatchPageIndex
+from scraper.replay import Corpus
+
+
+class Stage:
+    """Mede tempo de parede, CPU e pico de memória de uma etapa"""
+
+    def __init__(self, name, track_memory=True):
+        self.name = name
+        self.track_memory = track_memory
+        self.pages = 0
+        self.rows = 0
+
+    def __enter__(self):
+        if self.track_memory:
+            tracemalloc.reset_peak()
+            self.baseline_memory = tracemalloc.get_traced_memory()[0]
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall = time.perf_counter() - self.wall
+        self.cpu = time.process_time() - self.cpu
+        self.peak = tracemalloc.get_traced_memory()[1] - self.baseline_memory if self.track_memory else 0
+        return False
+
+    def result(self):
+        wall = max(self.wall, 1e-9)
+        return {
+            'stage': self.name,
+            'pages': self.pages,
+            'rows': self.rows,
+            'wall_s': round(self.wall, 4),
+            'cpu_s': round(self.cpu, 4),
+            'pages_per_s': round(self.pages / wall, 2),
+            'rows_per_s': round(self.rows / wall, 2),
+            'peak_mb': round(self.peak / 1024 / 1024, 2)
+        }
+
+
+def run_end_to_end(corpus_dir, track_memory):
+    """Executa update_all_data lendo as páginas do acervo"""
+    scraper = FBRefScraper(requests_per_second=0, cache=False, corpus_mode='replay', corpus_dir=corpus_dir)
+    fetched = []
+    get = scraper.session.get
+    scraper.session.get = lambda url, **kwargs: fetched.append(url) or get(url, **kwargs)
+
+    with Stage('e2e:update_all_data', track_memory) as stage:
+        scraper.update_all_data()
+    stage.pages = len(fetched)
+    stage.rows = sum(model.query.count() for model in (League, Team, Player, PlayerStats))
+    return stage.result()
+
+
+def run_stages(corpus, track_memory):
+    """Mede parsing e gravação por tipo de página e os extratores de partida"""
+    scraper = FBRefScraper(requests_per_second=0, cache=False)
+    results = []
+    owners = {'league': League, 'team': Team, 'player': Player}
+    steps = [
+        ('competitions', scraper._parse_leagues, lambda _, rows: scraper._save_leagues(rows)),
+        ('league', scraper._parse_teams, scraper._save_teams),
+        ('team', scraper._parse_players, scraper._save_players),
+        ('player', scraper._parse_player_stats, scraper._save_player_stats),
+    ]
+
+    for page_type, parse, save in steps:
+        pages = [corpus.load(url) + (url,) for url in corpus.urls(page_type)]
+        parsed = []
+        with Stage(f'parse:{page_type}', track_memory) as stage:
+            for _, body, url in pages:
+                rows = parse(body)
+                parsed.append((url, rows))
+                stage.pages += 1
+                stage.rows += len(rows)
+        results.append(stage.result())
+
+        model = owners.get(page_type)
+        ids = dict(db.session.query(model.url, model.id)) if model else {}
+        with Stage(f'save:{page_type}', track_memory) as stage:
+            for url, rows in parsed:
+                if model and url not in ids:
+                    continue
+                save(ids.get(url), rows)
+                db.session.commit()
+                stage.pages += 1
+                stage.rows += len(rows)
+        results.append(stage.result())
+
+    match_pages = [corpus.load(url)[1] for url in corpus.urls('match')]
+    with Stage('parse:match', track_memory) as stage:
+        indexes = [MatchPageIndex(BeautifulSoup(body, 'html.parser')) for body in match_pages]
+        stage.pages = len(indexes)
+    results.append(stage.result())
+
+    extractors = [
+        ('possession', scraper._extract_possession),
+        ('passing', scraper._extract_passing_stats),
+        ('shooting', scraper._extract_shooting_stats),
+        ('defensive', scraper._extract_defensive_stats),
+        ('goal_times', scraper._extract_goal_times),
+        ('fouls', scraper._extract_fouls_stats),
+    ]
+    for name, extract in extractors:
+        with Stage(f'extract:{name}', track_memory) as stage:
+            for index in indexes:
+                extract(index)
+                stage.pages += 1
+        results.append(stage.result())
+
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Lista as etapas cujo páginas/s caiu mais que `tolerance` em relação à base"""
+    previous = {r['stage']: r for r in baseline}
+    regressions = []
+    for result in results:
+        base = previous.get(result['stage'])
+        if base and base['pages_per_s'] and result['pages_per_s'] < base['pages_per_s'] * (1 - tolerance):
+            regressions.append((result['stage'], base['pages_per_s'], result['pages_per_s']))
+    return regressions
+
+
+def print_report(results):
+    header = f"{'etapa':<24}{'páginas':>9}{'linhas':>9}{'pág/s':>10}{'linhas/s':>11}{'cpu (s)':>9}{'pico MB':>9}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['stage']:<24}{r['pages']:>9}{r['rows']:>9}{r['pages_per_s']:>10}"
+              f"{r['rows_per_s']:>11}{r['cpu_s']:>9}{r['peak_mb']:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark offline do scraper')
+    parser.add_argument('--corpus', required=True, help='diretório do acervo gravado')
+    parser.add_argument('--json', help='grava os resultados neste arquivo')
+    parser.add_argument('--baseline', help='resultados anteriores para detectar regressões')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='queda máxima aceita em páginas/s')
+    parser.add_argument('--no-memory', action='store_true', help='não medir memória (tracemalloc deixa tudo mais lento)')
+    args = parser.parse_args(argv)
+
+    track_memory = not args.no_memory
+    if track_memory:
+        tracemalloc.start()
+
+    app = create_app('benchmark')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        results = [run_end_to_end(args.corpus, track_memory)]
+        results += run_stages(Corpus(args.corpus), track_memory)
+
+    print_report(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for stage, before, after in regressions:
+            print(f"❌ Regressão em {stage}: {before} -> {after} páginas/s")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Separador improvável em texto de célula, usado para limpar a coluna inteira com um único regex
+SEPARATOR = '\x1f'
+NON_INT_RE = re.compile(r'[^0-9\x1f]')
+NON_FLOAT_RE = re.compile(r'[^0-9.,\x1f]')
+
+
+def _clean_column(values, pattern):
+    try:
+        joined = SEPARATOR.join(values)
+    except TypeError:  # células não textuais (None, números)
+        joined = SEPARATOR.join('' if value is None else str(value) for value in values)
+    return np.array(pattern.sub('', joined).replace(',', '.').split(SEPARATOR))
+
+
+def int_column(values):
+    """
+    Converte uma coluna de textos em inteiros com a mesma regra de _safe_int:
+    descarta tudo que não é dígito ('1,234' -> 1234) e vazio vira 0.
+    """
+    values = list(values)
+    if not values:
+        return np.zeros(0, dtype=np.int64)
+
+    cleaned = _clean_column(values, NON_INT_RE)
+    cleaned[cleaned == ''] = '0'
+    try:
+        return cleaned.astype(np.int64)
+    except (ValueError, OverflowError):
+        return pd.to_numeric(pd.Series(cleaned), errors='coerce').fillna(0).to_numpy()
+
+
+def float_column(values):
+    """
+    Converte uma coluna de textos em floats com a mesma regra de _safe_float:
+    mantém dígitos, ponto e vírgula (vírgula vira ponto, '%' some) e textos
+    vazios ou inválidos viram 0.0.
+    """
+    values = list(values)
+    if not values:
+        return np.zeros(0, dtype=np.float64)
+
+    cleaned = _clean_column(values, NON_FLOAT_RE)
+    cleaned[cleaned == ''] = '0'
+    try:
+        return cleaned.astype(np.float64)
+    except ValueError:
+        # Algum valor inválido (ex.: '1.234.5'): converte célula a célula, inválidos viram 0.0
+        return pd.to_numeric(pd.Series(cleaned), errors='coerce').fillna(0.0).to_numpy()
+
+
+def convert_table(rows, int_columns=(), float_columns=()):
+    """
+    Converte de uma vez as colunas numéricas de uma tabela (lista de dicts com
+    o texto das células). Colunas ausentes em uma linha contam como vazias.
+    Retorna novas linhas com os valores convertidos em tipos nativos do Python.
+    """
+    if not rows:
+        return []
+
+    columns = {c: int_column([row.get(c) for row in rows]).tolist() for c in int_columns}
+    columns.update({c: float_column([row.get(c) for row in rows]).tolist() for c in float_columns})
+    return [
+        dict(row, **{c: values[i] for c, values in columns.items()})
+        for i, row in enumerate(rows)
+    ]
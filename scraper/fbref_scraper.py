@@ -1,485 +1,734 @@
-import requests
-from bs4 import BeautifulSoup
-import time
-import logging
-from datetime import datetime
-from database.db_connection import get_db_connection
-from app.models import db, League, Team, Player, PlayerStats, Match, AdvancedPlayerStats, TeamStats
-import json
-
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('scraper.log'),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger(__name__)
-
-class FBRefScraper:
-    def __init__(self):
-        self.base_url = "https://fbref.com"
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
-    
-    def scrape_leagues(self):
-        """Coleta dados das ligas principais"""
-        try:
-            logger.info("🔍 Coletando dados das ligas...")
-            response = self.session.get(f"{self.base_url}/en/comps/")
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            leagues_table = soup.find('table', {'id': 'comps'})
-            if leagues_table:
-                for row in leagues_table.find_all('tr')[1:]:  # Pular cabeçalho
-                    cols = row.find_all('td')
-                    if len(cols) > 1:
-                        link = cols[0].find('a')
-                        if link:
-                            name = link.text.strip()
-                            url = self.base_url + link['href']
-                            country = cols[1].text.strip()
-                            
-                            # Verificar se liga já existe
-                            league = League.query.filter_by(url=url).first()
-                            if not league:
-                                league = League(
-                                    name=name,
-                                    country=country,
-                                    url=url,
-                                    season='2023-2024'
-                                )
-                                db.session.add(league)
-                                logger.info(f"✅ Adicionada liga: {name}")
-            
-            db.session.commit()
-            logger.info("✅ Dados das ligas atualizados com sucesso")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Erro ao coletar ligas: {e}")
-            db.session.rollback()
-            return False
-    
-    def scrape_teams(self, league_id):
-        """Coleta times de uma liga específica"""
-        try:
-            league = League.query.get(league_id)
-            if not league:
-                logger.error(f"❌ Liga {league_id} não encontrada")
-                return False
-            
-            logger.info(f"🔍 Coletando times da liga: {league.name}")
-            response = self.session.get(league.url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Encontrar tabela de times (pode variar por liga)
-            teams_table = soup.find('table', {'id': 'results2023-202491_overall'})
-            if not teams_table:
-                teams_table = soup.find('table', {'class': 'stats_table'})
-            if not teams_table:
-                teams_table = soup.find('table')
-            
-            if teams_table:
-                for row in teams_table.find_all('tr')[1:]:  # Pular cabeçalho
-                    cols = row.find_all('td')
-                    if cols:
-                        link = cols[0].find('a')
-                        if link:
-                            name = link.text.strip()
-                            url = self.base_url + link['href']
-                            
-                            # Verificar se time já existe
-                            team = Team.query.filter_by(url=url).first()
-                            if not team:
-                                team = Team(
-                                    name=name,
-                                    league_id=league_id,
-                                    url=url
-                                )
-                                db.session.add(team)
-                                logger.info(f"✅ Adicionado time: {name}")
-            
-            db.session.commit()
-            logger.info(f"✅ Times da liga {league.name} atualizados com sucesso")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Erro ao coletar times: {e}")
-            db.session.rollback()
-            return False
-    
-    def scrape_players(self, team_id):
-        """Coleta jogadores de um time específico"""
-        try:
-            team = Team.query.get(team_id)
-            if not team:
-                logger.error(f"❌ Time {team_id} não encontrado")
-                return False
-            
-            logger.info(f"🔍 Coletando jogadores do time: {team.name}")
-            response = self.session.get(team.url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Encontrar tabela de jogadores
-            players_table = soup.find('table', {'id': 'stats_standard_9'})
-            if not players_table:
-                players_table = soup.find('table', {'class': 'stats_table'})
-            
-            if players_table:
-                for row in players_table.find_all('tr')[1:]:  # Pular cabeçalho
-                    cols = row.find_all('td')
-                    if cols:
-                        link = cols[0].find('a')
-                        if link:
-                            name = link.text.strip()
-                            url = self.base_url + link['href']
-                            position = cols[1].text.strip() if len(cols) > 1 else ''
-                            nationality = cols[2].text.strip() if len(cols) > 2 else ''
-                            
-                            # Verificar se jogador já existe
-                            player = Player.query.filter_by(url=url).first()
-                            if not player:
-                                player = Player(
-                                    name=name,
-                                    team_id=team_id,
-                                    position=position,
-                                    nationality=nationality,
-                                    url=url
-                                )
-                                db.session.add(player)
-                                logger.info(f"✅ Adicionado jogador: {name}")
-            
-            db.session.commit()
-            logger.info(f"✅ Jogadores do time {team.name} atualizados com sucesso")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Erro ao coletar jogadores: {e}")
-            db.session.rollback()
-            return False
-    
-    def scrape_player_stats(self, player_id):
-        """Coleta estatísticas de um jogador específico"""
-        try:
-            player = Player.query.get(player_id)
-            if not player:
-                logger.error(f"❌ Jogador {player_id} não encontrado")
-                return False
-            
-            logger.info(f"🔍 Coletando estatísticas do jogador: {player.name}")
-            response = self.session.get(player.url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Encontrar tabela de estatísticas
-            stats_table = soup.find('table', {'id': 'stats_standard_9'})
-            if stats_table:
-                for row in stats_table.find_all('tr'):
-                    # Ignorar linhas de tabelas parciais
-                    if row.get('class') and 'partial_table' in row.get('class'):
-                        continue
-                    
-                    cols = row.find_all(['th', 'td'])
-                    if cols and cols[0].name == 'th' and cols[0].get('scope') == 'row':
-                        season = cols[0].text.strip()
-                        
-                        # Extrair estatísticas
-                        stats_data = {}
-                        for col in cols[1:]:
-                            stat_name = col.get('data-stat')
-                            if stat_name:
-                                stats_data[stat_name] = col.text.strip()
-                        
-                        # Salvar estatísticas se houver dados de jogos
-                        if 'games' in stats_data:
-                            # Verificar se estatística já existe
-                            player_stat = PlayerStats.query.filter_by(
-                                player_id=player_id,
-                                season=season
-                            ).first()
-                            
-                            if not player_stat:
-                                player_stat = PlayerStats(
-                                    player_id=player_id,
-                                    season=season,
-                                    matches_played=self._safe_int(stats_data.get('games')),
-                                    goals=self._safe_int(stats_data.get('goals')),
-                                    assists=self._safe_int(stats_data.get('assists')),
-                                    minutes_played=self._safe_int(stats_data.get('minutes')),
-                                    xg=self._safe_float(stats_data.get('xg')),
-                                    xa=self._safe_float(stats_data.get('xa')),
-                                    shots=self._safe_int(stats_data.get('shots')),
-                                    key_passes=self._safe_int(stats_data.get('key_passes')),
-                                    yellow_cards=self._safe_int(stats_data.get('yellow_cards')),
-                                    red_cards=self._safe_int(stats_data.get('red_cards'))
-                                )
-                                db.session.add(player_stat)
-                                logger.info(f"✅ Estatísticas de {player.name} para {season} adicionadas")
-            
-            db.session.commit()
-            logger.info(f"✅ Estatísticas do jogador {player.name} atualizadas com sucesso")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Erro ao coletar estatísticas do jogador: {e}")
-            db.session.rollback()
-            return False
-    
-    def scrape_match_advanced_stats(self, match_url):
-        """Coleta estatísticas avançadas de uma partida"""
-        try:
-            logger.info(f"🔍 Coletando estatísticas avançadas: {match_url}")
-            response = self.session.get(match_url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            stats = {
-                'possession': self._extract_possession(soup),
-                'passing': self._extract_passing_stats(soup),
-                'shooting': self._extract_shooting_stats(soup),
-                'defensive': self._extract_defensive_stats(soup),
-                'goal_times': self._extract_goal_times(soup),
-                'fouls': self._extract_fouls_stats(soup),
-                'correct_score_probabilities': self._calculate_score_probabilities(soup)
-            }
-            
-            return stats
-            
-        except Exception as e:
-            logger.error(f"❌ Erro ao coletar estatísticas avançadas: {e}")
-            return {}
-    
-    def _extract_possession(self, soup):
-        """Extrai estatísticas de posse de bola"""
-        possession = {'home': 0, 'away': 0}
-        try:
-            # Buscar por elementos que contenham posse
-            possession_divs = soup.find_all('div', string=lambda text: text and 'Possession' in text)
-            for div in possession_divs:
-                parent = div.find_parent('div')
-                if parent:
-                    values = parent.find_all('span', class_='stat-value')
-                    if len(values) >= 2:
-                        possession['home'] = self._safe_float(values[0].text.replace('%', ''))
-                        possession['away'] = self._safe_float(values[1].text.replace('%', ''))
-                        break
-        except Exception as e:
-            logger.warning(f"⚠️ Erro ao extrair posse: {e}")
-        return possession
-    
-    def _extract_passing_stats(self, soup):
-        """Extrai estatísticas de passes"""
-        passing_stats = {'home': {}, 'away': {}}
-        try:
-            # Buscar tabelas de passes
-            tables = soup.find_all('table')
-            for table in tables:
-                caption = table.find('caption')
-                if caption and 'passing' in caption.text.lower():
-                    # Determinar qual time
-                    rows = table.find_all('tr')[1:]
-                    for row in rows:
-                        cols = row.find_all('td')
-                        if len(cols) > 3:
-                            player_name = cols[0].text.strip()
-                            passing_stats['home'][player_name] = {
-                                'total_passes': self._safe_int(cols[1].text),
-                                'completed_passes': self._safe_int(cols[2].text),
-                                'pass_accuracy': self._safe_float(cols[3].text.replace('%', ''))
-                            }
-        except Exception as e:
-            logger.warning(f"⚠️ Erro ao extrair passes: {e}")
-        return passing_stats
-    
-    def _extract_shooting_stats(self, soup):
-        """Extrai estatísticas de finalização (xG)"""
-        shooting_stats = {'home': {}, 'away': {}}
-        try:
-            tables = soup.find_all('table')
-            for table in tables:
-                caption = table.find('caption')
-                if caption and 'shooting' in caption.text.lower():
-                    rows = table.find_all('tr')[1:]
-                    for row in rows:
-                        cols = row.find_all('td')
-                        if len(cols) > 4:
-                            player_name = cols[0].text.strip()
-                            shooting_stats['home'][player_name] = {
-                                'shots': self._safe_int(cols[1].text),
-                                'shots_on_target': self._safe_int(cols[2].text),
-                                'goals': self._safe_int(cols[3].text),
-                                'xg': self._safe_float(cols[4].text)
-                            }
-        except Exception as e:
-            logger.warning(f"⚠️ Erro ao extrair finalização: {e}")
-        return shooting_stats
-    
-    def _extract_defensive_stats(self, soup):
-        """Extrai estatísticas defensivas"""
-        defensive_stats = {'home': {}, 'away': {}}
-        try:
-            tables = soup.find_all('table')
-            for table in tables:
-                caption = table.find('caption')
-                if caption and ('defense' in caption.text.lower() or 'defensive' in caption.text.lower()):
-                    rows = table.find_all('tr')[1:]
-                    for row in rows:
-                        cols = row.find_all('td')
-                        if len(cols) > 6:
-                            player_name = cols[0].text.strip()
-                            defensive_stats['home'][player_name] = {
-                                'tackles': self._safe_int(cols[1].text),
-                                'interceptions': self._safe_int(cols[2].text),
-                                'blocks': self._safe_int(cols[3].text),
-                                'clearances': self._safe_int(cols[4].text),
-                                'fouls': self._safe_int(cols[5].text),
-                                'saves': self._safe_int(cols[6].text) if len(cols) > 6 else 0
-                            }
-        except Exception as e:
-            logger.warning(f"⚠️ Erro ao extrair defesas: {e}")
-        return defensive_stats
-    
-    def _extract_goal_times(self, soup):
-        """Extrai minutos dos gols"""
-        goal_times = []
-        try:
-            # Buscar por eventos de gol
-            event_sections = soup.find_all('div', class_='event')
-            for section in event_sections:
-                if 'goal' in section.text.lower():
-                    minute_span = section.find('span', class_='minute')
-                    if minute_span:
-                        minute = self._safe_int(minute_span.text.replace("'", ""))
-                        if minute:
-                            goal_times.append(minute)
-        except Exception as e:
-            logger.warning(f"⚠️ Erro ao extrair tempos dos gols: {e}")
-        return goal_times
-    
-    def _extract_fouls_stats(self, soup):
-        """Extrai estatísticas de faltas"""
-        fouls_stats = {'home': 0, 'away': 0}
-        try:
-            # Buscar por estatísticas de faltas
-            foul_divs = soup.find_all('div', string=lambda text: text and 'Fouls' in text)
-            for div in foul_divs:
-                parent = div.find_parent('div')
-                if parent:
-                    values = parent.find_all('span', class_='stat-value')
-                    if len(values) >= 2:
-                        fouls_stats['home'] = self._safe_int(values[0].text)
-                        fouls_stats['away'] = self._safe_int(values[1].text)
-                        break
-        except Exception as e:
-            logger.warning(f"⚠️ Erro ao extrair faltas: {e}")
-        return fouls_stats
-    
-    def _calculate_score_probabilities(self, soup):
-        """Calcula probabilidades de placar (simulação)"""
-        probabilities = {
-            'score_probabilities': {
-                '0-0': 15.2, '1-0': 12.5, '0-1': 11.8,
-                '1-1': 18.3, '2-0': 8.7, '0-2': 7.9,
-                '2-1': 9.4, '1-2': 8.1, '2-2': 5.3
-            },
-            'both_teams_score': 68.4,
-            'over_2_5': 42.7,
-            'under_2_5': 57.3,
-            'most_likely_score': '1-1'
-        }
-        return probabilities
-    
-    def _safe_int(self, text):
-        """Converte texto para inteiro com segurança"""
-        try:
-            # Remove caracteres não numéricos
-            clean_text = ''.join(filter(str.isdigit, str(text)))
-            return int(clean_text) if clean_text else 0
-        except:
-            return 0
-    
-    def _safe_float(self, text):
-        """Converte texto para float com segurança"""
-        try:
-            # Remove caracteres não numéricos exceto ponto e vírgula
-            clean_text = ''.join(c for c in str(text) if c.isdigit() or c in '.,')
-            clean_text = clean_text.replace(',', '.')
-            return float(clean_text) if clean_text else 0.0
-        except:
-            return 0.0
-    
-    def update_all_data(self):
-        """Atualiza todos os dados do sistema"""
-        logger.info("🚀 Iniciando atualização completa de dados...")
-        
-        try:
-            # 1. Atualizar ligas
-            self.scrape_leagues()
-            
-            # 2. Atualizar times de todas as ligas
-            leagues = League.query.all()
-            for league in leagues:
-                self.scrape_teams(league.id)
-                time.sleep(1)  # Delay para evitar bloqueio
-            
-            # 3. Atualizar jogadores de todos os times
-            teams = Team.query.all()
-            for team in teams:
-                self.scrape_players(team.id)
-                time.sleep(1)
-            
-            # 4. Atualizar estatísticas dos jogadores
-            players = Player.query.all()
-            for player in players:
-                self.scrape_player_stats(player.id)
-                time.sleep(2)  # Delay maior para estatísticas
-            
-            # 5. Coletar estatísticas avançadas (opcional)
-            logger.info("📊 Coletando estatísticas avançadas...")
-            # self.update_advanced_statistics()
-            
-            logger.info("✅ Atualização completa concluída com sucesso!")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Erro na atualização completa: {e}")
-            return False
-    
-    def update_advanced_statistics(self):
-        """Atualiza estatísticas avançadas"""
-        logger.info("📈 Atualizando estatísticas avançadas...")
-        
-        # Esta função seria implementada quando tivermos URLs reais de partidas
-        # Por enquanto, é um placeholder
-        
-        logger.info("✅ Estatísticas avançadas atualizadas")
-        return True
-    
-    def get_test_data(self):
-        """Retorna dados de teste para desenvolvimento"""
-        return {
-            'leagues': [
-                {'name': 'Premier League', 'country': 'England'},
-                {'name': 'La Liga', 'country': 'Spain'},
-                {'name': 'Serie A', 'country': 'Italy'}
-            ],
-            'teams': [
-                {'name': 'Manchester United', 'league': 'Premier League'},
-                {'name': 'Real Madrid', 'league': 'La Liga'},
-                {'name': 'Juventus', 'league': 'Serie A'}
-            ],
-            'players': [
-                {'name': 'Cristiano Ronaldo', 'team': 'Manchester United', 'goals': 25},
-                {'name': 'Lionel Messi', 'team': 'Paris SG', 'goals': 30},
-                {'name': 'Neymar Jr', 'team': 'Paris SG', 'goals': 20}
-            ]
+import re
+import requests
+from bs4 import BeautifulSoup
+import time
+import logging
+from datetime import datetime
+from requests.adapters import HTTPAdapter
+from config import Config
+from database.db_connection import get_db_connection
+from database.bulk import bulk_upsert
+from database.goal_timing import replace_match_goals
+from database.archive import without_archived
+from app.models import db, League, Team, Player, PlayerStats, Match, AdvancedPlayerStats, TeamStats
+from scraper.rate_limiter import HostRateLimiter
+from scraper.pipeline import ScrapePipeline
+from scraper.http_cache import HTTPCache
+from scraper.jobs import JobRunner
+from scraper.incremental import RefreshPlanner, ChangeTracker
+from scraper.replay import Corpus, RecordingSession, ReplaySession
+from scraper.convert import convert_table
+from scraper.telemetry import Telemetry
+from scraper.parsing import DEFAULT_BACKENDS, MatchPageIndex, iter_table_rows, table_rows
+from functools import partial
+import json
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler('scraper.log'),
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# Colunas (data-stat) da tabela de estatísticas do jogador e seus campos em PlayerStats
+PLAYER_STATS_FIELDS = {
+    'games': 'matches_played',
+    'goals': 'goals',
+    'assists': 'assists',
+    'minutes': 'minutes_played',
+    'xg': 'xg',
+    'xa': 'xa',
+    'shots': 'shots',
+    'key_passes': 'key_passes',
+    'yellow_cards': 'yellow_cards',
+    'red_cards': 'red_cards',
+}
+PLAYER_STATS_FLOAT_COLUMNS = ('xg', 'xa')
+PLAYER_STATS_INT_COLUMNS = tuple(c for c in PLAYER_STATS_FIELDS if c not in PLAYER_STATS_FLOAT_COLUMNS)
+
+# Minuto do gol com acréscimos opcionais: "23'", "45+1'", "90 + 4'"
+GOAL_MINUTE = re.compile(r'(\d+)(?:\s*\+\s*(\d+))?')
+
+class FBRefScraper:
+    def __init__(self, max_workers=None, parse_workers=None, requests_per_second=None, burst=None, cache=None,
+                 parser_backends=None, corpus_mode=None, corpus_dir=None, telemetry=None):
+        self.base_url = "https://fbref.com"
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1'
+        }
+        
+        # Orçamento de cortesia: workers simultâneos e requisições por segundo por host
+        self.max_workers = max_workers or Config.SCRAPER_MAX_WORKERS
+        self.parse_workers = parse_workers or Config.SCRAPER_PARSE_WORKERS
+        self.timeout = Config.SCRAPER_TIMEOUT
+        self.rate_limiter = HostRateLimiter(
+            requests_per_second if requests_per_second is not None else Config.SCRAPER_REQUESTS_PER_SECOND,
+            burst or Config.SCRAPER_BURST
+        )
+        
+        # Modo acervo: 'record' grava as páginas baixadas, 'replay' trabalha offline
+        corpus_mode = corpus_mode or Config.SCRAPER_CORPUS_MODE
+        if corpus_mode == 'record':
+            self.session = RecordingSession(Corpus(corpus_dir or Config.SCRAPER_CORPUS_DIR))
+        elif corpus_mode == 'replay':
+            self.session = ReplaySession(Corpus(corpus_dir or Config.SCRAPER_CORPUS_DIR))
+        else:
+            self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Cache HTTP persistente (None desativa)
+        if cache is None and Config.SCRAPER_CACHE_ENABLED:
+            cache = HTTPCache(Config.SCRAPER_CACHE_PATH, Config.SCRAPER_CACHE_MAX_MB * 1024 * 1024)
+        self.cache = cache or None
+        
+        # Backend de parsing por tipo de página ('lxml' ou 'soup')
+        self.parser_backends = dict(DEFAULT_BACKENDS, **(parser_backends or {}))
+        
+        # Métricas da execução (latência, volume, tempos de parsing/gravação e falhas)
+        self.telemetry = telemetry or Telemetry()
+    
+    def _fetch(self, url, page_type=None):
+        """
+        Baixa uma página respeitando o limite de requisições do host.
+        Retorna None quando a página não mudou desde a última coleta
+        (entrada do cache dentro do TTL ou resposta 304), para que o
+        parsing e a gravação sejam pulados.
+        """
+        page_type = page_type or 'other'
+        entry = self.cache.get(url) if self.cache else None
+        if entry and self.cache.is_fresh(entry):
+            self.cache.record('hits')
+            self.telemetry.inc('scrape_http_requests_total', page_type=page_type, result='cached')
+            return None
+        
+        headers = self.cache.conditional_headers(entry) if entry else {}
+        waited = self.rate_limiter.acquire(url)
+        self.telemetry.observe('scrape_rate_limit_wait_seconds', waited or 0.0, page_type=page_type)
+        try:
+            with self.telemetry.timer('scrape_http_seconds', page_type=page_type):
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except Exception:
+            self.telemetry.inc('scrape_http_requests_total', page_type=page_type, result='error')
+            raise
+        
+        if entry and response.status_code == 304:
+            self.cache.record('revalidated')
+            self.cache.mark_revalidated(url)
+            self.telemetry.inc('scrape_http_requests_total', page_type=page_type, result='revalidated')
+            return None
+        
+        self.telemetry.inc(
+            'scrape_http_requests_total', page_type=page_type,
+            result='downloaded' if response.status_code < 400 else f'http_{response.status_code}'
+        )
+        self.telemetry.inc('scrape_http_bytes_total', len(response.content), page_type=page_type)
+        response.raise_for_status()
+        if self.cache:
+            self.cache.record('misses')
+            self.cache.store(
+                url, page_type, response.content,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+        return response.content
+    
+    def _invalidate(self, url):
+        """Descarta a página do cache para que ela seja reprocessada na próxima coleta"""
+        if self.cache:
+            self.cache.invalidate(url)
+    
+    def _on_page_failure(self, page_type, key, url, error):
+        """Falha de uma página no pipeline: descarta do cache e registra nas métricas"""
+        self._invalidate(url)
+        self.telemetry.record_failure(page_type, url, error)
+    
+    def _commit_stage(self, save, *args):
+        """Executa um estágio de gravação em uma transação própria"""
+        try:
+            save(*args)
+            db.session.commit()
+            return True
+        except Exception as e:
+            logger.error(f"❌ Erro ao gravar dados: {e}")
+            db.session.rollback()
+            return False
+    
+    def scrape_leagues(self):
+        """Coleta dados das ligas principais"""
+        try:
+            logger.info("🔍 Coletando dados das ligas...")
+            url = f"{self.base_url}/en/comps/"
+            content = self._fetch(url, 'competitions')
+            if content is None:
+                logger.info("⏭️ Página de competições sem alterações")
+                return True
+            
+            parse, save = self.telemetry.instrument('competitions', self._parse_leagues, self._save_leagues)
+            try:
+                save(parse(content))
+            except Exception as e:
+                self._invalidate(url)
+                self.telemetry.record_failure('competitions', url, e)
+                raise
+            
+            db.session.commit()
+            logger.info("✅ Dados das ligas atualizados com sucesso")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao coletar ligas: {e}")
+            db.session.rollback()
+            return False
+    
+    def _parse_leagues(self, content):
+        """Extrai as ligas da página de competições"""
+        rows = []
+        table_rows = iter_table_rows(content, [{'table_id': 'comps'}], self.parser_backends.get('competitions'))
+        
+        for row in list(table_rows)[1:]:  # Pular cabeçalho
+            cols = [cell for cell in row.cells if cell.tag == 'td']
+            if len(cols) > 1 and cols[0].href:
+                rows.append({
+                    'name': cols[0].link_text.strip(),
+                    'url': self.base_url + cols[0].href,
+                    'country': cols[1].text.strip()
+                })
+        return rows
+    
+    def _save_leagues(self, rows):
+        """Grava as ligas novas ou alteradas"""
+        result = bulk_upsert(League, [dict(data, season='2023-2024') for data in rows])
+        logger.info(f"✅ Ligas: {result.inserted} adicionadas, {result.updated} atualizadas")
+        return result
+    
+    def scrape_teams(self, league_id):
+        """Coleta times de uma liga específica"""
+        try:
+            league = League.query.get(league_id)
+            if not league:
+                logger.error(f"❌ Liga {league_id} não encontrada")
+                return False
+            
+            logger.info(f"🔍 Coletando times da liga: {league.name}")
+            content = self._fetch(league.url, 'league')
+            if content is None:
+                logger.info(f"⏭️ Liga {league.name} sem alterações")
+                return True
+            
+            parse, save = self.telemetry.instrument('league', self._parse_teams, self._save_teams)
+            try:
+                save(league_id, parse(content))
+            except Exception as e:
+                self._invalidate(league.url)
+                self.telemetry.record_failure('league', league.url, e)
+                raise
+            
+            db.session.commit()
+            logger.info(f"✅ Times da liga {league.name} atualizados com sucesso")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao coletar times: {e}")
+            db.session.rollback()
+            return False
+    
+    def _parse_teams(self, content):
+        """Extrai os times da página de uma liga"""
+        rows = []
+        
+        # Encontrar tabela de times (pode variar por liga)
+        table_rows = iter_table_rows(content, [
+            {'table_id': 'results2023-202491_overall'},
+            {'table_class': 'stats_table'},
+            {}
+        ], self.parser_backends.get('league'))
+        
+        for row in list(table_rows)[1:]:  # Pular cabeçalho
+            cols = [cell for cell in row.cells if cell.tag == 'td']
+            if cols and cols[0].href:
+                rows.append({
+                    'name': cols[0].link_text.strip(),
+                    'url': self.base_url + cols[0].href
+                })
+        return rows
+    
+    def _save_teams(self, league_id, rows):
+        """Grava os times novos ou alterados de uma liga"""
+        result = bulk_upsert(Team, [dict(data, league_id=league_id) for data in rows])
+        logger.info(f"✅ Times da liga {league_id}: {result.inserted} adicionados, {result.updated} atualizados")
+        return result
+    
+    def scrape_players(self, team_id):
+        """Coleta jogadores de um time específico"""
+        try:
+            team = Team.query.get(team_id)
+            if not team:
+                logger.error(f"❌ Time {team_id} não encontrado")
+                return False
+            
+            logger.info(f"🔍 Coletando jogadores do time: {team.name}")
+            content = self._fetch(team.url, 'team')
+            if content is None:
+                logger.info(f"⏭️ Time {team.name} sem alterações")
+                return True
+            
+            parse, save = self.telemetry.instrument('team', self._parse_players, self._save_players)
+            try:
+                save(team_id, parse(content))
+            except Exception as e:
+                self._invalidate(team.url)
+                self.telemetry.record_failure('team', team.url, e)
+                raise
+            
+            db.session.commit()
+            logger.info(f"✅ Jogadores do time {team.name} atualizados com sucesso")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao coletar jogadores: {e}")
+            db.session.rollback()
+            return False
+    
+    def _parse_players(self, content):
+        """Extrai os jogadores da página de um time"""
+        rows = []
+        
+        # Encontrar tabela de jogadores
+        table_rows = iter_table_rows(content, [
+            {'table_id': 'stats_standard_9'},
+            {'table_class': 'stats_table'}
+        ], self.parser_backends.get('team'))
+        
+        for row in list(table_rows)[1:]:  # Pular cabeçalho
+            cols = [cell for cell in row.cells if cell.tag == 'td']
+            if cols and cols[0].href:
+                rows.append({
+                    'name': cols[0].link_text.strip(),
+                    'url': self.base_url + cols[0].href,
+                    'position': cols[1].text.strip() if len(cols) > 1 else '',
+                    'nationality': cols[2].text.strip() if len(cols) > 2 else ''
+                })
+        return rows
+    
+    def _save_players(self, team_id, rows):
+        """Grava os jogadores novos ou alterados de um time"""
+        result = bulk_upsert(Player, [dict(data, team_id=team_id) for data in rows])
+        logger.info(f"✅ Jogadores do time {team_id}: {result.inserted} adicionados, {result.updated} atualizados")
+        return result
+    
+    def scrape_player_stats(self, player_id):
+        """Coleta estatísticas de um jogador específico"""
+        try:
+            player = Player.query.get(player_id)
+            if not player:
+                logger.error(f"❌ Jogador {player_id} não encontrado")
+                return False
+            
+            logger.info(f"🔍 Coletando estatísticas do jogador: {player.name}")
+            content = self._fetch(player.url, 'player')
+            if content is None:
+                logger.info(f"⏭️ Jogador {player.name} sem alterações")
+                return True
+            
+            parse, save = self.telemetry.instrument('player', self._parse_player_stats, self._save_player_stats)
+            try:
+                save(player_id, parse(content))
+            except Exception as e:
+                self._invalidate(player.url)
+                self.telemetry.record_failure('player', player.url, e)
+                raise
+            
+            db.session.commit()
+            logger.info(f"✅ Estatísticas do jogador {player.name} atualizadas com sucesso")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao coletar estatísticas do jogador: {e}")
+            db.session.rollback()
+            return False
+    
+    def _parse_player_stats(self, content):
+        """Extrai as estatísticas por temporada da página de um jogador"""
+        rows = []
+        
+        # Encontrar tabela de estatísticas
+        table_rows = iter_table_rows(content, [{'table_id': 'stats_standard_9'}], self.parser_backends.get('player'))
+        for row in table_rows:
+            # Ignorar linhas de tabelas parciais
+            if 'partial_table' in row.classes:
+                continue
+            
+            cols = row.cells
+            if cols and cols[0].tag == 'th' and cols[0].scope == 'row':
+                season = cols[0].text.strip()
+                
+                # Extrair estatísticas
+                stats_data = {}
+                for col in cols[1:]:
+                    if col.stat:
+                        stats_data[col.stat] = col.text.strip()
+                
+                # Manter apenas temporadas com dados de jogos
+                if 'games' in stats_data:
+                    stats_data['season'] = season
+                    rows.append(stats_data)
+        
+        # Converter a tabela inteira de uma vez, coluna a coluna
+        rows = convert_table(rows, int_columns=PLAYER_STATS_INT_COLUMNS, float_columns=PLAYER_STATS_FLOAT_COLUMNS)
+        return [
+            {'season': row['season'], **{field: row[stat] for stat, field in PLAYER_STATS_FIELDS.items()}}
+            for row in rows
+        ]
+    
+    def _save_player_stats(self, player_id, rows):
+        """Grava as estatísticas novas ou alteradas de um jogador (temporadas arquivadas ficam de fora)"""
+        rows = without_archived(rows)
+        result = bulk_upsert(PlayerStats, [dict(data, player_id=player_id) for data in rows])
+        logger.info(f"✅ Estatísticas do jogador {player_id}: {result.inserted} temporadas adicionadas, {result.updated} atualizadas")
+        return result
+    
+    def scrape_match_advanced_stats(self, match_url, match_id=None):
+        """
+        Coleta estatísticas avançadas de uma partida. Com `match_id`, os gols
+        (minuto, acréscimos, time e autor) são gravados em goal_events.
+        Retorna None quando a página não mudou desde a última coleta e {} em
+        caso de erro (inclusive na gravação dos gols).
+        """
+        try:
+            logger.info(f"🔍 Coletando estatísticas avançadas: {match_url}")
+            content = self._fetch(match_url, 'match')
+            if content is None:
+                logger.info(f"⏭️ Partida {match_url} sem alterações")
+                return None
+            
+            index = MatchPageIndex(BeautifulSoup(content, 'html.parser'))
+            goal_events = self._extract_goal_events(index)
+            
+            stats = {
+                'possession': self._extract_possession(index),
+                'passing': self._extract_passing_stats(index),
+                'shooting': self._extract_shooting_stats(index),
+                'defensive': self._extract_defensive_stats(index),
+                'goal_times': [goal['minute'] for goal in goal_events],
+                'goal_events': goal_events,
+                'fouls': self._extract_fouls_stats(index),
+                'correct_score_probabilities': self._calculate_score_probabilities(index)
+            }
+            if match_id is not None and not self._commit_stage(self._save_goal_events, match_id, goal_events):
+                # Sem o cache a página volta a ser baixada e os gols, gravados na próxima coleta
+                self._invalidate(match_url)
+                return {}
+            
+            return stats
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao coletar estatísticas avançadas: {e}")
+            return {}
+    
+    def _extract_possession(self, index):
+        """Extrai estatísticas de posse de bola"""
+        possession = {'home': 0, 'away': 0}
+        try:
+            values = index.block_values('Possession')
+            if values:
+                possession['home'] = self._safe_float(values[0].replace('%', ''))
+                possession['away'] = self._safe_float(values[1].replace('%', ''))
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao extrair posse: {e}")
+        return possession
+    
+    def _extract_player_table(self, index, category, min_cols, int_columns=(), float_columns=()):
+        """
+        Extrai uma tabela por jogador de cada time: {'home': {nome: {...}}, 'away': {...}}.
+        As colunas após o nome são lidas na ordem de `int_columns` seguida de `float_columns`.
+        """
+        names = list(int_columns) + list(float_columns)
+        result = {'home': {}, 'away': {}}
+        for side, table in index.tables(category).items():
+            raw = []
+            for row in list(table_rows(table))[1:]:
+                cols = [cell.text for cell in row.cells if cell.tag == 'td']
+                if len(cols) > min_cols:
+                    raw.append(dict(zip(['player'] + names, [cols[0].strip()] + cols[1:len(names) + 1])))
+            
+            for row in convert_table(raw, int_columns, float_columns):
+                result[side][row.pop('player')] = row
+        return result
+    
+    def _extract_passing_stats(self, index):
+        """Extrai estatísticas de passes"""
+        try:
+            return self._extract_player_table(
+                index, 'passing', 3,
+                int_columns=('total_passes', 'completed_passes'),
+                float_columns=('pass_accuracy',)
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao extrair passes: {e}")
+            return {'home': {}, 'away': {}}
+    
+    def _extract_shooting_stats(self, index):
+        """Extrai estatísticas de finalização (xG)"""
+        try:
+            return self._extract_player_table(
+                index, 'shooting', 4,
+                int_columns=('shots', 'shots_on_target', 'goals'),
+                float_columns=('xg',)
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao extrair finalização: {e}")
+            return {'home': {}, 'away': {}}
+    
+    def _extract_defensive_stats(self, index):
+        """Extrai estatísticas defensivas"""
+        try:
+            return self._extract_player_table(
+                index, 'defense', 6,
+                int_columns=('tackles', 'interceptions', 'blocks', 'clearances', 'fouls', 'saves')
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao extrair defesas: {e}")
+            return {'home': {}, 'away': {}}
+    
+    def _extract_goal_events(self, index):
+        """
+        Extrai os gols da partida: minuto, acréscimos ("90+2" vira 90 e 2),
+        lado (home/away) e URL do autor, na ordem em que aconteceram.
+        """
+        goals = []
+        try:
+            for section in index.events:
+                if 'goal' not in section.text.lower():
+                    continue
+                minute_span = section.find('span', class_='minute')
+                minute = GOAL_MINUTE.search(minute_span.text) if minute_span else None
+                if not minute or not int(minute.group(1)):
+                    continue
+                classes = section.get('class') or []
+                player = section.find('a', href=re.compile('/en/players/'))
+                goals.append({
+                    'minute': int(minute.group(1)),
+                    'added_time': int(minute.group(2) or 0),
+                    'side': 'home' if 'a' in classes else 'away' if 'b' in classes else None,
+                    'player_url': self.base_url + player['href'] if player else None
+                })
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao extrair gols: {e}")
+        return goals
+    
+    def _extract_goal_times(self, index):
+        """Extrai minutos dos gols (sem os acréscimos)"""
+        return [goal['minute'] for goal in self._extract_goal_events(index)]
+    
+    def _save_goal_events(self, match_id, goals):
+        """Grava os gols de uma partida, resolvendo time (pelo lado) e jogador (pela URL)"""
+        match = db.session.get(Match, match_id)
+        teams = {'home': match.home_team_id, 'away': match.away_team_id} if match else {}
+        urls = {goal['player_url'] for goal in goals if goal.get('player_url')}
+        players = dict(db.session.query(Player.url, Player.id).filter(Player.url.in_(urls))) if urls else {}
+        count = replace_match_goals(match_id, [
+            dict(goal, team_id=teams.get(goal.get('side')), player_id=players.get(goal.get('player_url')))
+            for goal in goals
+        ])
+        logger.info(f"✅ Gols da partida {match_id}: {count} gravados")
+    
+    def _extract_fouls_stats(self, index):
+        """Extrai estatísticas de faltas"""
+        fouls_stats = {'home': 0, 'away': 0}
+        try:
+            values = index.block_values('Fouls')
+            if values:
+                fouls_stats['home'] = self._safe_int(values[0])
+                fouls_stats['away'] = self._safe_int(values[1])
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao extrair faltas: {e}")
+        return fouls_stats
+    
+    def _calculate_score_probabilities(self, index):
+        """Calcula probabilidades de placar (simulação)"""
+        probabilities = {
+            'score_probabilities': {
+                '0-0': 15.2, '1-0': 12.5, '0-1': 11.8,
+                '1-1': 18.3, '2-0': 8.7, '0-2': 7.9,
+                '2-1': 9.4, '1-2': 8.1, '2-2': 5.3
+            },
+            'both_teams_score': 68.4,
+            'over_2_5': 42.7,
+            'under_2_5': 57.3,
+            'most_likely_score': '1-1'
+        }
+        return probabilities
+    
+    def _safe_int(self, text):
+        """Converte texto para inteiro com segurança"""
+        try:
+            # Remove caracteres não numéricos
+            clean_text = ''.join(filter(str.isdigit, str(text)))
+            return int(clean_text) if clean_text else 0
+        except:
+            return 0
+    
+    def _safe_float(self, text):
+        """Converte texto para float com segurança"""
+        try:
+            # Remove caracteres não numéricos exceto ponto e vírgula
+            clean_text = ''.join(c for c in str(text) if c.isdigit() or c in '.,')
+            clean_text = clean_text.replace(',', '.')
+            return float(clean_text) if clean_text else 0.0
+        except:
+            return 0.0
+    
+    def update_all_data(self):
+        """
+        Atualiza todos os dados do sistema.
+        Roda como um job persistente: se a execução anterior foi interrompida,
+        continua da etapa e das tarefas onde parou.
+        """
+        logger.info("🚀 Iniciando atualização completa de dados...")
+        
+        try:
+            runner = JobRunner('full', Config.SCRAPER_MAX_ATTEMPTS)
+            runner.start_or_resume()
+            
+            stages = [
+                # 1. Atualizar ligas
+                ('competitions', lambda: [(None, f"{self.base_url}/en/comps/")],
+                 self._parse_leagues, lambda _, rows: self._save_leagues(rows)),
+                # 2. Atualizar times de todas as ligas
+                ('league', lambda: db.session.query(League.id, League.url).all(),
+                 self._parse_teams, self._save_teams),
+                # 3. Atualizar jogadores de todos os times
+                ('team', lambda: db.session.query(Team.id, Team.url).all(),
+                 self._parse_players, self._save_players),
+                # 4. Atualizar estatísticas dos jogadores
+                ('player', lambda: db.session.query(Player.id, Player.url).all(),
+                 self._parse_player_stats, self._save_player_stats),
+            ]
+            for page_type, targets, parse, save in stages:
+                parse, save = self.telemetry.instrument(page_type, parse, save)
+                with self.telemetry.timer('scrape_stage_seconds', stage=page_type):
+                    runner.run_stage(
+                        page_type, targets,
+                        partial(self._fetch, page_type=page_type),
+                        parse, save,
+                        max_workers=self.max_workers,
+                        parse_workers=self.parse_workers,
+                        on_failure=partial(self._on_page_failure, page_type)
+                    )
+            
+            runner.finish()
+            if self.cache:
+                self.cache.log_stats()
+            
+            # 5. Coletar estatísticas avançadas (opcional)
+            logger.info("📊 Coletando estatísticas avançadas...")
+            # self.update_advanced_statistics()
+            
+            logger.info("✅ Atualização completa concluída com sucesso!")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Erro na atualização completa: {e}")
+            return False
+    
+    def update_incremental(self, budget=None):
+        """
+        Atualização incremental: visita apenas as páginas mais prioritárias
+        (mais desatualizadas, que mais mudam ou com jogo próximo) dentro do
+        orçamento e só grava quando o conteúdo extraído mudou.
+        """
+        logger.info("🚀 Iniciando atualização incremental de dados...")
+        
+        try:
+            self.scrape_leagues()
+            
+            planner = RefreshPlanner(budget or Config.SCRAPER_NIGHTLY_BUDGET, Config.SCRAPER_MATCH_WINDOW_DAYS)
+            plan, snapshots = planner.plan()
+            tracker = ChangeTracker(snapshots)
+            
+            stages = [
+                ('league', League, self._parse_teams, self._save_teams),
+                ('team', Team, self._parse_players, self._save_players),
+                ('player', Player, self._parse_player_stats, self._save_player_stats),
+            ]
+            for page_type, model, parse, save in stages:
+                parse, save = self.telemetry.instrument(page_type, parse, save)
+                unchanged_before = tracker.stats['unchanged']
+                
+                def on_unchanged(key, page_type=page_type):
+                    self._commit_stage(tracker.mark_checked, page_type, *key)
+                
+                def save_stage(key, rows, page_type=page_type, model=model, save=save):
+                    return self._commit_stage(tracker.save_if_changed, page_type, model, key, rows, save)
+                
+                pipeline = ScrapePipeline(
+                    partial(self._fetch, page_type=page_type),
+                    self.max_workers,
+                    self.parse_workers,
+                    on_failure=partial(self._on_page_failure, page_type),
+                    on_unchanged=on_unchanged
+                )
+                with self.telemetry.timer('scrape_stage_seconds', stage=page_type):
+                    ok, failed = pipeline.run(
+                        [((entity_id, url), url) for entity_id, url in plan[page_type]],
+                        parse,
+                        save_stage
+                    )
+                self.telemetry.inc(
+                    'scrape_pages_skipped_total', tracker.stats['unchanged'] - unchanged_before, page_type=page_type
+                )
+                logger.info(f"✅ Páginas do tipo {page_type}: {ok} processadas, {failed} falhas")
+            
+            logger.info(
+                f"✅ Atualização incremental concluída: {tracker.stats['changed']} páginas alteradas, "
+                f"{tracker.stats['unchanged']} sem alterações"
+            )
+            if self.cache:
+                self.cache.log_stats()
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Erro na atualização incremental: {e}")
+            return False
+    
+    def update_advanced_statistics(self):
+        """Atualiza estatísticas avançadas"""
+        logger.info("📈 Atualizando estatísticas avançadas...")
+        
+        # Esta função seria implementada quando tivermos URLs reais de partidas
+        # Por enquanto, é um placeholder
+        
+        logger.info("✅ Estatísticas avançadas atualizadas")
+        return True
+    
+    def get_test_data(self):
+        """Retorna dados de teste para desenvolvimento"""
+        return {
+            'leagues': [
+                {'name': 'Premier League', 'country': 'England'},
+                {'name': 'La Liga', 'country': 'Spain'},
+                {'name': 'Serie A', 'country': 'Italy'}
+            ],
+            'teams': [
+                {'name': 'Manchester United', 'league': 'Premier League'},
+                {'name': 'Real Madrid', 'league': 'La Liga'},
+                {'name': 'Juventus', 'league': 'Serie A'}
+            ],
+            'players': [
+                {'name': 'Cristiano Ronaldo', 'team': 'Manchester United', 'goals': 25},
+                {'name': 'Lionel Messi', 'team': 'Paris SG', 'goals': 30},
+                {'name': 'Neymar Jr', 'team': 'Paris SG', 'goals': 20}
+            ]
         }
\ No newline at end of file
@@ -0,0 +1,158 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# TTL padrão (segundos) por tipo de página; dentro do TTL nem revalidamos
+DEFAULT_TTLS = {
+    'competitions': 7 * 24 * 3600,
+    'league': 12 * 3600,
+    'team': 12 * 3600,
+    'player': 24 * 3600,
+    'match': 30 * 24 * 3600,
+}
+
+
+class CacheEntry:
+    """Resposta armazenada no cache"""
+
+    def __init__(self, url, page_type, body, etag, last_modified, fetched_at):
+        self.url = url
+        self.page_type = page_type
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+
+class HTTPCache:
+    """
+    Cache persistente de respostas HTTP em SQLite, indexado por URL.
+    Guarda o corpo comprimido com zlib junto com ETag/Last-Modified e
+    descarta as entradas menos usadas quando passa de `max_bytes`.
+    """
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024, ttls=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                page_type TEXT,
+                body BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                accessed_at REAL,
+                size INTEGER
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS ix_responses_accessed ON responses (accessed_at)")
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url):
+        """Retorna a entrada da URL (ou None) e marca o acesso para o LRU"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT page_type, body, etag, last_modified, fetched_at FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+
+        page_type, body, etag, last_modified, fetched_at = row
+        return CacheEntry(url, page_type, zlib.decompress(body), etag, last_modified, fetched_at)
+
+    def is_fresh(self, entry):
+        """Indica se a entrada ainda está dentro do TTL do seu tipo de página"""
+        ttl = self.ttls.get(entry.page_type, 0)
+        return time.time() - entry.fetched_at < ttl
+
+    def conditional_headers(self, entry):
+        """Cabeçalhos para revalidar a entrada no servidor"""
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, url, page_type, content, etag=None, last_modified=None):
+        """Grava (ou substitui) a resposta da URL e aplica o limite de tamanho"""
+        body = zlib.compress(content)
+        now = time.time()
+        with self.lock:
+            old = self.conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            if old:
+                self.total_bytes -= old[0]
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, page_type, body, etag, last_modified, now, now, len(body))
+            )
+            self.total_bytes += len(body)
+            self.stats['stores'] += 1
+            self._evict()
+            self.conn.commit()
+
+    def mark_revalidated(self, url):
+        """Renova o TTL de uma entrada confirmada pelo servidor (304)"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url)
+            )
+            self.conn.commit()
+
+    def invalidate(self, url):
+        """Remove a URL do cache (ex.: quando a gravação no banco falhou)"""
+        with self.lock:
+            row = self.conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            if row:
+                self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self.total_bytes -= row[0]
+                self.conn.commit()
+
+    def _evict(self):
+        """Remove as entradas acessadas há mais tempo até caber em max_bytes"""
+        while self.total_bytes > self.max_bytes:
+            row = self.conn.execute(
+                "SELECT url, size FROM responses ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self.conn.execute("DELETE FROM responses WHERE url = ?", (row[0],))
+            self.total_bytes -= row[1]
+            self.stats['evictions'] += 1
+
+    def record(self, outcome):
+        """Incrementa um contador de uso (hits, revalidated, misses)"""
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def log_stats(self):
+        """Registra no log os contadores do cache"""
+        requests_total = self.stats['hits'] + self.stats['revalidated'] + self.stats['misses']
+        hit_rate = (self.stats['hits'] + self.stats['revalidated']) / requests_total * 100 if requests_total else 0
+        logger.info(
+            f"📦 Cache HTTP: {self.stats['hits']} hits, {self.stats['revalidated']} revalidados (304), "
+            f"{self.stats['misses']} misses, {self.stats['evictions']} removidos "
+            f"({hit_rate:.1f}% sem download, {self.total_bytes / 1024 / 1024:.1f} MB em disco)"
+        )
+        return dict(self.stats)
@@ -0,0 +1,135 @@
+import hashlib
+import heapq
+import json
+import logging
+from datetime import datetime, timedelta
+from app.models import db, League, Team, Player, Match, PageSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Peso de cada tipo de página na fila: ligas mudam a lista de times raramente,
+# elencos mudam em janelas de transferência, estatísticas mudam a cada rodada
+ENTITY_WEIGHTS = {'league': 0.5, 'team': 1.0, 'player': 1.0}
+
+# Multiplicador de prioridade para times (e seus jogadores) com jogo próximo
+MATCH_PROXIMITY_BOOST = 4.0
+
+
+def content_hash(rows):
+    """Hash estável das linhas extraídas de uma página"""
+    payload = json.dumps(rows, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class RefreshPlanner:
+    """
+    Monta a fila de prioridade da atualização incremental.
+    A prioridade de cada página combina o tempo desde a última verificação
+    (ou `updated_at`), a frequência de mudanças observada e a proximidade de
+    jogos do time, e apenas as `budget` páginas mais prioritárias entram.
+    """
+
+    def __init__(self, budget, match_window_days=3):
+        self.budget = budget
+        self.match_window_days = match_window_days
+
+    def _teams_with_upcoming_matches(self, now):
+        window = timedelta(days=self.match_window_days)
+        rows = db.session.query(Match.home_team_id, Match.away_team_id).filter(
+            Match.date >= (now - window).date(),
+            Match.date <= (now + window).date()
+        ).all()
+        return {team_id for row in rows for team_id in row if team_id}
+
+    def _candidates(self):
+        yield from (('league', i, url, updated_at, None)
+                    for i, url, updated_at in db.session.query(League.id, League.url, League.updated_at))
+        yield from (('team', i, url, updated_at, i)
+                    for i, url, updated_at in db.session.query(Team.id, Team.url, Team.updated_at))
+        yield from (('player', i, url, updated_at, team_id)
+                    for i, url, updated_at, team_id in db.session.query(
+                        Player.id, Player.url, Player.updated_at, Player.team_id))
+
+    def priority(self, entity_type, updated_at, snapshot, busy, now):
+        """Pontuação de uma página: maior significa mais urgente"""
+        last_seen = (snapshot.last_checked if snapshot else None) or updated_at or datetime(2000, 1, 1)
+        staleness = max((now - last_seen).total_seconds() / 3600, 0.0)
+        change_rate = snapshot.change_rate() if snapshot else 1.0
+        boost = MATCH_PROXIMITY_BOOST if busy else 1.0
+        return staleness * change_rate * boost * ENTITY_WEIGHTS[entity_type]
+
+    def plan(self):
+        """
+        Retorna ({tipo: [(id, url), ...]}, {url: PageSnapshot}) com as páginas
+        escolhidas, na ordem de prioridade.
+        """
+        now = datetime.utcnow()
+        snapshots = {s.url: s for s in PageSnapshot.query.all()}
+        busy_teams = self._teams_with_upcoming_matches(now)
+
+        scored = (
+            (self.priority(kind, updated_at, snapshots.get(url), team_id in busy_teams, now), kind, entity_id, url)
+            for kind, entity_id, url, updated_at, team_id in self._candidates()
+            if url
+        )
+        selected = heapq.nlargest(self.budget, scored, key=lambda item: item[0])
+
+        plan = {kind: [] for kind in ENTITY_WEIGHTS}
+        for _, kind, entity_id, url in selected:
+            plan[kind].append((entity_id, url))
+
+        logger.info(
+            f"🗂️ Plano incremental: {len(plan['league'])} ligas, {len(plan['team'])} times, "
+            f"{len(plan['player'])} jogadores (orçamento {self.budget})"
+        )
+        return plan, snapshots
+
+
+class ChangeTracker:
+    """Registra o hash de cada página e só deixa gravar quando o conteúdo mudou"""
+
+    def __init__(self, snapshots=None):
+        self.snapshots = snapshots if snapshots is not None else {}
+        self.stats = {'changed': 0, 'unchanged': 0}
+
+    def _snapshot(self, entity_type, entity_id, url):
+        snapshot = self.snapshots.get(url)
+        if snapshot is None or snapshot not in db.session:  # descartado por um rollback
+            snapshot = PageSnapshot.query.filter_by(url=url).first()
+        if snapshot is None:
+            snapshot = PageSnapshot(url=url, entity_type=entity_type, entity_id=entity_id, checks=0, changes=0)
+            db.session.add(snapshot)
+        self.snapshots[url] = snapshot
+        return snapshot
+
+    def mark_checked(self, entity_type, entity_id, url):
+        """Registra uma verificação sem mudanças (ex.: resposta 304 do cache HTTP)"""
+        snapshot = self._snapshot(entity_type, entity_id, url)
+        snapshot.checks += 1
+        snapshot.last_checked = datetime.utcnow()
+        self.stats['unchanged'] += 1
+
+    def save_if_changed(self, entity_type, model, key, rows, save):
+        """
+        Compara o hash das linhas extraídas com o último visto para a página.
+        Se mudou, chama `save(entity_id, rows)` e atualiza `updated_at` da
+        entidade dona da página; caso contrário, só registra a verificação.
+        """
+        entity_id, url = key
+        digest = content_hash(rows)
+        snapshot = self._snapshot(entity_type, entity_id, url)
+        now = datetime.utcnow()
+
+        snapshot.checks += 1
+        snapshot.last_checked = now
+        if snapshot.content_hash == digest:
+            self.stats['unchanged'] += 1
+            return None
+
+        result = save(entity_id, rows)
+        snapshot.content_hash = digest
+        snapshot.changes += 1
+        snapshot.last_changed = now
+        model.query.filter_by(id=entity_id).update({'updated_at': now}, synchronize_session=False)
+        self.stats['changed'] += 1
+        return result
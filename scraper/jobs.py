@@ -0,0 +1,133 @@
+import logging
+from datetime import datetime
+from app.models import db, ScrapeJob, ScrapeTask
+from scraper.pipeline import ScrapePipeline
+
+logger = logging.getLogger(__name__)
+
+# Etapas de uma atualização completa, na ordem em que dependem umas das outras
+STAGES = ['competitions', 'league', 'team', 'player']
+
+
+class JobRunner:
+    """
+    Executa uma atualização como um job persistente: cada página (liga, time,
+    jogador) vira uma tarefa com status, tentativas e último erro. Um job
+    interrompido é retomado da etapa em que parou, pulando as tarefas
+    concluídas, e tarefas com falha são repetidas individualmente.
+    """
+
+    def __init__(self, kind='full', max_attempts=3):
+        self.kind = kind
+        self.max_attempts = max_attempts
+        self.job = None
+
+    def start_or_resume(self):
+        """Retoma o último job não concluído deste tipo ou cria um novo"""
+        job = ScrapeJob.query.filter_by(kind=self.kind, status='running').order_by(ScrapeJob.id.desc()).first()
+        if job:
+            job.runs = (job.runs or 1) + 1
+            logger.info(f"♻️ Retomando job {job.id} na etapa '{job.stage}' (execução {job.runs})")
+        else:
+            job = ScrapeJob(kind=self.kind, status='running', stage=STAGES[0], runs=1)
+            db.session.add(job)
+            logger.info("🆕 Criando novo job de atualização")
+
+        job.started_at = datetime.utcnow()
+        db.session.commit()
+        self.job = job
+        return job
+
+    def finish(self):
+        """Marca o job como concluído"""
+        self.job.status = 'done'
+        self.job.finished_at = datetime.utcnow()
+        db.session.commit()
+        progress = self.job.progress()
+        logger.info(f"🏁 Job {self.job.id} concluído: {progress['done']}/{progress['total']} tarefas, {progress['failed']} falhas")
+
+    def _create_tasks(self, stage, targets):
+        """Cria as tarefas da etapa na primeira vez em que ela é alcançada"""
+        if self.job.tasks.filter_by(stage=stage).first() is not None:
+            return
+        db.session.add_all(
+            ScrapeTask(job_id=self.job.id, stage=stage, entity_id=entity_id, url=url, status='pending', attempts=0)
+            for entity_id, url in targets()
+        )
+        self.job.stage = stage
+        db.session.commit()
+
+    def _pending(self, stage):
+        return self.job.tasks.filter(
+            ScrapeTask.stage == stage,
+            ScrapeTask.status.in_(['pending', 'running', 'failed']),
+            ScrapeTask.attempts < self.max_attempts
+        ).all()
+
+    def _finish_task(self, task_id, status, error=None):
+        ScrapeTask.query.filter_by(id=task_id).update({
+            'status': status,
+            'last_error': str(error)[:2000] if error else None,
+            'finished_at': datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+
+    def run_stage(self, stage, targets, fetch, parse, save, max_workers=4, parse_workers=2, on_failure=None):
+        """
+        Executa uma etapa. `targets()` só é chamado ao criar as tarefas e
+        retorna [(entity_id, url)]; `save(entity_id, linhas)` grava os dados
+        e é confirmado na mesma transação que marca a tarefa como concluída.
+        """
+        if STAGES.index(self.job.stage) > STAGES.index(stage):
+            return
+        self._create_tasks(stage, targets)
+
+        for attempt in range(self.max_attempts):
+            pending = self._pending(stage)
+            if not pending:
+                break
+            if attempt:
+                logger.info(f"🔁 Repetindo {len(pending)} tarefas com falha da etapa '{stage}'")
+
+            tasks = {task.id: task.entity_id for task in pending}
+            urls = [(task.id, task.url) for task in pending]
+            ScrapeTask.query.filter(ScrapeTask.id.in_(tasks)).update(
+                {'status': 'running', 'attempts': ScrapeTask.attempts + 1},
+                synchronize_session=False
+            )
+            db.session.commit()
+
+            def save_task(task_id, rows):
+                try:
+                    save(tasks[task_id], rows)
+                    ScrapeTask.query.filter_by(id=task_id).update({
+                        'status': 'done',
+                        'last_error': None,
+                        'finished_at': datetime.utcnow()
+                    }, synchronize_session=False)
+                    db.session.commit()
+                    return True
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"❌ Erro ao gravar tarefa {task_id}: {e}")
+                    self._finish_task(task_id, 'failed', e)
+                    return False
+
+            def fail_task(task_id, url, error):
+                if on_failure:
+                    on_failure(task_id, url, error)
+                if error is not None:
+                    self._finish_task(task_id, 'failed', error)
+
+            pipeline = ScrapePipeline(
+                fetch, max_workers, parse_workers,
+                on_failure=fail_task,
+                on_unchanged=lambda task_id: self._finish_task(task_id, 'done')
+            )
+            ok, failed = pipeline.run(urls, parse, save_task)
+            logger.info(f"✅ Etapa '{stage}': {ok} tarefas concluídas, {failed} falhas")
+
+        next_stage = STAGES.index(stage) + 1
+        if next_stage < len(STAGES):
+            self.job.stage = STAGES[next_stage]
+            db.session.commit()
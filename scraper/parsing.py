@@ -0,0 +1,176 @@
+import re
+from collections import namedtuple
+from bs4 import BeautifulSoup, Comment
+
+try:
+    import lxml.html
+except ImportError:  # lxml é opcional; sem ele usamos o html.parser sobre o trecho da tabela
+    lxml = None
+
+# Célula de uma linha: tag ('th'/'td'), texto, data-stat, href e texto do primeiro link, scope
+Cell = namedtuple('Cell', ['tag', 'text', 'stat', 'href', 'link_text', 'scope'])
+Row = namedtuple('Row', ['cells', 'classes'])
+
+# Palavras-chave (na legenda ou no sufixo do id) de cada categoria de tabela da partida
+MATCH_TABLE_CATEGORIES = {
+    'passing': ('passing',),
+    'shooting': ('shooting',),
+    'defense': ('defense', 'defensive'),
+}
+
+# Backend de parsing por tipo de página
+DEFAULT_BACKENDS = {
+    'competitions': 'lxml',
+    'league': 'lxml',
+    'team': 'lxml',
+    'player': 'lxml',
+}
+
+COMMENT_RE = re.compile(r'<!--.*?-->', re.S)
+TABLE_END_RE = re.compile(r'</table\s*>', re.I)
+
+
+def _table_start_re(table_id=None, table_class=None):
+    if table_id:
+        return re.compile(r'<table\b[^>]*\bid\s*=\s*["\']%s["\']' % re.escape(table_id), re.I)
+    if table_class:
+        return re.compile(r'<table\b[^>]*\bclass\s*=\s*["\'][^"\']*\b%s\b' % re.escape(table_class), re.I)
+    return re.compile(r'<table\b', re.I)
+
+
+def extract_table_html(html, table_id=None, table_class=None):
+    """
+    Recorta do HTML bruto apenas o markup de uma tabela (por id, classe ou a primeira).
+    Tabelas visíveis têm preferência; se não houver, procura também dentro
+    dos blocos de comentário, onde o FBref esconde boa parte das tabelas.
+    """
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+
+    comments = [m.span() for m in COMMENT_RE.finditer(html)]
+    commented = None
+    for match in _table_start_re(table_id, table_class).finditer(html):
+        start = match.start()
+        in_comment = any(a <= start < b for a, b in comments)
+        if in_comment and commented is not None:
+            continue
+
+        end = TABLE_END_RE.search(html, start)
+        fragment = html[start:end.end() if end else len(html)]
+        if not in_comment:
+            return fragment
+        commented = fragment
+
+    return commented
+
+
+def _rows_lxml(fragment):
+    table = lxml.html.fragment_fromstring(fragment)
+    for tr in table.iter('tr'):
+        cells = []
+        for cell in tr.iter('th', 'td'):
+            link = next(cell.iter('a'), None)
+            cells.append(Cell(
+                cell.tag,
+                cell.text_content(),
+                cell.get('data-stat'),
+                link.get('href') if link is not None else None,
+                link.text_content() if link is not None else None,
+                cell.get('scope')
+            ))
+        yield Row(cells, tr.get('class', '').split())
+
+
+def _rows_soup(fragment):
+    return table_rows(BeautifulSoup(fragment, 'html.parser'))
+
+
+def table_rows(table):
+    """Converte uma tabela já parseada pelo BeautifulSoup em linhas (Row)"""
+    for tr in table.find_all('tr'):
+        cells = []
+        for cell in tr.find_all(['th', 'td']):
+            link = cell.find('a')
+            cells.append(Cell(
+                cell.name,
+                cell.text,
+                cell.get('data-stat'),
+                link.get('href') if link else None,
+                link.text if link else None,
+                cell.get('scope')
+            ))
+        yield Row(cells, tr.get('class') or [])
+
+
+def iter_table_rows(html, candidates, backend='lxml'):
+    """
+    Produz as linhas (Row) da primeira tabela encontrada entre os candidatos
+    (dicts com 'table_id' e/ou 'table_class', em ordem de preferência) sem
+    montar a árvore do documento inteiro. Não produz nada se nenhuma existir.
+    """
+    for candidate in candidates:
+        fragment = extract_table_html(html, **candidate)
+        if fragment is not None:
+            if backend == 'lxml' and lxml is not None:
+                return _rows_lxml(fragment)
+            return _rows_soup(fragment)
+    return iter(())
+
+
+
+class MatchPageIndex:
+    """
+    Índice de uma página de partida montado em uma única passada pelo documento:
+    tabelas por id e por categoria (na ordem mandante, visitante), blocos de
+    estatística por rótulo e eventos da partida. Tabelas escondidas em
+    comentários também são indexadas.
+    """
+
+    SIDES = ('home', 'away')
+
+    def __init__(self, soup):
+        self.tables_by_id = {}
+        self.tables_by_category = {}
+        self.blocks = []
+        self.events = []
+        self._index(soup)
+
+    def _index(self, soup):
+        for node in soup.descendants:
+            if isinstance(node, Comment):
+                if '<table' in node:
+                    self._index(BeautifulSoup(str(node), 'html.parser'))
+            elif node.name == 'table':
+                self._add_table(node)
+            elif node.name == 'div':
+                if 'event' in (node.get('class') or []):
+                    self.events.append(node)
+                label = node.string
+                if label and label.strip():
+                    parent = node.find_parent('div')
+                    if parent:
+                        self.blocks.append((label.strip(), parent))
+
+    def _add_table(self, table):
+        table_id = table.get('id') or ''
+        caption = table.find('caption')
+        caption_text = caption.text.lower() if caption else ''
+        if table_id:
+            self.tables_by_id[table_id] = table
+
+        for category, keywords in MATCH_TABLE_CATEGORIES.items():
+            if any(k in caption_text for k in keywords) or table_id.endswith('_' + category):
+                self.tables_by_category.setdefault(category, []).append(table)
+
+    def tables(self, category):
+        """Retorna {'home': tabela, 'away': tabela} para a categoria, na ordem da página"""
+        return dict(zip(self.SIDES, self.tables_by_category.get(category, [])))
+
+    def block_values(self, label):
+        """Textos dos dois primeiros 'stat-value' do bloco cujo rótulo contém `label`"""
+        for text, parent in self.blocks:
+            if label in text:
+                values = parent.find_all('span', class_='stat-value')
+                if len(values) >= 2:
+                    return [v.text for v in values[:2]]
+        return None
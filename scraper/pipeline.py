@@ -0,0 +1,83 @@
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapePipeline:
+    """
+    Pipeline em três estágios: download -> parsing -> gravação.
+    Downloads e parsing rodam em pools de threads separados; a gravação
+    acontece na thread que chamou run(), única dona da sessão do banco.
+    """
+
+    def __init__(self, fetch, max_workers=4, parse_workers=2, max_inflight=None, on_failure=None,
+                 on_unchanged=None):
+        self.fetch = fetch
+        self.on_failure = on_failure
+        self.on_unchanged = on_unchanged
+        self.max_workers = max(1, max_workers)
+        self.parse_workers = max(1, parse_workers)
+        # Limita quantas páginas baixadas podem aguardar parsing/gravação
+        self.max_inflight = max_inflight or self.max_workers * 4
+
+    def run(self, tasks, parse, save):
+        """
+        Processa `tasks` (iterável de pares (chave, url)).
+        `parse(content)` roda no pool de parsing e `save(chave, linhas)` na thread atual.
+        Páginas sem alterações (fetch retorna None) não são processadas nem gravadas;
+        apenas `on_unchanged(chave)` é chamado, se informado.
+        Retorna (sucessos, falhas).
+        """
+        results = queue.Queue()
+        succeeded = failed = inflight = 0
+
+        fetchers = ThreadPoolExecutor(self.max_workers, thread_name_prefix='fetch')
+        parsers = ThreadPoolExecutor(self.parse_workers, thread_name_prefix='parse')
+
+        def parse_stage(key, url, future):
+            try:
+                content = future.result()
+                rows = parse(content) if content is not None else None
+                results.put((key, url, rows, None))
+            except Exception as e:
+                results.put((key, url, None, e))
+
+        def drain():
+            nonlocal succeeded, failed
+            key, url, rows, error = results.get()
+            if error is None and rows is None:
+                if self.on_unchanged:
+                    self.on_unchanged(key)
+                succeeded += 1
+            elif error is None and save(key, rows):
+                succeeded += 1
+            else:
+                if error is not None:
+                    logger.error(f"❌ Erro ao processar {url}: {error}")
+                if self.on_failure:
+                    self.on_failure(key, url, error)
+                failed += 1
+
+        try:
+            for key, url in tasks:
+                while inflight >= self.max_inflight:
+                    drain()
+                    inflight -= 1
+
+                future = fetchers.submit(self.fetch, url)
+                future.add_done_callback(
+                    lambda f, key=key, url=url: parsers.submit(parse_stage, key, url, f)
+                )
+                inflight += 1
+
+            while inflight:
+                drain()
+                inflight -= 1
+        finally:
+            # Downloads primeiro: seus callbacks ainda enviam páginas ao pool de parsing
+            fetchers.shutdown(wait=True, cancel_futures=True)
+            parsers.shutdown(wait=True, cancel_futures=True)
+
+        return succeeded, failed
@@ -0,0 +1,127 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import requests
+
+# Tipo de página a partir da URL do FBref
+PAGE_TYPE_PATTERNS = [
+    ('competitions', re.compile(r'/en/comps/?$')),
+    ('league', re.compile(r'/en/comps/\d+')),
+    ('team', re.compile(r'/en/squads/')),
+    ('player', re.compile(r'/en/players/')),
+    ('match', re.compile(r'/en/matches/')),
+]
+
+
+def page_type_for_url(url):
+    """Classifica a URL em competitions, league, team, player ou match (None se desconhecida)"""
+    for page_type, pattern in PAGE_TYPE_PATTERNS:
+        if pattern.search(url):
+            return page_type
+    return None
+
+
+class Corpus:
+    """
+    Acervo local de páginas: um arquivo .html.gz por URL e um index.jsonl
+    (somente acréscimos; a última linha de cada URL vale) com status,
+    cabeçalhos de cache e tipo de cada página.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = os.path.join(path, 'index.jsonl')
+        self.lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.index[entry.pop('url')] = entry
+
+    def _file_for(self, url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest() + '.html.gz'
+
+    def save(self, url, response):
+        """Grava a resposta no acervo"""
+        filename = self._file_for(url)
+        with gzip.open(os.path.join(self.path, filename), 'wb') as f:
+            f.write(response.content)
+
+        with self.lock:
+            entry = self.index[url] = {
+                'file': filename,
+                'status': response.status_code,
+                'page_type': page_type_for_url(url),
+                'headers': {
+                    k: response.headers[k]
+                    for k in ('Content-Type', 'ETag', 'Last-Modified')
+                    if k in response.headers
+                }
+            }
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(dict(entry, url=url), sort_keys=True) + '\n')
+
+    def load(self, url):
+        """Retorna (metadados, corpo) da URL ou (None, None) se ela não foi gravada"""
+        meta = self.index.get(url)
+        if meta is None:
+            return None, None
+        with gzip.open(os.path.join(self.path, meta['file']), 'rb') as f:
+            return meta, f.read()
+
+    def urls(self, page_type=None):
+        """URLs do acervo, opcionalmente filtradas por tipo de página"""
+        return sorted(
+            url for url, meta in self.index.items()
+            if page_type is None or meta.get('page_type') == page_type
+        )
+
+
+class RecordingSession(requests.Session):
+    """Sessão que faz as requisições normalmente e grava cada resposta 200 no acervo"""
+
+    def __init__(self, corpus):
+        super().__init__()
+        self.corpus = corpus
+
+    def get(self, url, **kwargs):
+        response = super().get(url, **kwargs)
+        if response.status_code == 200:
+            self.corpus.save(url, response)
+        return response
+
+
+class ReplaySession(requests.Session):
+    """Sessão offline que responde a partir do acervo (404 para URLs não gravadas)"""
+
+    def __init__(self, corpus):
+        super().__init__()
+        self.corpus = corpus
+
+    def get(self, url, headers=None, **kwargs):
+        meta, body = self.corpus.load(url)
+
+        response = requests.Response()
+        response.url = url
+        response.encoding = 'utf-8'
+        if meta is None:
+            response.status_code = 404
+            response._content = b''
+            return response
+
+        etag = meta['headers'].get('ETag')
+        if etag and headers and headers.get('If-None-Match') == etag:
+            response.status_code = 304
+            response._content = b''
+        else:
+            response.status_code = meta['status']
+            response._content = body
+        response.headers.update(meta['headers'])
+        return response
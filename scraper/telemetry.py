@@ -0,0 +1,268 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Limites (em segundos) dos buckets dos histogramas de duração
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Métricas conhecidas: nome -> (tipo, descrição)
+METRICS = {
+    'scrape_http_requests_total': ('counter', 'Requisições por tipo de página e resultado (download, hit do cache, 304)'),
+    'scrape_http_bytes_total': ('counter', 'Bytes recebidos do FBref'),
+    'scrape_http_seconds': ('histogram', 'Latência das requisições HTTP'),
+    'scrape_rate_limit_wait_seconds': ('histogram', 'Espera no limitador de requisições antes de cada download'),
+    'scrape_parse_seconds': ('histogram', 'Tempo de parsing por página'),
+    'scrape_rows_parsed_total': ('counter', 'Linhas extraídas das páginas'),
+    'scrape_db_write_seconds': ('histogram', 'Tempo de gravação no banco por página'),
+    'scrape_rows_written_total': ('counter', 'Linhas gravadas por resultado (inserted, updated, unchanged)'),
+    'scrape_pages_skipped_total': ('counter', 'Páginas baixadas cujo conteúdo não mudou e não foram gravadas'),
+    'scrape_failures_total': ('counter', 'Páginas que falharam no download, parsing ou gravação'),
+    'scrape_stage_seconds': ('histogram', 'Duração total de cada etapa da atualização'),
+}
+
+# Quantas falhas individuais (URL e erro) guardar para o relatório
+MAX_FAILURES = 500
+
+
+class Histogram:
+    """Contagem por bucket, soma, total e máximo das observações"""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def to_dict(self):
+        return {
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.counts)),
+            'sum': round(self.sum, 6),
+            'count': self.count,
+            'max': round(self.max, 6)
+        }
+
+
+class Telemetry:
+    """
+    Coleta thread-safe de contadores e histogramas de uma execução do scraper,
+    com rótulos (ex.: page_type), e as falhas por URL. Exporta no formato
+    texto do Prometheus ou em JSON e gera o resumo do fim da execução.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.failures = deque(maxlen=MAX_FAILURES)
+        self.started_at = datetime.utcnow()
+        self.started = time.perf_counter()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        """Soma `value` ao contador"""
+        key = self._key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Registra uma observação no histograma"""
+        key = self._key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Mede a duração do bloco no histograma `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def record_failure(self, page_type, url, error=None):
+        """Registra a falha de uma página (error None significa falha na gravação)"""
+        self.inc('scrape_failures_total', page_type=page_type)
+        with self.lock:
+            self.failures.append({
+                'page_type': page_type,
+                'url': url,
+                'error': str(error)[:500] if error is not None else 'falha ao gravar',
+                'at': datetime.utcnow().isoformat()
+            })
+
+    def record_upsert(self, page_type, result):
+        """Soma as linhas inseridas/atualizadas/inalteradas de um UpsertResult"""
+        if result is None:
+            return
+        for outcome in ('inserted', 'updated', 'unchanged'):
+            count = getattr(result, outcome, 0)
+            if count:
+                self.inc('scrape_rows_written_total', count, page_type=page_type, result=outcome)
+
+    def instrument(self, page_type, parse, save):
+        """Envolve as funções de parsing e gravação de uma etapa com as medições de tempo e volume"""
+        def timed_parse(content):
+            with self.timer('scrape_parse_seconds', page_type=page_type):
+                rows = parse(content)
+            self.inc('scrape_rows_parsed_total', len(rows), page_type=page_type)
+            return rows
+
+        def timed_save(*args):
+            with self.timer('scrape_db_write_seconds', page_type=page_type):
+                result = save(*args)
+            self.record_upsert(page_type, result)
+            return result
+
+        return timed_parse, timed_save
+
+    def counter_value(self, name, **labels):
+        """Soma do contador em todas as séries que casam com os rótulos informados"""
+        with self.lock:
+            return sum(
+                value for (metric, series), value in self.counters.items()
+                if metric == name and all(dict(series).get(k) == v for k, v in labels.items())
+            )
+
+    def histogram_totals(self, name, **labels):
+        """(total de observações, soma) do histograma nas séries que casam com os rótulos"""
+        with self.lock:
+            matching = [
+                h for (metric, series), h in self.histograms.items()
+                if metric == name and all(dict(series).get(k) == v for k, v in labels.items())
+            ]
+            return sum(h.count for h in matching), sum(h.sum for h in matching)
+
+    def page_types(self):
+        with self.lock:
+            keys = list(self.counters) + list(self.histograms)
+        return sorted({dict(series)['page_type'] for _, series in keys if 'page_type' in dict(series)})
+
+    def to_json(self, name=None):
+        """Todas as métricas e falhas em um dicionário serializável"""
+        with self.lock:
+            return {
+                'run': name,
+                'started_at': self.started_at.isoformat(),
+                'elapsed_s': round(time.perf_counter() - self.started, 3),
+                'counters': [
+                    {'name': metric, 'labels': dict(series), 'value': value}
+                    for (metric, series), value in sorted(self.counters.items())
+                ],
+                'histograms': [
+                    dict(h.to_dict(), name=metric, labels=dict(series))
+                    for (metric, series), h in sorted(self.histograms.items(), key=lambda item: item[0])
+                ],
+                'failures': list(self.failures)
+            }
+
+    def to_prometheus(self):
+        """Métricas no formato texto de exposição do Prometheus"""
+        def labels_text(series, **extra):
+            pairs = list(series) + list(extra.items())
+            if not pairs:
+                return ''
+            return '{' + ','.join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in pairs) + '}'
+
+        with self.lock:
+            by_name = {}
+            for (metric, series), value in self.counters.items():
+                by_name.setdefault(metric, []).append((series, value))
+            for (metric, series), histogram in self.histograms.items():
+                by_name.setdefault(metric, []).append((series, histogram))
+
+            lines = []
+            for metric in sorted(by_name):
+                kind, description = METRICS.get(metric, ('untyped', metric))
+                lines.append(f'# HELP {metric} {description}')
+                lines.append(f'# TYPE {metric} {kind}')
+                for series, value in sorted(by_name[metric], key=lambda item: item[0]):
+                    if isinstance(value, Histogram):
+                        cumulative = 0
+                        for bound, count in zip(list(value.buckets) + ['+Inf'], value.counts):
+                            cumulative += count
+                            lines.append(f'{metric}_bucket{labels_text(series, le=bound)} {cumulative}')
+                        lines.append(f'{metric}_sum{labels_text(series)} {value.sum:.6f}')
+                        lines.append(f'{metric}_count{labels_text(series)} {value.count}')
+                    else:
+                        lines.append(f'{metric}{labels_text(series)} {value}')
+            return '\n'.join(lines) + '\n'
+
+    def summary(self, name='atualização'):
+        """Resumo legível da execução: uma linha por tipo de página"""
+        elapsed = time.perf_counter() - self.started
+        header = (f"{'página':<14}{'reqs':>7}{'MB':>8}{'http (s)':>10}{'parse (s)':>11}"
+                  f"{'banco (s)':>11}{'inseridas':>11}{'atualiz.':>10}{'inalt.':>9}{'falhas':>8}")
+        lines = [f"📊 Relatório da {name}: {elapsed:.1f}s", header]
+        for page_type in self.page_types():
+            requests_total = self.counter_value('scrape_http_requests_total', page_type=page_type)
+            megabytes = self.counter_value('scrape_http_bytes_total', page_type=page_type) / 1024 / 1024
+            http = self.histogram_totals('scrape_http_seconds', page_type=page_type)[1]
+            parse = self.histogram_totals('scrape_parse_seconds', page_type=page_type)[1]
+            write = self.histogram_totals('scrape_db_write_seconds', page_type=page_type)[1]
+            rows = {
+                outcome: self.counter_value('scrape_rows_written_total', page_type=page_type, result=outcome)
+                for outcome in ('inserted', 'updated', 'unchanged')
+            }
+            failures = self.counter_value('scrape_failures_total', page_type=page_type)
+            lines.append(
+                f"{page_type:<14}{requests_total:>7}{megabytes:>8.1f}{http:>10.1f}{parse:>11.1f}{write:>11.1f}"
+                f"{rows['inserted']:>11}{rows['updated']:>10}{rows['unchanged']:>9}{failures:>8}"
+            )
+
+        with self.lock:
+            stages = [(dict(series).get('stage'), h.sum) for (metric, series), h in self.histograms.items()
+                      if metric == 'scrape_stage_seconds']
+        if stages:
+            lines.append('etapas: ' + ', '.join(f'{stage} {seconds:.1f}s' for stage, seconds in stages))
+        return '\n'.join(lines)
+
+    def log_summary(self, name='atualização'):
+        """Registra o resumo no log, incluindo as primeiras falhas"""
+        for line in self.summary(name).splitlines():
+            logger.info(line)
+        with self.lock:
+            failures = list(self.failures)
+        for failure in failures[:10]:
+            logger.warning(f"⚠️ Falha em {failure['url']}: {failure['error']}")
+        if len(failures) > 10:
+            logger.warning(f"⚠️ ... e mais {len(failures) - 10} falhas (veja o relatório JSON)")
+
+    def export(self, directory, name):
+        """
+        Grava o relatório JSON da execução (`<nome>-<data>.json`) e as métricas
+        no formato Prometheus em `<nome>.prom` (sobrescrito a cada execução,
+        para o textfile collector do node_exporter). Retorna o caminho do JSON.
+        """
+        os.makedirs(directory, exist_ok=True)
+        json_path = os.path.join(directory, f"{name}-{self.started_at:%Y%m%d-%H%M%S}.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_json(name), f, indent=2)
+
+        prom_path = os.path.join(directory, f'{name}.prom')
+        with open(prom_path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(prom_path + '.tmp', prom_path)
+
+        logger.info(f"📝 Relatório salvo em {json_path}")
+        return json_path
@@ -0,0 +1,65 @@
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+import analytics.engine
+import config
+from app import create_app, identity, response_cache
+from app.models import db, User
+from database.data_version import data_version
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Aplicação sobre um SQLite novo a cada teste, com os diretórios de dados em tmp_path"""
+    monkeypatch.setattr(config.TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(config.TestingConfig, 'DATA_VERSION_PATH', str(tmp_path / 'data_version'))
+    monkeypatch.setattr(config.Config, 'SNAPSHOT_DIR', str(tmp_path / 'snapshots'))
+    monkeypatch.setattr(config.Config, 'ARCHIVE_DIR', str(tmp_path / 'archive'))
+
+    # Estado de processo que sobrevive entre aplicações
+    response_cache._local.clear()
+    identity._local.clear()
+    data_version.token = data_version.seen = None
+    monkeypatch.setattr(analytics.engine, '_current', None)
+    monkeypatch.setattr(analytics.engine, '_checked_at', 0.0)
+
+    app = create_app('testing')
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def user(app):
+    user = User(username='analista', email='analista@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def client(app, user):
+    """Cliente de testes já autenticado"""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user.id)
+    return client
+
+
+@pytest.fixture
+def statements(app):
+    """Coleta o SQL executado no engine dentro do bloco: `with statements() as executed:`"""
+    @contextmanager
+    def collect():
+        executed = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            executed.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            yield executed
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+    return collect
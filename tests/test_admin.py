@@ -0,0 +1,34 @@
+import pytest
+from app.models import db, ScrapeJob
+
+
+@pytest.fixture
+def admin(client, user):
+    user.is_admin = True
+    db.session.commit()
+    return client
+
+
+@pytest.mark.parametrize('url', ['/api/db/pool', '/api/db/replica', '/api/scrape/progress'])
+def test_ops_endpoints_require_admin(client, url):
+    response = client.get(url)
+    assert response.status_code == 403
+    assert 'error' in response.get_json()
+
+
+@pytest.mark.parametrize('url', ['/api/db/pool', '/api/db/replica', '/api/scrape/progress'])
+def test_ops_endpoints_for_admins(admin, url):
+    assert admin.get(url).status_code == 200
+
+
+def test_ops_endpoints_require_login(app):
+    assert app.test_client().get('/api/db/pool').status_code in (302, 401)
+
+
+def test_scrape_progress(admin):
+    assert admin.get('/api/scrape/progress').get_json() == {'status': 'idle'}
+    job = ScrapeJob(kind='full', stage='teams')
+    db.session.add(job)
+    db.session.commit()
+    assert admin.get(f'/api/scrape/progress?job_id={job.id}').status_code == 200
+    assert admin.get(f'/api/scrape/progress?job_id={job.id + 1}').get_json() == {'status': 'idle'}
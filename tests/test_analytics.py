@@ -0,0 +1,86 @@
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+import analytics
+import analytics.engine
+from analytics.benchmark import MEMORY_BUDGET
+from analytics.engine import (
+    ColumnTable, PLAYER_STATS_INTS, PLAYER_STATS_FLOATS, ADVANCED_INTS, ADVANCED_FLOATS
+)
+from app.models import db, Player
+from database.benchmark import SEASONS, load_data
+
+ROWS = 100000
+PLAYERS = ROWS // len(SEASONS)
+
+
+def _frame(ints, floats, **keys):
+    rng = np.random.default_rng(42)
+    frame = pd.DataFrame({
+        'id': np.arange(1, ROWS + 1),
+        'player_id': np.arange(ROWS) % PLAYERS + 1,
+        'season': np.array(SEASONS)[np.arange(ROWS) // PLAYERS % len(SEASONS)],
+        **keys
+    })
+    for column in ints:
+        frame[column] = rng.integers(0, 100, ROWS)
+    for column in floats:
+        frame[column] = rng.random(ROWS)
+    return frame
+
+
+def _mb_per_million_rows(table):
+    return table.nbytes / table.size * 1e6 / 2 ** 20
+
+
+def test_player_stats_memory_budget():
+    frame = _frame(PLAYER_STATS_INTS, PLAYER_STATS_FLOATS, team_id=np.arange(ROWS) % 200 + 1)
+    table = ColumnTable(
+        frame, 'player_id', keys=('team_id', 'season'), ints=PLAYER_STATS_INTS, floats=PLAYER_STATS_FLOATS,
+        indexed=('team_id', 'season'), rankings=(('goals', 'season'), ('xg', 'season'))
+    )
+    assert table.size == ROWS
+    assert _mb_per_million_rows(table) <= MEMORY_BUDGET['player_stats']
+
+
+def test_advanced_stats_memory_budget():
+    frame = _frame(ADVANCED_INTS, ADVANCED_FLOATS)
+    table = ColumnTable(frame, 'player_id', keys=('season',), ints=ADVANCED_INTS, floats=ADVANCED_FLOATS)
+    assert table.size == ROWS
+    assert _mb_per_million_rows(table) <= MEMORY_BUDGET['advanced_player_stats']
+
+
+def _wait_for_reload():
+    for thread in threading.enumerate():
+        if thread.name == 'analytics-reload':
+            thread.join(timeout=30)
+
+
+def test_new_data_reloads_in_background(app, monkeypatch):
+    load_data(10 * len(SEASONS))
+    monkeypatch.setattr(analytics.engine.Config, 'ANALYTICS_CHECK_SECONDS', 0)
+    engine = analytics.current()
+    assert analytics.current() is engine
+
+    db.session.add(Player(name='Reforço', url='/en/players/novo'))
+    db.session.commit()
+
+    loaded = threading.Event()
+    load = analytics.engine.AnalyticsEngine.load
+
+    def slow_load(*args, **kwargs):
+        loaded.wait(timeout=30)
+        return load(*args, **kwargs)
+
+    monkeypatch.setattr(analytics.engine.AnalyticsEngine, 'load', slow_load)
+    # A carga nova fica presa na thread e a requisição segue com o motor anterior
+    assert analytics.current() is engine
+    assert analytics.current() is engine
+    loaded.set()
+    _wait_for_reload()
+
+    reloaded = analytics.current()
+    assert reloaded is not engine
+    assert reloaded.version != engine.version
+    assert 'Reforço' in reloaded.player_names
@@ -0,0 +1,48 @@
+from datetime import date
+import pytest
+from app.models import db, League, Team, Match
+from database.archive import archive_season, season_bounds
+
+
+@pytest.mark.parametrize('season, bounds', [
+    ('2019-2020', (date(2019, 7, 1), date(2020, 7, 1))),
+    ('2023', (date(2023, 1, 1), date(2024, 1, 1))),
+])
+def test_season_bounds(season, bounds):
+    assert season_bounds(season) == bounds
+
+
+@pytest.mark.parametrize('season', ['2019-2021', '2019/2020', '19-20', 'Apertura 2023', '', None])
+def test_season_bounds_rejects_unknown_formats(season):
+    with pytest.raises(ValueError):
+        season_bounds(season)
+
+
+def test_unfinished_season_is_not_archived(app):
+    with pytest.raises(ValueError):
+        archive_season(str(date.today().year))
+
+
+def _match(day, home_goals, away_goals):
+    return Match(home_team_id=1, away_team_id=2, date=day, home_goals=home_goals, away_goals=away_goals)
+
+
+def test_compare_uses_calendar_year_seasons(client):
+    db.session.add(League(id=1, name='Brasileirão', url='/en/comps/24'))
+    db.session.add_all([Team(id=1, name='Time 1', league_id=1), Team(id=2, name='Time 2', league_id=1)])
+    db.session.add_all([
+        _match(date(2023, 2, 10), 2, 0),
+        _match(date(2023, 11, 20), 1, 1),
+        _match(date(2024, 4, 5), 0, 3),
+    ])
+    db.session.commit()
+
+    def wins(season):
+        response = client.get(f'/api/compare?teams=1,2&metrics=wins,draws,losses&season={season}')
+        assert response.status_code == 200
+        teams = response.get_json()['teams']
+        return teams['wins'], teams['draws'], teams['losses']
+
+    assert wins('2023') == ([1, 0], [1, 1], [0, 1])
+    assert wins('2023-2024') == ([0, 1], [1, 1], [1, 0])
+    assert client.get('/api/compare?teams=1,2&metrics=wins&season=Apertura').status_code == 400
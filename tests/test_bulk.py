@@ -0,0 +1,81 @@
+import pytest
+from app.models import db, League, Team
+from database import bulk
+from database.bulk import bulk_upsert
+from database.data_version import CHANGED_KEY
+
+TEAMS = 20
+
+
+def _rows(renamed=()):
+    return [
+        {'url': f'/en/squads/{i}', 'name': f'Time {i}{" FC" if i in renamed else ""}', 'league_id': 1}
+        for i in range(1, TEAMS + 1)
+    ]
+
+
+@pytest.fixture
+def league(app):
+    db.session.add(League(id=1, name='Liga 1', url='/en/comps/1'))
+    db.session.commit()
+
+
+def _writes(executed):
+    return [s for s in executed if s.lstrip().upper().startswith(('INSERT', 'UPDATE'))]
+
+
+@pytest.fixture(params=['dialeto', 'portável'])
+def upsert_path(request, monkeypatch):
+    """Roda cada teste no INSERT ... ON CONFLICT do SQLite e no caminho portável (_merge)"""
+    if request.param == 'portável':
+        monkeypatch.setattr(bulk, '_upsert_statement', lambda model, values, update_columns: None)
+    return request.param
+
+
+def test_unchanged_rows_are_skipped(league, statements, upsert_path):
+    result = bulk_upsert(Team, _rows())
+    db.session.commit()
+    assert (result.inserted, result.updated, result.unchanged) == (TEAMS, 0, 0)
+
+    with statements() as executed:
+        result = bulk_upsert(Team, _rows())
+    assert (result.inserted, result.updated, result.unchanged) == (0, 0, TEAMS)
+    assert len(executed) == 1 and not _writes(executed)
+    assert not db.session.info.get(CHANGED_KEY)
+
+
+def test_changed_rows_keep_their_id(league, statements, upsert_path):
+    bulk_upsert(Team, _rows())
+    db.session.commit()
+    ids = dict(db.session.query(Team.url, Team.id))
+    before = dict(db.session.query(Team.url, Team.updated_at))
+
+    with statements() as executed:
+        result = bulk_upsert(Team, _rows(renamed={3, 7}) + [{'url': '/en/squads/novo', 'name': 'Novo', 'league_id': 1}])
+    db.session.commit()
+
+    assert (result.inserted, result.updated, result.unchanged) == (1, 2, TEAMS - 2)
+    assert len(_writes(executed)) == (1 if upsert_path == 'dialeto' else 2)
+    assert Team.query.count() == TEAMS + 1
+    teams = {team.url: team for team in Team.query}
+    assert all(teams[url].id == id for url, id in ids.items())
+    assert teams['/en/squads/3'].name == 'Time 3 FC'
+    assert teams['/en/squads/3'].updated_at > before['/en/squads/3']
+    assert teams['/en/squads/4'].updated_at == before['/en/squads/4']
+
+
+def test_missing_columns_keep_their_values(league, statements, upsert_path):
+    bulk_upsert(Team, _rows())
+    db.session.commit()
+
+    # Linhas com colunas diferentes no mesmo lote: a ausente não vira NULL
+    rows = [{'url': '/en/squads/1', 'name': 'Time 1 FC'}, {'url': '/en/squads/2', 'league_id': 2}]
+    db.session.add(League(id=2, name='Liga 2', url='/en/comps/2'))
+    result = bulk_upsert(Team, rows + [{'url': '/en/squads/novo', 'name': 'Novo'}])
+    db.session.commit()
+
+    assert (result.inserted, result.updated, result.unchanged) == (1, 2, 0)
+    teams = {team.url: team for team in Team.query}
+    assert (teams['/en/squads/1'].name, teams['/en/squads/1'].league_id) == ('Time 1 FC', 1)
+    assert (teams['/en/squads/2'].name, teams['/en/squads/2'].league_id) == ('Time 2', 2)
+    assert (teams['/en/squads/novo'].name, teams['/en/squads/novo'].league_id) == ('Novo', None)
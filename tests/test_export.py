@@ -0,0 +1,59 @@
+import csv
+import io
+import openpyxl
+import pyarrow.parquet as pq
+import pytest
+from app.models import Player, PlayerStats
+from database.benchmark import SEASONS, load_data
+
+# A exportação de jogadores é uma única consulta (joins + temporada mais
+# recente), qualquer que seja o número de linhas
+EXPORT_QUERIES = 1
+
+
+def _export(client, statements, fmt='csv'):
+    with statements() as executed:
+        response = client.get(f'/export/players?format={fmt}')
+        body = response.get_data()
+    assert response.status_code == 200
+    return body, len(executed)
+
+
+@pytest.mark.parametrize('players', [25, 100])
+def test_export_query_count_is_constant(client, statements, players):
+    load_data(players * len(SEASONS))
+    client.get('/api/teams/list')  # carrega a identidade do usuário antes da medição
+
+    body, executed = _export(client, statements)
+
+    rows = list(csv.reader(io.StringIO(body.decode('utf-8-sig'))))
+    assert len(rows) == players + 1
+    assert executed == EXPORT_QUERIES
+
+
+def test_export_uses_latest_season(client):
+    load_data(10 * len(SEASONS))
+    body = client.get('/export/players?format=csv&team=2').get_data().decode('utf-8-sig')
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert rows and all(row['Time'] == 'Time 2' for row in rows)
+
+    player = Player.query.filter_by(name=rows[0]['Nome']).one()
+    latest = max(PlayerStats.query.filter_by(player_id=player.id), key=lambda stats: stats.season)
+    assert int(rows[0]['Gols']) == latest.goals
+    assert int(rows[0]['Jogos']) == latest.matches_played
+
+
+@pytest.mark.parametrize('fmt', ['excel', 'parquet'])
+def test_export_formats(client, fmt):
+    load_data(10 * len(SEASONS))
+    response = client.get(f'/export/players?format={fmt}')
+    assert response.status_code == 200
+    if fmt == 'excel':
+        sheet = openpyxl.load_workbook(io.BytesIO(response.data)).active
+        assert sheet.max_row == 11
+    else:
+        assert pq.read_table(io.BytesIO(response.data)).num_rows == 10
+
+
+def test_export_rejects_unknown_format(client):
+    assert client.get('/export/players?format=doc').status_code == 400
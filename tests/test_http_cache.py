@@ -0,0 +1,108 @@
+import pytest
+from scraper.fbref_scraper import FBRefScraper
+from scraper.http_cache import HTTPCache
+
+MATCH_URL = 'https://fbref.com/en/matches/abc123/Time-A-Time-B'
+MATCH_PAGE = b'''<html><body>
+<div id="team_stats"><div><div>Possession</div>
+<span class="stat-value">55%</span><span class="stat-value">45%</span></div></div>
+</body></html>'''
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f'HTTP {self.status_code}')
+
+
+class FakeSession:
+    """Servidor com ETag fixo: responde 304 a If-None-Match com o mesmo ETag"""
+
+    def __init__(self):
+        self.headers = {}
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        if (headers or {}).get('If-None-Match') == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, MATCH_PAGE, {'ETag': '"v1"'})
+
+
+def _scraper(tmp_path, ttl):
+    scraper = FBRefScraper(
+        requests_per_second=1000, cache=HTTPCache(str(tmp_path / 'http_cache.sqlite3'), ttls={'match': ttl})
+    )
+    scraper.session = FakeSession()
+    return scraper
+
+
+def _count_goal_saves(scraper, monkeypatch):
+    saved = []
+    monkeypatch.setattr(scraper, '_save_goal_events', lambda match_id, events: saved.append(match_id))
+    return saved
+
+
+def test_fresh_cache_hit_skips_parsing_and_saving(app, tmp_path, monkeypatch):
+    scraper = _scraper(tmp_path, ttl=3600)
+    saved = _count_goal_saves(scraper, monkeypatch)
+
+    assert scraper.scrape_match_advanced_stats(MATCH_URL, match_id=1)['possession'] == {'home': 55.0, 'away': 45.0}
+    assert saved == [1]
+
+    assert scraper.scrape_match_advanced_stats(MATCH_URL, match_id=1) is None
+    assert len(scraper.session.requests) == 1
+    assert saved == [1]
+
+
+def test_not_modified_skips_parsing_and_saving(app, tmp_path, monkeypatch):
+    scraper = _scraper(tmp_path, ttl=0)
+    saved = _count_goal_saves(scraper, monkeypatch)
+    scraper.scrape_match_advanced_stats(MATCH_URL, match_id=1)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('página não alterada não deve ser reprocessada')
+
+    monkeypatch.setattr(scraper, '_extract_goal_events', fail)
+    assert scraper.scrape_match_advanced_stats(MATCH_URL, match_id=1) is None
+    assert scraper.session.requests[-1].get('If-None-Match') == '"v1"'
+    assert scraper.cache.stats['revalidated'] == 1
+    assert saved == [1]
+
+
+def test_not_modified_survives_evicted_entry(app, tmp_path):
+    scraper = _scraper(tmp_path, ttl=0)
+    scraper.scrape_match_advanced_stats(MATCH_URL)
+    # Entrada removida entre o 304 e a leitura: antes terminava em AttributeError
+    original = scraper._fetch
+
+    def fetch_then_evict(url, page_type=None):
+        content = original(url, page_type)
+        scraper.cache.conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+        return content
+
+    scraper._fetch = fetch_then_evict
+    assert scraper.scrape_match_advanced_stats(MATCH_URL) is None
+
+
+def test_failed_goal_save_invalidates_the_page(app, tmp_path, monkeypatch):
+    scraper = _scraper(tmp_path, ttl=3600)
+
+    def fail(match_id, events):
+        raise RuntimeError('banco indisponível')
+
+    monkeypatch.setattr(scraper, '_save_goal_events', fail)
+    assert scraper.scrape_match_advanced_stats(MATCH_URL, match_id=1) == {}
+    assert scraper.cache.get(MATCH_URL) is None
+
+    # A coleta seguinte baixa a página de novo e grava os gols
+    saved = _count_goal_saves(scraper, monkeypatch)
+    assert scraper.scrape_match_advanced_stats(MATCH_URL, match_id=1)['possession'] == {'home': 55.0, 'away': 45.0}
+    assert saved == [1]
+    assert len(scraper.session.requests) == 2
+    assert 'If-None-Match' not in scraper.session.requests[-1]
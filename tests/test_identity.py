@@ -0,0 +1,48 @@
+from flask import g
+from app import identity
+from app.models import db
+
+
+def _get(client):
+    # O contexto da aplicação do teste é compartilhado entre as requisições:
+    # sem isto o Flask-Login reaproveitaria o usuário carregado antes
+    g.pop('_login_user', None)
+    return client.get('/api/teams/list')
+
+
+def test_identity_is_cached(client, user, statements):
+    _get(client)
+    with statements() as executed:
+        _get(client)
+    assert not any('FROM users' in statement for statement in executed)
+
+
+def test_change_evicts_identity_only_after_commit(client, user):
+    _get(client)
+    assert identity._local.get(user.id) is not None
+
+    user.email = 'novo@example.com'
+    db.session.flush()
+    assert identity._local.get(user.id) is not None
+
+    db.session.commit()
+    assert identity._local.get(user.id) is None
+    _get(client)
+    assert identity._local.get(user.id).email == 'novo@example.com'
+
+
+def test_rolled_back_change_keeps_identity(client, user):
+    _get(client)
+    user.email = 'descartado@example.com'
+    db.session.flush()
+    db.session.rollback()
+    assert identity._local.get(user.id).email == 'analista@example.com'
+    assert not db.session.info.get(identity.CHANGED_KEY)
+
+
+def test_deleted_user_is_logged_out(client, user):
+    _get(client)
+    db.session.delete(user)
+    db.session.commit()
+    assert identity._local.get(user.id) is None
+    assert _get(client).status_code in (302, 401)
@@ -0,0 +1,148 @@
+import pytest
+from app import listing
+from app.models import db, League, Team, Player
+
+PLAYERS = 23
+
+
+@pytest.fixture
+def players(app):
+    db.session.add(League(id=1, name='Liga', url='/en/comps/1'))
+    db.session.add_all([Team(id=1, name='Time 1', league_id=1), Team(id=2, name='Time 2', league_id=1)])
+    # Nomes repetidos: o id desempata, inclusive na fronteira entre páginas
+    db.session.add_all([
+        Player(id=i, name=f'Jogador {i % 5}', team_id=i % 2 + 1, position='FW', url=f'/en/players/{i}')
+        for i in range(1, PLAYERS + 1)
+    ])
+    db.session.add(Player(id=PLAYERS + 1, name='100%_real', team_id=1, url='/en/players/real'))
+    db.session.commit()
+    return sorted((player.name, player.id) for player in Player.query if player.name.startswith('Jogador'))
+
+
+def _walk(limit, sort='name', **filters):
+    """Percorre as páginas para frente e volta para trás pelos cursores"""
+    pages = []
+    cursor = None
+    while True:
+        page = listing.players_page(sort=sort, cursor=cursor, limit=limit, with_stats=False, count=False, **filters)
+        pages.append(page)
+        assert len(page['items']) <= limit
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert pages[0]['prev_cursor'] is None
+
+    backwards = [pages[-1]]
+    while backwards[-1]['prev_cursor']:
+        backwards.append(listing.players_page(
+            sort=sort, cursor=backwards[-1]['prev_cursor'], limit=limit, with_stats=False, count=False, **filters
+        ))
+    assert [page['items'] for page in reversed(backwards)] == [page['items'] for page in pages]
+    return pages
+
+
+@pytest.mark.parametrize('limit', [1, 5, 7, PLAYERS, PLAYERS + 1])
+def test_pages_cover_every_row_once(players, limit):
+    pages = _walk(limit, prefix='Jogador')
+    seen = [(item['name'], item['id']) for page in pages for item in page['items']]
+    assert seen == players
+    # Sem página vazia no fim, mesmo quando o total é múltiplo do limite
+    assert all(page['items'] for page in pages)
+    assert len(pages) == -(-PLAYERS // limit)
+
+
+def test_descending_order(players):
+    pages = _walk(6, sort='-name', prefix='Jogador')
+    assert [(item['name'], item['id']) for page in pages for item in page['items']] == players[::-1]
+
+
+def test_filters_and_id_sort(players):
+    pages = _walk(4, sort='id', team_id=2)
+    assert [item['id'] for page in pages for item in page['items']] == [i for i in range(1, PLAYERS + 1) if i % 2]
+
+
+def test_empty_listing_has_no_cursors(players):
+    page = listing.players_page(prefix='Ninguém', with_stats=False)
+    assert page['items'] == [] and page['next_cursor'] is None and page['prev_cursor'] is None
+    assert page['total'] == 0 and page['total_exact']
+
+
+def test_prefix_escapes_wildcards(players):
+    assert [item['name'] for item in listing.players_page(prefix='100%_', with_stats=False)['items']] == ['100%_real']
+    assert listing.players_page(prefix='1_0', with_stats=False)['items'] == []
+
+
+def test_limit_is_clamped(players):
+    assert len(listing.players_page(limit=0, with_stats=False, count=False)['items']) == 1
+    many = [Player(name=f'Extra {i}', team_id=1, url=f'/en/players/extra-{i}') for i in range(listing.MAX_PAGE_SIZE)]
+    db.session.add_all(many)
+    db.session.commit()
+    assert len(listing.players_page(limit=10 ** 6, with_stats=False, count=False)['items']) == listing.MAX_PAGE_SIZE
+
+
+def test_invalid_cursors(players, client):
+    with pytest.raises(ValueError):
+        listing.players_page(cursor=listing.encode_cursor('after', ['Jogador 1']), with_stats=False)
+    with pytest.raises(ValueError):
+        listing.players_page(cursor=listing.encode_cursor('sideways', ['Jogador 1', 1]), with_stats=False)
+    # Cursor de uma ordenação usado em outra (número de valores diferente)
+    cursor = listing.players_page(sort='id', limit=2, with_stats=False)['next_cursor']
+    with pytest.raises(ValueError):
+        listing.players_page(sort='name', cursor=cursor, with_stats=False)
+
+    assert client.get('/api/players?cursor=%%%').status_code == 400
+    assert client.get('/api/teams?cursor=bm90LWpzb24').status_code == 400
+    assert client.get('/api/players?sort=position').status_code == 400
+    response = client.get(f'/api/players?sort=id&limit=2&cursor={cursor}')
+    assert [item['id'] for item in response.get_json()['items']] == [3, 4]
+
+
+def test_players_without_team_or_league_are_not_listed(players):
+    db.session.add(Team(id=3, name='Sem liga'))
+    db.session.add_all([
+        Player(name='Jogador sem time', url='/en/players/sem-time'),
+        Player(name='Jogador sem liga', team_id=3, url='/en/players/sem-liga'),
+    ])
+    db.session.commit()
+    names = {item['name'] for item in listing.players_page(prefix='Jogador sem', with_stats=False)['items']}
+    assert names == set()
+    assert listing.players_page(prefix='Jogador', with_stats=False, limit=100)['total'] == PLAYERS
+
+
+def test_position_filter_is_validated(players, client):
+    assert len(listing.players_page(position='FW', with_stats=False, limit=100)['items']) == PLAYERS
+    with pytest.raises(ValueError):
+        listing.players_page(position='ATA', with_stats=False)
+    assert client.get('/api/players?position=ATA').status_code == 400
+    # A página ignora a posição desconhecida em vez de falhar
+    assert client.get('/players?position=ATA').status_code == 200
+
+
+def test_team_list_is_paginated(players, client):
+    db.session.add_all([Team(id=i, name=f'Time {i}', league_id=1) for i in range(3, 8)])
+    db.session.add(Team(id=8, name='Outro', url='/en/squads/outro'))
+    db.session.commit()
+
+    names, cursor = [], None
+    while True:
+        response = client.get('/api/teams/list?league=1&limit=3' + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        page = response.get_json()
+        assert len(page['items']) <= 3 and 'total' not in page
+        names += [team['name'] for team in page['items']]
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert names == [f'Time {i}' for i in range(1, 8)]
+
+    page = client.get('/api/teams/list?q=Out').get_json()
+    assert [(team['id'], team['name']) for team in page['items']] == [(8, 'Outro')]
+    assert client.get('/api/teams/list?cursor=%%%').status_code == 400
+
+
+def test_compare_page_does_not_render_the_teams(players, client, statements):
+    with statements() as executed:
+        response = client.get('/compare')
+    assert response.status_code == 200
+    assert b'Time 1 - Liga' not in response.data
+    assert not any('FROM teams' in statement or 'FROM players' in statement for statement in executed)
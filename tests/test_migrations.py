@@ -0,0 +1,127 @@
+import os
+from datetime import date
+import sqlalchemy as sa
+from alembic.config import Config as AlembicConfig
+from alembic.script import ScriptDirectory
+from flask_migrate import upgrade
+from app.models import db
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+# Tabelas do esquema anterior às migrações (criadas por db.create_all(), sem índices nas chaves naturais)
+BASELINE_TABLES = (
+    'users', 'leagues', 'teams', 'players', 'player_stats', 'matches', 'advanced_player_stats', 'team_stats'
+)
+
+
+def _head():
+    config = AlembicConfig(os.path.join(MIGRATIONS, 'alembic.ini'))
+    config.set_main_option('script_location', MIGRATIONS)
+    return ScriptDirectory.from_config(config).get_current_head()
+
+
+def _baseline_schema(connection):
+    metadata = sa.MetaData()
+    for name in BASELINE_TABLES:
+        table = db.metadata.tables[name]
+        sa.Table(name, metadata, *[column.copy() for column in table.columns])
+    metadata.create_all(connection)
+
+
+def _insert(connection, table, *rows):
+    connection.execute(sa.table(table, *[sa.column(c) for c in rows[0]]).insert(), list(rows))
+
+
+def _seed_duplicates(connection):
+    day = date(2023, 9, 2)
+    _insert(connection, 'leagues',
+            {'id': 1, 'name': 'Liga', 'url': '/en/comps/9'}, {'id': 2, 'name': 'Liga', 'url': '/en/comps/9'})
+    _insert(connection, 'teams',
+            {'id': 1, 'name': 'Time A', 'league_id': 1, 'url': '/en/squads/a'},
+            {'id': 2, 'name': 'Time B', 'league_id': 2, 'url': '/en/squads/b'},
+            {'id': 3, 'name': 'Time A', 'league_id': 1, 'url': '/en/squads/a'})
+    _insert(connection, 'players',
+            {'id': 1, 'name': 'Jogador', 'team_id': 1, 'url': '/en/players/x'},
+            {'id': 2, 'name': 'Jogador', 'team_id': 3, 'url': '/en/players/x'})
+    _insert(connection, 'player_stats',
+            {'id': 1, 'player_id': 1, 'season': '2023-2024', 'goals': 1},
+            {'id': 2, 'player_id': 2, 'season': '2023-2024', 'goals': 2})
+    _insert(connection, 'matches',
+            {'id': 1, 'home_team_id': 1, 'away_team_id': 2, 'date': day, 'home_goals': 1, 'away_goals': 0},
+            {'id': 2, 'home_team_id': 3, 'away_team_id': 2, 'date': day, 'home_goals': 1, 'away_goals': 0})
+    _insert(connection, 'advanced_player_stats',
+            {'id': 1, 'player_id': 1, 'match_id': 1, 'season': '2023-2024', 'key_passes': 1},
+            {'id': 2, 'player_id': 2, 'match_id': 2, 'season': '2023-2024', 'key_passes': 3})
+    _insert(connection, 'team_stats',
+            {'id': 1, 'team_id': 1, 'match_id': 1, 'season': '2023-2024', 'xg': 0.5},
+            {'id': 2, 'team_id': 3, 'match_id': 2, 'season': '2023-2024', 'xg': 1.5})
+
+
+def _ids(connection, table):
+    return connection.execute(sa.text(f'SELECT id FROM {table} ORDER BY id')).scalars().all()
+
+
+def test_upgrade_from_baseline_with_duplicates(app, capsys):
+    db.drop_all()
+    with db.engine.begin() as connection:
+        _baseline_schema(connection)
+        _seed_duplicates(connection)
+
+    upgrade(directory=MIGRATIONS)
+    # Log do Alembic (alembic.ini manda para stderr), sem print solto na migração
+    output = capsys.readouterr()
+    assert 'leagues: 1 duplicatas removidas' in output.err and 'duplicatas' not in output.out
+
+    with db.engine.connect() as connection:
+        # Cada chave natural fica com a linha de maior id
+        assert _ids(connection, 'leagues') == [2]
+        assert _ids(connection, 'teams') == [2, 3]
+        assert _ids(connection, 'players') == [2]
+        assert _ids(connection, 'matches') == [2]
+        assert _ids(connection, 'player_stats') == [2]
+        assert _ids(connection, 'advanced_player_stats') == [2]
+        assert _ids(connection, 'team_stats') == [2]
+
+        # Chaves estrangeiras reapontadas para a linha mantida
+        assert connection.execute(sa.text('SELECT league_id FROM teams ORDER BY id')).scalars().all() == [2, 2]
+        assert connection.execute(sa.text('SELECT team_id FROM players')).scalar() == 3
+        assert connection.execute(sa.text('SELECT home_team_id FROM matches')).scalar() == 3
+
+        inspector = sa.inspect(connection)
+        assert {'uq_teams_url', 'ix_teams_name'} <= {index['name'] for index in inspector.get_indexes('teams')}
+        assert {'uq_player_stats_player_season', 'ix_player_stats_season'} <= {
+            index['name'] for index in inspector.get_indexes('player_stats')
+        }
+        assert {
+            'team_season_stats', 'player_season_stats', 'goal_events', 'archived_seasons', 'replica_heartbeat',
+            'page_snapshots', 'scrape_jobs', 'scrape_tasks'
+        } <= set(
+            inspector.get_table_names()
+        )
+        assert connection.execute(sa.text('SELECT key_passes FROM player_season_stats')).scalar() == 3
+
+        head = connection.execute(sa.text('SELECT version_num FROM alembic_version')).scalar()
+    assert head == _head()
+
+
+def test_upgrade_over_create_all_schema(app):
+    # Banco criado por db.create_all(): os índices já existem e são mantidos
+    upgrade(directory=MIGRATIONS)
+    with db.engine.connect() as connection:
+        assert connection.execute(sa.text('SELECT version_num FROM alembic_version')).scalar() == _head()
+
+
+def test_upgrade_creates_every_model_table(app):
+    # Esquema gerenciado só pelo Alembic: toda tabela e índice dos modelos precisa de uma migração
+    db.drop_all()
+    with db.engine.begin() as connection:
+        _baseline_schema(connection)
+    upgrade(directory=MIGRATIONS)
+
+    with db.engine.connect() as connection:
+        inspector = sa.inspect(connection)
+        for table in db.metadata.sorted_tables:
+            assert inspector.has_table(table.name), table.name
+            columns = {column['name'] for column in inspector.get_columns(table.name)}
+            assert columns == {column.name for column in table.columns}, table.name
+            indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            assert {index.name for index in table.indexes} <= indexes, table.name
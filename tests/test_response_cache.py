@@ -0,0 +1,52 @@
+import pytest
+from flask import g
+from app.models import db, Team
+from database.benchmark import SEASONS, load_data
+
+ROUTES = ['/api/teams/list', '/api/teams/list?league=1', '/api/player_stats/3', '/api/team_stats/2']
+
+
+def _get(client, statements, url, etag=None):
+    # Nova requisição de verdade: o usuário sai do cache de identidade, não de g
+    g.pop('_login_user', None)
+    with statements() as executed:
+        response = client.get(url, headers={'If-None-Match': etag} if etag else {})
+        response.get_data()
+    return response, executed
+
+
+@pytest.fixture
+def seeded(client):
+    load_data(10 * len(SEASONS))
+    return client
+
+
+@pytest.mark.parametrize('url', ROUTES)
+def test_not_modified_runs_no_queries(seeded, statements, url):
+    response, _ = _get(seeded, statements, url)
+    assert response.status_code == 200
+    etag = response.headers['ETag'].strip('"')
+
+    response, executed = _get(seeded, statements, url, f'"{etag}"')
+    assert response.status_code == 304
+    assert response.headers['ETag'].strip('"') == etag
+    assert executed == []
+
+    # Sem If-None-Match a resposta vem do cache, também sem consultas
+    response, executed = _get(seeded, statements, url)
+    assert response.status_code == 200
+    assert executed == []
+
+
+def test_new_data_changes_the_etag(seeded, statements):
+    response, _ = _get(seeded, statements, '/api/teams/list')
+    etag = response.headers['ETag']
+
+    db.session.add(Team(name='Time Novo', league_id=1, url='/en/squads/novo'))
+    db.session.commit()
+
+    response, executed = _get(seeded, statements, '/api/teams/list', etag)
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert executed
+    assert 'Time Novo' in {team['name'] for team in response.get_json()['items']}
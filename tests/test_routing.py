@@ -0,0 +1,52 @@
+import pytest
+import config
+from app.models import db, ReplicaHeartbeat
+from database.routing import REPLICA, monitor, write_heartbeat
+
+
+@pytest.fixture(autouse=True)
+def replica(tmp_path, monkeypatch):
+    """'Réplica' apontando para o mesmo arquivo SQLite do primário (sempre em dia)"""
+    monkeypatch.setattr(config.TestingConfig, 'SQLALCHEMY_BINDS', {REPLICA: f"sqlite:///{tmp_path / 'test.db'}"})
+    monkeypatch.setattr(monitor, 'lag', None)
+    monkeypatch.setattr(monitor, 'error', None)
+    monkeypatch.setattr(monitor, 'checked_at', 0.0)
+    yield
+    # O Flask-SQLAlchemy guarda um MetaData por bind configurado, que sobreviveria à aplicação
+    db.metadatas.pop(REPLICA, None)
+
+
+def _route(client, statements):
+    monitor.checked_at = 0.0
+    with statements() as executed:
+        response = client.get('/api/teams/list')
+    assert response.status_code == 200
+    return response.headers['X-DB-Route'], executed
+
+
+def test_requests_only_read_the_heartbeat(client, statements):
+    route, executed = _route(client, statements)
+    assert route == 'primary'
+    assert not any('replica_heartbeat' in s and not s.lstrip().upper().startswith('SELECT') for s in executed)
+    assert db.session.get(ReplicaHeartbeat, 1) is None
+
+
+def test_heartbeat_makes_replica_healthy(client, statements):
+    write_heartbeat(db.engine)
+    route, executed = _route(client, statements)
+    assert route == REPLICA
+    assert monitor.lag is not None and monitor.lag < 5
+    assert not any(s.lstrip().upper().startswith(('UPDATE', 'INSERT')) for s in executed)
+
+
+def test_stale_heartbeat_sends_reads_to_primary(app, client, statements, monkeypatch):
+    write_heartbeat(db.engine)
+    monkeypatch.setitem(app.config, 'REPLICA_MAX_LAG', -app.config['REPLICA_HEARTBEAT_SECONDS'] - 1)
+    route, _ = _route(client, statements)
+    assert route == 'primary'
+
+
+def test_heartbeat_command(app):
+    result = app.test_cli_runner().invoke(args=['replica-heartbeat'])
+    assert result.exit_code == 0, result.output
+    assert db.session.get(ReplicaHeartbeat, 1).beat_at is not None
@@ -0,0 +1,55 @@
+import json
+import os
+import analytics
+from config import Config
+from database import snapshot
+from database.benchmark import SEASONS, load_data
+
+PLAYERS = 10
+
+
+def _folders():
+    return sorted(entry for entry in os.listdir(Config.SNAPSHOT_DIR) if entry.startswith('player_stats'))
+
+
+def test_export_swaps_the_manifest_pointer(app, monkeypatch):
+    load_data(PLAYERS * len(SEASONS))
+    first = snapshot.export_snapshot()
+    assert snapshot.read_frame('player_stats', ['id']).shape[0] == PLAYERS * len(SEASONS)
+    assert analytics.engine.AnalyticsEngine.load().source == 'snapshot'
+
+    # Durante a exportação seguinte os leitores continuam com a versão anterior inteira
+    export_table = snapshot.export_table
+    seen = []
+
+    def checked(name, directory=None, engine=None):
+        seen.append(snapshot.table_path(name, directory))
+        assert snapshot.read_frame(name, ['id']).shape[0] == first[name]['rows']
+        return export_table(name, directory, engine)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(snapshot, 'export_table', checked)
+        second = snapshot.export_snapshot()
+
+    assert seen[0] == os.path.join(Config.SNAPSHOT_DIR, first['player_stats']['path'])
+    assert second['player_stats']['path'] != first['player_stats']['path']
+    assert snapshot.table_path('player_stats') == os.path.join(Config.SNAPSHOT_DIR, second['player_stats']['path'])
+    assert _folders() == sorted([first['player_stats']['path'], second['player_stats']['path']])
+
+    # A versão anterior à anterior sai do disco
+    third = snapshot.export_snapshot(tables=['player_stats'])
+    assert _folders() == sorted([second['player_stats']['path'], third['player_stats']['path']])
+    assert third['matches'] == second['matches']
+
+
+def test_reads_legacy_layout(app):
+    load_data(PLAYERS * len(SEASONS))
+    manifest = snapshot.export_snapshot(tables=['player_stats'])
+    os.rename(snapshot.table_path('player_stats'), os.path.join(Config.SNAPSHOT_DIR, 'player_stats'))
+    del manifest['player_stats']['path']
+    with open(os.path.join(Config.SNAPSHOT_DIR, snapshot.MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+    assert snapshot.read_frame('player_stats', ['id']).shape[0] == PLAYERS * len(SEASONS)
+    snapshot.export_snapshot(tables=['player_stats'])
+    assert len(_folders()) == 2